@@ -0,0 +1,53 @@
+"""Response-cache nodes — serve repeated first-turn questions without an LLM call."""
+
+import logging
+
+from agents.artifacts import current_generation, precomputed_answer
+from agents.cache import SemanticResponseCache
+from agents.metrics import incr, register_gauges
+from agents.retrieval import query_embedding
+from config.settings import RESPONSE_CACHE_SIMILARITY, RESPONSE_CACHE_SIZE
+
+logger = logging.getLogger(__name__)
+
+_cache = SemanticResponseCache(RESPONSE_CACHE_SIZE, RESPONSE_CACHE_SIMILARITY)
+
+
+def check_response_cache(state: dict) -> dict:
+    """Answer from cache when a near-identical first-turn query was already answered."""
+    if state.get("chat_history"):
+        return state  # follow-ups depend on the conversation, never cached
+
+    precomputed = precomputed_answer(state["query"])
+    if precomputed is not None:
+        incr("cache.suggested.hit")
+        logger.info("Served precomputed answer for: %s", state["query"][:80])
+        return {**state, "response": precomputed, "cache_hit": True}
+
+    embedding = query_embedding(state["query"])
+    if embedding is None:
+        return state  # lexical fast path — no embedding to compare against
+
+    hit = _cache.lookup(embedding, current_generation())
+    incr("cache.response.hit" if hit is not None else "cache.response.miss")
+    if hit is None:
+        return {**state, "query_embedding": embedding}
+
+    response, similarity = hit
+    logger.info("Response cache hit (sim=%.3f) for query: %s", similarity, state["query"][:80])
+    return {**state, "query_embedding": embedding, "response": response, "cache_hit": True}
+
+
+def store_response(state: dict) -> dict:
+    """Remember a freshly generated first-turn answer for the current generation."""
+    embedding = state.get("query_embedding")
+    if embedding is not None and not state.get("chat_history") and state.get("retrieved_posts"):
+        _cache.store(embedding, state["response"], current_generation())
+    return state
+
+
+def response_cache_stats() -> dict:
+    return _cache.stats()
+
+
+register_gauges("cache.response", response_cache_stats)
@@ -0,0 +1,114 @@
+"""Published pipeline artifacts — generation stamp, mtime-cached JSON, precomputed answers.
+
+Deliberately dependency-light (no numpy/faiss/langchain) so the UI can import
+it on first paint.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Callable, TypeVar
+
+from config.settings import GENERATION_PATH, SUGGESTED_ANSWERS_PATH
+
+_TRAILING_PUNCT_RE = re.compile(r"[\s?!.]+$")
+_WS_RE = re.compile(r"\s+")
+
+T = TypeVar("T")
+
+_generation: tuple[int, str] = (0, "")  # (mtime_ns, generation id)
+_artifacts: dict[Path, tuple[int, dict]] = {}
+_derived: dict[tuple[Path, str], tuple[int, object]] = {}  # (path, name) → (mtime_ns, built object)
+_suggested: tuple[tuple[int, str], dict[str, dict]] = ((0, ""), {})  # ((mtime_ns, generation), question → entry)
+
+
+def normalize_query(text: str) -> str:
+    """Case-, whitespace- and trailing-punctuation-insensitive form of a query."""
+    return _TRAILING_PUNCT_RE.sub("", _WS_RE.sub(" ", text.strip().lower()))
+
+
+def current_generation() -> str:
+    """Id of the currently published artifact generation ("" before the first run)."""
+    global _generation
+    try:
+        mtime_ns = GENERATION_PATH.stat().st_mtime_ns
+    except OSError:
+        return ""
+    if mtime_ns != _generation[0]:
+        try:
+            with open(GENERATION_PATH) as f:
+                _generation = (mtime_ns, json.load(f).get("generation", ""))
+        except (json.JSONDecodeError, OSError):
+            return _generation[1]
+    return _generation[1]
+
+
+def _load(path: Path) -> tuple[int, dict] | None:
+    """(mtime_ns, parsed JSON) for an artifact, re-read only when the file changes."""
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
+        return None
+    cached = _artifacts.get(path)
+    if cached is None or cached[0] != mtime_ns:
+        try:
+            with open(path) as f:
+                cached = (mtime_ns, json.load(f))
+        except (json.JSONDecodeError, OSError):
+            return None
+        _artifacts[path] = cached
+    return cached
+
+
+def load_artifact(path: Path) -> dict | None:
+    """Parsed JSON pipeline artifact, re-read only when the file's mtime changes."""
+    loaded = _load(path)
+    return loaded[1] if loaded is not None else None
+
+
+def derived_artifact(path: Path, name: str, build: Callable[[dict], T]) -> T | None:
+    """``build(data)`` for a parsed artifact, cached process-wide until the file changes.
+
+    Used for objects that are expensive to construct from an artifact (e.g. the
+    UI's chart figures); callers must treat the result as read-only since every
+    session shares it.
+    """
+    loaded = _load(path)
+    if loaded is None:
+        return None
+    mtime_ns, data = loaded
+    cached = _derived.get((path, name))
+    if cached is None or cached[0] != mtime_ns:
+        cached = (mtime_ns, build(data))
+        _derived[(path, name)] = cached
+    return cached[1]
+
+
+def _refresh_suggested() -> dict[str, dict]:
+    global _suggested
+    try:
+        version = (SUGGESTED_ANSWERS_PATH.stat().st_mtime_ns, current_generation())
+    except OSError:
+        _suggested = ((0, ""), {})
+        return {}
+    if version != _suggested[0]:
+        try:
+            with open(SUGGESTED_ANSWERS_PATH) as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return {}
+        # Answers grounded in an older index are stale; don't offer them
+        entries = data.get("answers", []) if data.get("generation") == version[1] else []
+        _suggested = (version, {normalize_query(e["question"]): e for e in entries})
+    return _suggested[1]
+
+
+def suggested_answers() -> list[dict]:
+    """Pipeline-precomputed {question, answer} pairs for the current generation."""
+    return list(_refresh_suggested().values())
+
+
+def precomputed_answer(query: str) -> str | None:
+    """Stored answer when the query matches a suggested question of this generation."""
+    entry = _refresh_suggested().get(normalize_query(query))
+    return entry["answer"] if entry else None
@@ -0,0 +1,187 @@
+"""Query caches — embedding LRU + SQLite store, semantic response cache per index generation."""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+from agents.artifacts import normalize_query
+
+logger = logging.getLogger(__name__)
+
+
+class QueryEmbeddingCache:
+    """Two-level cache of query embeddings keyed by (model, normalized query).
+
+    Lookups hit an in-process LRU first, then a SQLite file shared by every
+    process on the box. Entries older than ``ttl_s`` are treated as misses.
+    Thread-safe; disk errors degrade to memory-only caching.
+    """
+
+    def __init__(self, path: Path, capacity: int, ttl_s: float):
+        self.capacity = capacity
+        self.ttl_s = ttl_s
+        self._lru: OrderedDict[str, tuple[float, np.ndarray]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = self._disk_hits = self._misses = 0
+        self._db: sqlite3.Connection | None = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), check_same_thread=False, timeout=5)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS query_embeddings ("
+                "key TEXT PRIMARY KEY, created REAL NOT NULL, embedding BLOB NOT NULL)"
+            )
+            self._db.commit()
+        except (sqlite3.Error, OSError):
+            logger.warning("Query embedding disk cache unavailable at %s — memory only", path, exc_info=True)
+            self._db = None
+
+    @staticmethod
+    def _key(text: str, model: str) -> str:
+        return hashlib.sha1(f"{model}\0{normalize_query(text)}".encode()).hexdigest()
+
+    def get(self, text: str, model: str) -> np.ndarray | None:
+        """Cached (dim,) float32 embedding, or None on miss/expiry."""
+        key = self._key(text, model)
+        now = time.time()
+        with self._lock:
+            hit = self._lru.get(key)
+            if hit is not None and now - hit[0] < self.ttl_s:
+                self._lru.move_to_end(key)
+                self._hits += 1
+                return hit[1]
+
+            row = None
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT created, embedding FROM query_embeddings WHERE key = ?", (key,)
+                    ).fetchone()
+                except sqlite3.Error:
+                    logger.warning("Query embedding cache read failed", exc_info=True)
+            if row is not None and now - row[0] < self.ttl_s:
+                embedding = np.frombuffer(row[1], dtype=np.float32)
+                self._remember(key, row[0], embedding)
+                self._disk_hits += 1
+                return embedding
+
+            self._misses += 1
+            return None
+
+    def put(self, text: str, model: str, embedding: np.ndarray) -> None:
+        key = self._key(text, model)
+        embedding = np.ascontiguousarray(embedding, dtype=np.float32).ravel()
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, embedding)
+            if self._db is None:
+                return
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO query_embeddings (key, created, embedding) VALUES (?, ?, ?)",
+                    (key, now, embedding.tobytes()),
+                )
+                self._db.execute("DELETE FROM query_embeddings WHERE created < ?", (now - self.ttl_s,))
+                self._db.commit()
+            except sqlite3.Error:
+                logger.warning("Query embedding cache write failed", exc_info=True)
+
+    def _remember(self, key: str, created: float, embedding: np.ndarray) -> None:
+        self._lru[key] = (created, embedding)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.capacity:
+            self._lru.popitem(last=False)
+
+    def stats(self) -> dict:
+        """Hit/miss counters since process start."""
+        with self._lock:
+            lookups = self._hits + self._disk_hits + self._misses
+            return {
+                "memory_hits": self._hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_rate": round((self._hits + self._disk_hits) / lookups, 3) if lookups else 0.0,
+                "entries": len(self._lru),
+            }
+
+
+class SemanticResponseCache:
+    """First-turn answers keyed by query embedding, scoped to one index generation.
+
+    Cached query embeddings live in a fixed-size ring-buffer matrix, so a lookup
+    is one vectorized dot product against every entry. Seeing a new generation
+    drops all entries, since their answers were grounded in stale stories.
+    """
+
+    def __init__(self, capacity: int, threshold: float):
+        self.capacity = capacity
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._generation = ""
+        self._matrix: np.ndarray | None = None
+        self._answers: list[str | None] = [None] * capacity
+        self._count = 0
+        self._hits = self._misses = 0
+
+    def _reset(self, generation: str) -> None:
+        if self._count:
+            logger.info("Response cache invalidated (%d entries) for generation %s",
+                        min(self._count, self.capacity), generation)
+        self._generation = generation
+        self._matrix = None
+        self._answers = [None] * self.capacity
+        self._count = 0
+
+    @staticmethod
+    def _unit(embedding: np.ndarray) -> np.ndarray:
+        vec = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def lookup(self, embedding: np.ndarray, generation: str) -> tuple[str, float] | None:
+        """(answer, similarity) of the closest cached query above threshold, else None."""
+        query = self._unit(embedding)
+        with self._lock:
+            if generation != self._generation:
+                self._reset(generation)
+            filled = min(self._count, self.capacity)
+            if not filled:
+                self._misses += 1
+                return None
+            sims = self._matrix[:filled] @ query
+            best = int(np.argmax(sims))
+            if sims[best] < self.threshold:
+                self._misses += 1
+                return None
+            self._hits += 1
+            return self._answers[best], float(sims[best])
+
+    def store(self, embedding: np.ndarray, answer: str, generation: str) -> None:
+        query = self._unit(embedding)
+        with self._lock:
+            if generation != self._generation:
+                self._reset(generation)
+            if self._matrix is None:
+                self._matrix = np.zeros((self.capacity, query.shape[0]), dtype=np.float32)
+            slot = self._count % self.capacity  # overwrite oldest once full
+            self._matrix[slot] = query
+            self._answers[slot] = answer
+            self._count += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "generation": self._generation,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+                "entries": min(self._count, self.capacity),
+            }
@@ -0,0 +1,128 @@
+"""Shared OpenAI clients — pooled connections, concurrency limit, single-flight coalescing."""
+
+import hashlib
+import json
+import logging
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Callable, TypeVar
+
+import httpx
+from langchain_openai import ChatOpenAI
+from openai import OpenAI
+
+from config.settings import (
+    OPENAI_API_KEY,
+    OPENAI_MAX_CONCURRENCY,
+    OPENAI_MAX_CONNECTIONS,
+    OPENAI_MODEL,
+    OPENAI_TIMEOUT_S,
+)
+from agents.metrics import register_gauges
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_upstream = threading.BoundedSemaphore(OPENAI_MAX_CONCURRENCY)
+
+
+@lru_cache(maxsize=1)
+def _http_client() -> httpx.Client:
+    """One keep-alive connection pool for all OpenAI traffic in this process."""
+    return httpx.Client(
+        limits=httpx.Limits(
+            max_connections=OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=OPENAI_MAX_CONNECTIONS,
+        ),
+        timeout=OPENAI_TIMEOUT_S,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_openai_client() -> OpenAI:
+    """Process-wide OpenAI SDK client (embeddings, pipeline summaries)."""
+    return OpenAI(api_key=OPENAI_API_KEY, http_client=_http_client())
+
+
+@lru_cache(maxsize=8)
+def get_chat_model(temperature: float, model: str = OPENAI_MODEL) -> ChatOpenAI:
+    """Process-wide LangChain chat model per (temperature, model), sharing the pool."""
+    return ChatOpenAI(
+        model=model,
+        api_key=OPENAI_API_KEY,
+        temperature=temperature,
+        http_client=_http_client(),
+        stream_usage=True,  # final stream chunk carries token usage for metrics
+    )
+
+
+@contextmanager
+def upstream_slot():
+    """Hold one of the OPENAI_MAX_CONCURRENCY process-wide request slots."""
+    with _upstream:
+        yield
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into one execution.
+
+    The first caller runs ``fn``; callers arriving while it is in flight block
+    and receive the same result (or exception). Nothing is cached afterwards.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[str, Future] = {}
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+
+_flights = SingleFlight()
+
+
+def request_key(kind: str, *parts) -> str:
+    """Stable single-flight key for an upstream request payload."""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return f"{kind}:{hashlib.sha1(payload.encode()).hexdigest()}"
+
+
+def coalesce(key: str, fn: Callable[[], T]) -> T:
+    """Run ``fn`` under the concurrency limit, sharing it with identical in-flight calls."""
+    def limited() -> T:
+        with upstream_slot():
+            return fn()
+
+    return _flights.do(key, limited)
+
+
+def coalesced_count() -> int:
+    """Number of requests served by piggybacking on an in-flight identical call."""
+    return _flights.coalesced
+
+
+register_gauges("upstream", lambda: {"coalesced": coalesced_count()})
@@ -0,0 +1,105 @@
+"""Context packing node — MMR rerank of retrieved stories into a token budget."""
+
+import logging
+
+import numpy as np
+
+from agents.retrieval import story_embeddings
+from agents.tokens import count_tokens, truncate_to_tokens
+from config.settings import (
+    CONTEXT_MIN_SUMMARY_TOKENS,
+    CONTEXT_TOKEN_BUDGET,
+    FAISS_TOP_K,
+    MMR_LAMBDA,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def format_story(i: int, post: dict) -> str:
+    """Prompt block for one retrieved story."""
+    topics_str = ", ".join(post.get("topics", []))
+    comments = post.get("num_comments", 0)
+    return (
+        f"[{i}] (score: {post['score']}, comments: {comments}, topics: {topics_str})\n"
+        f"Title: {post['title']}\n"
+        f"Summary: {post['summary']}"
+    )
+
+
+def _unit_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def mmr_order(embeddings: np.ndarray, relevance: np.ndarray, k: int, lam: float = MMR_LAMBDA) -> list[int]:
+    """Maximal Marginal Relevance selection order over candidate rows.
+
+    Each step picks argmax of ``lam * relevance - (1 - lam) * max_sim_to_selected``
+    with the pairwise similarity matrix computed once up front.
+    """
+    n = embeddings.shape[0]
+    unit = _unit_rows(embeddings)
+    pairwise = unit @ unit.T
+    max_sim = np.zeros(n, dtype=np.float32)
+    available = np.ones(n, dtype=bool)
+    order: list[int] = []
+    for _ in range(min(k, n)):
+        scores = np.where(available, lam * relevance - (1 - lam) * max_sim, -np.inf)
+        j = int(np.argmax(scores))
+        order.append(j)
+        available[j] = False
+        np.maximum(max_sim, pairwise[j], out=max_sim)
+    return order
+
+
+def _relevance(posts: list[dict], embeddings: np.ndarray, query_embedding) -> np.ndarray:
+    """Query similarity when the query was embedded, else rank-normalized retrieval scores."""
+    if query_embedding is not None:
+        query = _unit_rows(np.asarray(query_embedding, dtype=np.float32).reshape(1, -1))[0]
+        return _unit_rows(embeddings) @ query
+    n = len(posts)
+    return np.linspace(1.0, 0.5, n, dtype=np.float32) if n > 1 else np.ones(n, dtype=np.float32)
+
+
+def _fit(post: dict, i: int, remaining: int) -> tuple[dict, int] | None:
+    """Post (summary truncated if needed) and its token cost, or None if it cannot fit."""
+    tokens = count_tokens(format_story(i, post))
+    if tokens <= remaining:
+        return post, tokens
+    overhead = count_tokens(format_story(i, {**post, "summary": ""}))
+    summary_budget = remaining - overhead
+    if summary_budget < CONTEXT_MIN_SUMMARY_TOKENS:
+        return None
+    trimmed = {**post, "summary": truncate_to_tokens(post["summary"], summary_budget - 1)}
+    return trimmed, count_tokens(format_story(i, trimmed))
+
+
+def pack_context(state: dict) -> dict:
+    """Rerank retrieved posts for diversity and pack up to FAISS_TOP_K into the token budget."""
+    candidates = state.get("retrieved_posts", [])
+    if not candidates:
+        return state
+
+    embeddings = None
+    if state.get("retrieval_plan") != "reuse":  # reused stories keep their numbering for "the second one"
+        embeddings = story_embeddings([p.get("doc_index", -1) for p in candidates])
+    if embeddings is not None and len(embeddings) == len(candidates):
+        relevance = _relevance(candidates, embeddings, state.get("query_embedding"))
+        ordered = [candidates[j] for j in mmr_order(embeddings, relevance, FAISS_TOP_K)]
+    else:
+        ordered = candidates[:FAISS_TOP_K]
+
+    packed: list[dict] = []
+    remaining = CONTEXT_TOKEN_BUDGET
+    for post in ordered:
+        fitted = _fit(post, len(packed) + 1, remaining)
+        if fitted is None:
+            break
+        post, tokens = fitted
+        packed.append(post)
+        remaining -= tokens
+
+    used = CONTEXT_TOKEN_BUDGET - remaining
+    logger.info("Packed %d/%d stories into %d context tokens", len(packed), len(candidates), used)
+    return {**state, "retrieved_posts": packed, "context_tokens": used}
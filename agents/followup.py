@@ -0,0 +1,91 @@
+"""Follow-up planning node — reuse the previous turn's stories or retrieve with a blended query."""
+
+import logging
+
+import numpy as np
+
+from agents.artifacts import current_generation
+from agents.metrics import incr
+from agents.retrieval import embed_query, posts_by_index
+from config.settings import FOLLOWUP_QUERY_WEIGHT, FOLLOWUP_REUSE_COVERAGE
+from pipeline.bm25 import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Words that point back at the previous answer rather than introduce a new subject
+_REFERENCE_WORDS = frozenset(
+    "it its this that these those they them their one ones first second third fourth "
+    "fifth last former latter above previous same more elaborate expand detail details "
+    "explain else further deeper story stories article post link".split()
+)
+
+
+def _covered(query: str, posts: list[dict]) -> bool:
+    """True when the follow-up's content terms are (mostly) about the previous stories."""
+    terms = [t for t in tokenize(query) if t not in _REFERENCE_WORDS]
+    if not terms:
+        return True  # "tell me more about the second one", "why?"
+    known: set[str] = set()
+    for post in posts:
+        known.update(tokenize(f"{post['title']} {post.get('summary', '')} {' '.join(post.get('topics', []))}"))
+    coverage = sum(t in known for t in terms) / len(terms)
+    return coverage >= FOLLOWUP_REUSE_COVERAGE
+
+
+def _blend(current: np.ndarray, previous) -> np.ndarray:
+    """Unit-norm weighted mix of the follow-up and previous query embeddings."""
+    mixed = FOLLOWUP_QUERY_WEIGHT * current.ravel() + (1 - FOLLOWUP_QUERY_WEIGHT) * np.asarray(previous).ravel()
+    norm = np.linalg.norm(mixed)
+    return (mixed / norm if norm else mixed).astype(np.float32)[None, :]
+
+
+def record_retrieval(state: dict) -> dict | None:
+    """Conversation context to carry into the next turn (None if nothing was retrieved)."""
+    doc_indices = [p["doc_index"] for p in state.get("retrieved_posts", []) if "doc_index" in p]
+    if not doc_indices:
+        return None
+    return {
+        "query": state.get("retrieval_query") or state["query"],
+        "doc_indices": doc_indices,
+        "query_embedding": state.get("query_embedding"),
+        "generation": current_generation(),
+    }
+
+
+def plan_followup(state: dict) -> dict:
+    """Decide locally how a follow-up gets its stories; first turns pass straight through.
+
+    - ``reuse``: the follow-up refers to the previous stories — hand them to the
+      packer as-is, skipping embedding and search.
+    - ``blend``: new subject matter — retrieve with the previous query folded in,
+      lexically (concatenated text) and semantically (weighted embedding mix).
+    """
+    previous = state.get("previous_retrieval")
+    if not state.get("chat_history") or not previous:
+        return {**state, "retrieval_plan": "fresh"}
+    if previous.get("generation") != current_generation():
+        return {**state, "retrieval_plan": "fresh"}  # stories re-indexed since the last turn
+
+    query = state["query"]
+    posts = posts_by_index(previous["doc_indices"])
+    if posts and _covered(query, posts):
+        incr("followup.reuse")
+        logger.info("Follow-up reuses %d stories from the previous turn: %s", len(posts), query[:80])
+        return {
+            **state,
+            "retrieval_plan": "reuse",
+            "retrieved_posts": posts,
+            "query_embedding": previous.get("query_embedding"),
+            "retrieval_query": previous["query"],
+        }
+
+    incr("followup.blend")
+    embedding = embed_query(query)
+    if previous.get("query_embedding") is not None:
+        embedding = _blend(embedding, previous["query_embedding"])
+    return {
+        **state,
+        "retrieval_plan": "blend",
+        "retrieval_query": f"{previous['query']} {query}",
+        "query_embedding": embedding,
+    }
@@ -1,11 +1,19 @@
-"""LangGraph agent graph — retrieve → synthesize+respond."""
+"""LangGraph agent graph — route → response cache → follow-up plan → retrieve → pack context → respond."""
 
 import logging
+import threading
+import time
+from collections.abc import Iterator
 from typing import TypedDict
 
 from langgraph.graph import StateGraph, END
 
+from agents.answer_cache import check_response_cache, store_response
+from agents.context import pack_context
+from agents.followup import plan_followup, record_retrieval
+from agents.metrics import dump_metrics, observe, span, trace, traced
 from agents.retrieval import retrieve
+from agents.router import OPEN_INTENT, route
 from agents.synthesis import synthesize_and_respond
 
 logger = logging.getLogger(__name__)
@@ -14,40 +22,142 @@ logger = logging.getLogger(__name__)
 class AgentState(TypedDict, total=False):
     query: str
     chat_history: list[dict]
+    intent: str
+    previous_retrieval: dict  # last turn's stories + query embedding, carried by the caller
+    retrieval_plan: str       # fresh | reuse | blend
+    retrieval_query: str
+    query_embedding: object  # np.ndarray | None, shared by cache check and retrieval
     retrieved_posts: list[dict]
+    context_tokens: int
     response: str
+    cache_hit: bool
 
 
 def build_graph() -> StateGraph:
     """Build and compile the LangGraph agent graph."""
     graph = StateGraph(AgentState)
 
-    graph.add_node("retrieve", retrieve)
-    graph.add_node("respond", synthesize_and_respond)
-
-    graph.set_entry_point("retrieve")
-    graph.add_edge("retrieve", "respond")
-    graph.add_edge("respond", END)
+    nodes = {
+        "route": route,
+        "check_cache": check_response_cache,
+        "plan_followup": plan_followup,
+        "retrieve": retrieve,
+        "pack_context": pack_context,
+        "respond": synthesize_and_respond,
+        "store_cache": store_response,
+    }
+    for name, node in nodes.items():
+        graph.add_node(name, traced(f"node.{name}")(node))
+
+    graph.set_entry_point("route")
+    graph.add_conditional_edges(
+        "route",
+        lambda state: "open" if state.get("intent", OPEN_INTENT) == OPEN_INTENT else "answered",
+        {"answered": END, "open": "check_cache"},
+    )
+    graph.add_conditional_edges(
+        "check_cache",
+        lambda state: "hit" if state.get("cache_hit") else "miss",
+        {"hit": END, "miss": "plan_followup"},
+    )
+    graph.add_conditional_edges(
+        "plan_followup",
+        lambda state: "reuse" if state.get("retrieval_plan") == "reuse" else "search",
+        {"reuse": "pack_context", "search": "retrieve"},
+    )
+    graph.add_edge("retrieve", "pack_context")
+    graph.add_edge("pack_context", "respond")
+    graph.add_edge("respond", "store_cache")
+    graph.add_edge("store_cache", END)
 
     return graph.compile()
 
 
 _agent = None
+_agent_lock = threading.Lock()
+
+FALLBACK_RESPONSE = "Sorry, I couldn't generate a response."
 
 
 def get_agent():
+    """Process-wide compiled graph, shared by every session."""
     global _agent
     if _agent is None:
-        _agent = build_graph()
-        logger.info("LangGraph agent compiled")
+        with _agent_lock:
+            if _agent is None:
+                _agent = build_graph()
+                logger.info("LangGraph agent compiled")
     return _agent
 
 
-def query_agent(user_query: str, chat_history: list[dict] | None = None) -> str:
-    """Run a user query through the agent and return the response text."""
+def _initial_state(user_query: str, chat_history: list[dict] | None, conversation: dict | None) -> dict:
+    state = {"query": user_query, "chat_history": chat_history or []}
+    if conversation and chat_history and conversation.get("previous_retrieval"):
+        state["previous_retrieval"] = conversation["previous_retrieval"]
+    return state
+
+
+def _remember(conversation: dict | None, final: dict) -> None:
+    """Carry this turn's retrieved set into the caller's conversation context."""
+    if conversation is None:
+        return
+    retrieval = record_retrieval(final) if final.get("retrieved_posts") else None
+    if retrieval is not None:
+        conversation["previous_retrieval"] = retrieval
+
+
+def query_agent(
+    user_query: str,
+    chat_history: list[dict] | None = None,
+    conversation: dict | None = None,
+) -> str:
+    """Run a user query through the agent and return the response text.
+
+    ``conversation`` is an optional dict owned by the caller (e.g. session state);
+    it is updated in place with this turn's retrieval so follow-ups can reuse it.
+    """
+    agent = get_agent()
+    with trace(), span("agent.query", streaming=False):
+        result = agent.invoke(_initial_state(user_query, chat_history, conversation))
+    _remember(conversation, result)
+    dump_metrics()
+    return result.get("response", FALLBACK_RESPONSE)
+
+
+def query_agent_stream(
+    user_query: str,
+    chat_history: list[dict] | None = None,
+    conversation: dict | None = None,
+) -> Iterator[str]:
+    """Run a user query through the agent, yielding response text as it is generated.
+
+    LLM tokens from the ``respond`` node are relayed as they arrive. Answers that
+    never touch the LLM (e.g. response-cache hits) are yielded whole at the end.
+    ``conversation`` behaves as in query_agent.
+    """
     agent = get_agent()
-    result = agent.invoke({
-        "query": user_query,
-        "chat_history": chat_history or [],
-    })
-    return result.get("response", "Sorry, I couldn't generate a response.")
+    streamed = False
+    final: dict = {}
+    with trace(), span("agent.query", streaming=True) as attrs:
+        start = time.perf_counter()
+        for mode, payload in agent.stream(
+            _initial_state(user_query, chat_history, conversation),
+            stream_mode=["messages", "values"],
+        ):
+            if mode == "values":
+                final = payload
+                continue
+            chunk, metadata = payload
+            if metadata.get("langgraph_node") == "respond" and chunk.content:
+                if not streamed:
+                    attrs["ttft_ms"] = round((time.perf_counter() - start) * 1000, 2)
+                    observe("agent.ttft", attrs["ttft_ms"])
+                streamed = True
+                yield chunk.content
+
+        attrs["intent"] = final.get("intent")
+        attrs["retrieval_plan"] = final.get("retrieval_plan")
+        _remember(conversation, final)
+        if not streamed:
+            yield final.get("response", FALLBACK_RESPONSE)
+    dump_metrics()
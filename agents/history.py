@@ -0,0 +1,84 @@
+"""Chat history budgeting — recent turns verbatim, older turns folded into a running summary."""
+
+import logging
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from agents.clients import get_chat_model, upstream_slot
+from agents.metrics import span
+from agents.tokens import count_tokens, truncate_to_tokens
+from config.settings import HISTORY_RECENT_TURNS, HISTORY_SUMMARY_MAX_TOKENS, HISTORY_TOKEN_BUDGET
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_ROLE = "summary"  # pseudo-role carrying the folded-history summary
+
+
+def trim_history(chat_history: list[dict]) -> list[dict]:
+    """Keep a leading summary entry plus the newest turns that fit the token budget.
+
+    Pure and LLM-free, so it is safe to apply to any history (e.g. from API
+    callers that never went through prepare_history).
+    """
+    summary = [m for m in chat_history[:1] if m["role"] == SUMMARY_ROLE]
+    turns = chat_history[len(summary):][-2 * HISTORY_RECENT_TURNS:]
+
+    kept: list[dict] = []
+    remaining = HISTORY_TOKEN_BUDGET
+    for msg in reversed(turns):
+        tokens = count_tokens(msg["content"])
+        if tokens > remaining:
+            if not kept:  # always keep (a truncated) last message
+                kept.append({**msg, "content": truncate_to_tokens(msg["content"], remaining)})
+            break
+        kept.append(msg)
+        remaining -= tokens
+    return summary + kept[::-1]
+
+
+def _fold(summary: str, turns: list[dict]) -> str:
+    """Ask the LLM to merge newly aged-out turns into the running summary."""
+    transcript = "\n".join(f"{m['role']}: {m['content']}" for m in turns)
+    messages = [
+        SystemMessage(content=(
+            "You maintain a running summary of a conversation about today's tech news. "
+            "Merge the new turns into the existing summary. Keep the topics, stories and "
+            "facts the user cared about; drop pleasantries. Reply with the summary only, "
+            f"under {HISTORY_SUMMARY_MAX_TOKENS} tokens."
+        )),
+        HumanMessage(content=f"Existing summary:\n{summary or '(none)'}\n\nNew turns:\n{transcript}"),
+    ]
+    with upstream_slot(), span("llm.history_summary", turns=len(turns)) as attrs:
+        result = get_chat_model(0.2).invoke(messages)
+        usage = result.usage_metadata or {}
+        attrs["input_tokens"] = usage.get("input_tokens")
+        attrs["output_tokens"] = usage.get("output_tokens")
+    return truncate_to_tokens(result.content.strip(), HISTORY_SUMMARY_MAX_TOKENS)
+
+
+def prepare_history(messages: list[dict], cache: dict | None = None) -> tuple[list[dict], dict]:
+    """Budget a full conversation for the next prompt.
+
+    ``cache`` is the ``{"covered": n, "summary": str}`` dict returned by the
+    previous call (kept in session state): only turns that aged out since then
+    are summarized, so each follow-up costs at most one small summary call.
+    Returns (history to send to the agent, updated cache).
+    """
+    cache = dict(cache or {})
+    keep = min(len(messages), 2 * HISTORY_RECENT_TURNS)
+    older = messages[: len(messages) - keep]
+
+    covered = cache.get("covered", 0)
+    summary = cache.get("summary", "")
+    if covered > len(older):  # conversation was reset or rewritten
+        covered, summary = 0, ""
+
+    if len(older) > covered:
+        try:
+            summary = _fold(summary, older[covered:])
+            covered = len(older)
+        except Exception:
+            logger.warning("History summarization failed — keeping previous summary", exc_info=True)
+
+    history = ([{"role": SUMMARY_ROLE, "content": summary}] if summary else []) + messages[len(older):]
+    return trim_history(history), {"covered": covered, "summary": summary}
@@ -0,0 +1,122 @@
+"""Background chat jobs — bounded shared executor running agent queries off the UI thread."""
+
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from config.settings import CHAT_JOB_MAX_PENDING, CHAT_JOB_TTL_S, CHAT_JOB_WORKERS
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=CHAT_JOB_WORKERS, thread_name_prefix="chat-job")
+_jobs: dict[str, dict] = {}
+_lock = threading.Lock()
+
+
+class QueueFull(RuntimeError):
+    """Raised by submit() when CHAT_JOB_MAX_PENDING jobs are already queued or running."""
+
+
+def _run(job: dict, prompt: str, history: list[dict], history_cache: dict | None, conversation: dict) -> None:
+    # Deferred so importing this module stays cheap for the UI's first paint
+    from agents.graph import query_agent_stream
+    from agents.history import prepare_history
+
+    with _lock:
+        job["status"] = "running"
+        job["started"] = time.time()
+    try:
+        if history:
+            # Bounded prompt: older turns folded into a summary the session keeps
+            history, history_cache = prepare_history(history, history_cache)
+            with _lock:
+                job["history_cache"] = history_cache
+        for chunk in query_agent_stream(prompt, chat_history=history, conversation=conversation):
+            with _lock:
+                job["chunks"].append(chunk)
+        status, error = "done", None
+    except Exception as e:
+        logger.exception("Chat job %s failed", job["id"])
+        status, error = "error", str(e)
+    with _lock:
+        job["status"] = status
+        job["error"] = error
+        job["finished"] = time.time()
+
+
+def _expire(now: float) -> None:
+    """Drop finished jobs nobody collected within CHAT_JOB_TTL_S (caller holds _lock)."""
+    for job_id in [i for i, j in _jobs.items() if j["finished"] and now - j["finished"] > CHAT_JOB_TTL_S]:
+        del _jobs[job_id]
+
+
+def submit(
+    prompt: str,
+    history: list[dict] | None = None,
+    history_cache: dict | None = None,
+    conversation: dict | None = None,
+) -> str:
+    """Queue an agent query and return its job id; raises QueueFull when saturated.
+
+    ``history_cache`` is the session's prepare_history() cache; the updated
+    copy is returned on the finished job. ``conversation`` is updated in place
+    as in agents.graph.query_agent.
+    """
+    now = time.time()
+    with _lock:
+        _expire(now)
+        pending = sum(1 for j in _jobs.values() if j["status"] in ("queued", "running"))
+        if pending >= CHAT_JOB_MAX_PENDING:
+            raise QueueFull(f"{pending} questions are already being answered")
+        job = {
+            "id": uuid.uuid4().hex,
+            "status": "queued",
+            "chunks": [],
+            "error": None,
+            "history_cache": history_cache,
+            "created": now,
+            "started": None,
+            "finished": None,
+        }
+        _jobs[job["id"]] = job
+    _executor.submit(_run, job, prompt, list(history or []), history_cache, conversation if conversation is not None else {})
+    return job["id"]
+
+
+def poll(job_id: str) -> dict | None:
+    """Snapshot of a job: status, text so far, error, history cache, queue position."""
+    with _lock:
+        job = _jobs.get(job_id)
+        if job is None:
+            return None
+        ahead = 0
+        if job["status"] == "queued":
+            ahead = sum(1 for j in _jobs.values() if j["status"] == "queued" and j["created"] < job["created"])
+        return {
+            "status": job["status"],
+            "text": "".join(job["chunks"]),
+            "error": job["error"],
+            "history_cache": job["history_cache"],
+            "ahead": ahead,
+        }
+
+
+def collect(job_id: str) -> None:
+    """Forget a finished job once its answer has been stored by the caller."""
+    with _lock:
+        _jobs.pop(job_id, None)
+
+
+def queue_depth() -> dict:
+    """Running/queued job counts across every session, for the saturation indicator."""
+    with _lock:
+        running = sum(1 for j in _jobs.values() if j["status"] == "running")
+        queued = sum(1 for j in _jobs.values() if j["status"] == "queued")
+    return {
+        "running": running,
+        "queued": queued,
+        "workers": CHAT_JOB_WORKERS,
+        "saturated": running >= CHAT_JOB_WORKERS,
+    }
@@ -0,0 +1,198 @@
+"""Latency tracing — span timing, structured trace logs, in-process p50/p95/p99 registry."""
+
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+from config.settings import METRICS_DUMP_INTERVAL_S, METRICS_MAX_SAMPLES, METRICS_PATH
+
+logger = logging.getLogger(__name__)
+trace_logger = logging.getLogger("thedaily.trace")  # one JSON object per span
+
+_trace_id: ContextVar[str] = ContextVar("trace_id", default="-")
+
+
+class Histogram:
+    """Latency histogram over the most recent METRICS_MAX_SAMPLES observations."""
+
+    def __init__(self, max_samples: int = METRICS_MAX_SAMPLES):
+        self._samples: deque[float] = deque(maxlen=max_samples)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self._samples.append(value)
+        self.count += 1
+        self.total += value
+
+    def summary(self) -> dict:
+        samples = sorted(self._samples)
+        if not samples:
+            return {"count": 0}
+
+        def pct(p: float) -> float:
+            return round(samples[min(len(samples) - 1, int(p * len(samples)))], 2)
+
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 2),
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+            "p99_ms": pct(0.99),
+            "max_ms": round(samples[-1], 2),
+        }
+
+
+_lock = threading.Lock()
+_histograms: dict[str, Histogram] = {}
+_counters: dict[str, float] = {}
+_gauges: dict[str, Callable[[], dict]] = {}
+_last_dump = 0.0
+
+
+def observe(name: str, ms: float) -> None:
+    with _lock:
+        hist = _histograms.get(name)
+        if hist is None:
+            hist = _histograms[name] = Histogram()
+        hist.observe(ms)
+
+
+def incr(name: str, value: float = 1) -> None:
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+@contextmanager
+def trace(trace_id: str | None = None):
+    """Tag every span in this context with one trace id (one per user query)."""
+    token = _trace_id.set(trace_id or uuid.uuid4().hex[:12])
+    try:
+        yield _trace_id.get()
+    finally:
+        _trace_id.reset(token)
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """Time a block; the yielded dict collects extra attributes (tokens, cache hits).
+
+    Records the duration in the ``name`` histogram, adds numeric ``*_tokens``
+    attributes to counters, and emits one structured JSON trace log line.
+    """
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        yield attrs
+    except GeneratorExit:
+        status = "cancelled"  # streaming consumer went away
+        raise
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        ms = (time.perf_counter() - start) * 1000
+        observe(name, ms)
+        incr(f"{name}.calls")
+        if status == "error":
+            incr(f"{name}.errors")
+        for key, value in attrs.items():
+            if key.endswith("_tokens") and isinstance(value, (int, float)):
+                incr(f"{name}.{key}", value)
+            elif isinstance(value, bool):
+                incr(f"{name}.{key}", int(value))
+        trace_logger.info(json.dumps(
+            {"trace_id": _trace_id.get(), "span": name, "ms": round(ms, 2), "status": status, **attrs},
+            default=str,
+        ))
+
+
+def traced(name: str):
+    """Decorator wrapping a function (e.g. a graph node) in a span."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def register_gauges(name: str, fn: Callable[[], dict]) -> None:
+    """Report ``fn()``'s numeric fields as gauges ``<name>.<field>`` in every snapshot."""
+    with _lock:
+        _gauges[name] = fn
+
+
+def _read_gauges() -> dict:
+    with _lock:
+        sources = sorted(_gauges.items())
+    gauges = {}
+    for name, fn in sources:  # called outside _lock: sources take their own locks
+        try:
+            values = fn()
+        except Exception:
+            logger.warning("Gauge source %s failed", name, exc_info=True)
+            continue
+        for field, value in values.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                gauges[f"{name}.{field}"] = value
+    return gauges
+
+
+def snapshot() -> dict:
+    """Current histograms, counters and gauges."""
+    gauges = _read_gauges()
+    with _lock:
+        return {
+            "pid": os.getpid(),
+            "at": datetime.now(timezone.utc).isoformat(),
+            "latency": {name: hist.summary() for name, hist in sorted(_histograms.items())},
+            "counters": dict(sorted(_counters.items())),
+            "gauges": gauges,
+        }
+
+
+def render_prometheus() -> str:
+    """Metrics in Prometheus text exposition format for scraping."""
+    snap = snapshot()
+    lines = []
+    for name, summary in snap["latency"].items():
+        metric = "thedaily_" + name.replace(".", "_") + "_ms"
+        for q in ("p50", "p95", "p99"):
+            if f"{q}_ms" in summary:
+                lines.append(f'{metric}{{quantile="0.{q[1:]}"}} {summary[f"{q}_ms"]}')
+        lines.append(f"{metric}_count {summary['count']}")
+    for name, value in snap["counters"].items():
+        lines.append(f"thedaily_{name.replace('.', '_')}_total {value}")
+    for name, value in snap["gauges"].items():
+        lines.append(f"thedaily_{name.replace('.', '_')} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def dump_metrics(path: Path | str = METRICS_PATH, force: bool = False) -> None:
+    """Write snapshot() as JSON, at most once per METRICS_DUMP_INTERVAL_S unless forced."""
+    global _last_dump
+    now = time.monotonic()
+    if not force and now - _last_dump < METRICS_DUMP_INTERVAL_S:
+        return
+    _last_dump = now
+    path = Path(str(path).format(pid=os.getpid()))
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "w") as f:
+            json.dump(snapshot(), f, indent=2)
+        os.replace(tmp, path)
+    except OSError:
+        logger.warning("Failed to dump metrics to %s", path, exc_info=True)
@@ -2,50 +2,284 @@
 
 import json
 import logging
+import os
+import threading
 
 import faiss
 import numpy as np
-from openai import OpenAI
 
-from config.settings import EMBEDDING_MODEL, FAISS_INDEX_PATH, FAISS_TOP_K, OPENAI_API_KEY, SUMMARIES_PATH
+from config.settings import (
+    BM25_INDEX_PATH,
+    CONTEXT_CANDIDATES,
+    EMBEDDING_MODEL,
+    EMBEDDINGS_PATH,
+    FAISS_INDEX_PATH,
+    FAISS_USE_MMAP,
+    LEXICAL_FAST_PATH_MAX_TERMS,
+    NEIGHBOR_IDS_PATH,
+    NEIGHBOR_SCORES_PATH,
+    QUERY_EMBEDDING_CACHE_PATH,
+    QUERY_EMBEDDING_CACHE_SIZE,
+    QUERY_EMBEDDING_CACHE_TTL_S,
+    RRF_K,
+    SUMMARIES_PATH,
+)
+from agents.artifacts import current_generation, normalize_query
+from agents.cache import QueryEmbeddingCache
+from agents.clients import coalesce, get_openai_client, request_key
+from agents.metrics import incr, register_gauges, span
+from pipeline.bm25 import bm25_search, load_bm25_index, tokenize
 
 logger = logging.getLogger(__name__)
 
-_client: OpenAI | None = None
 _index: faiss.Index | None = None
+_embeddings: np.ndarray | None = None
 _metadata: list[dict] | None = None
+_neighbor_ids: np.ndarray | None = None
+_neighbor_scores: np.ndarray | None = None
+_bm25: dict | None = None
+_embedding_cache: QueryEmbeddingCache | None = None
+_generation: str | None = None
+_load_lock = threading.Lock()  # sessions share one copy; never load it twice concurrently
+
+_QUESTION_WORDS = frozenset(
+    "what whats what's how why who which when where is are can does do should "
+    "explain summarize compare".split()
+)
+
+
+def _read_index() -> faiss.Index:
+    """Open the FAISS index memory-mapped so workers share its pages.
+
+    Plain IO_FLAG_MMAP only maps IVF inverted lists: a flat index is still
+    copied into anonymous memory, silently. IO_FLAG_MMAP_IFC (faiss >= 1.11)
+    maps the flat code array itself, so its pages stay file-backed.
+    """
+    flag = getattr(faiss, "IO_FLAG_MMAP_IFC", None)
+    if FAISS_USE_MMAP and flag is not None:
+        try:
+            return faiss.read_index(str(FAISS_INDEX_PATH), flag)
+        except RuntimeError:
+            logger.warning("FAISS mmap load failed — falling back to a private copy", exc_info=True)
+    elif FAISS_USE_MMAP:
+        logger.warning("faiss %s cannot mmap flat indexes — each worker loads a private copy", faiss.__version__)
+    return faiss.read_index(str(FAISS_INDEX_PATH))
 
 
 def _load_resources():
-    global _client, _index, _metadata
-    if _client is None:
-        _client = OpenAI(api_key=OPENAI_API_KEY)
-    if _index is None:
-        _index = faiss.read_index(str(FAISS_INDEX_PATH))
-    if _metadata is None:
-        with open(SUMMARIES_PATH) as f:
-            _metadata = json.load(f)
+    """Load (or, after a new generation is published, reload) the shared search resources."""
+    global _index, _embeddings, _metadata, _bm25
+    global _neighbor_ids, _neighbor_scores, _embedding_cache, _generation
+    with _load_lock:
+        generation = current_generation()
+        if generation != _generation:
+            # A new pipeline run was published: drop the old mappings and reload
+            if _generation is not None:
+                logger.info("Index generation changed %s → %s — reloading", _generation, generation)
+            _index = _embeddings = _metadata = _bm25 = _neighbor_ids = _neighbor_scores = None
+            _generation = generation
+        if _embedding_cache is None:
+            _embedding_cache = QueryEmbeddingCache(
+                QUERY_EMBEDDING_CACHE_PATH, QUERY_EMBEDDING_CACHE_SIZE, QUERY_EMBEDDING_CACHE_TTL_S,
+            )
+        if _index is None:
+            _index = _read_index()
+        if _embeddings is None and EMBEDDINGS_PATH.exists():
+            _embeddings = np.load(str(EMBEDDINGS_PATH), mmap_mode="r" if FAISS_USE_MMAP else None)
+        if _neighbor_ids is None and NEIGHBOR_IDS_PATH.exists() and NEIGHBOR_SCORES_PATH.exists():
+            mmap_mode = "r" if FAISS_USE_MMAP else None
+            _neighbor_ids = np.load(str(NEIGHBOR_IDS_PATH), mmap_mode=mmap_mode)
+            _neighbor_scores = np.load(str(NEIGHBOR_SCORES_PATH), mmap_mode=mmap_mode)
+        if _bm25 is None and BM25_INDEX_PATH.exists():
+            _bm25 = load_bm25_index(BM25_INDEX_PATH)
+        if _metadata is None:
+            with open(SUMMARIES_PATH) as f:
+                _metadata = json.load(f)
+            report = worker_memory_report()
+            logger.info(
+                "Worker %d resources loaded — rss=%.1f MB (anon=%.1f MB, file-backed=%.1f MB, pss=%.1f MB)",
+                report["pid"], report["rss_mb"], report["anon_mb"], report["file_mb"], report["pss_mb"],
+            )
 
 
-def retrieve(state: dict) -> dict:
-    """Retrieve top-K relevant posts for the user query."""
+def index_ready() -> bool:
+    """Whether the pipeline has published the artifacts search needs."""
+    return FAISS_INDEX_PATH.exists() and SUMMARIES_PATH.exists()
+
+
+def preload() -> None:
+    """Load the shared search resources now instead of on the first query."""
     _load_resources()
 
-    query = state["query"]
 
-    # Embed query via OpenAI
-    resp = _client.embeddings.create(model=EMBEDDING_MODEL, input=[query])
-    query_embedding = np.array([resp.data[0].embedding], dtype=np.float32)
+def worker_memory_report() -> dict:
+    """RSS breakdown for this process, read from /proc (zeros where unavailable).
+
+    ``file_mb`` is the page-cache share backing mmapped artifacts, which is counted
+    once per box rather than once per worker; ``pss_mb`` splits shared pages
+    proportionally across the processes mapping them.
+    """
+    fields = {"VmRSS": "rss_mb", "RssAnon": "anon_mb", "RssFile": "file_mb", "Pss": "pss_mb"}
+    report = {"pid": os.getpid(), **{name: 0.0 for name in fields.values()}}
+    for path in ("/proc/self/status", "/proc/self/smaps_rollup"):
+        try:
+            with open(path) as f:
+                for line in f:
+                    key, _, value = line.partition(":")
+                    if key in fields:
+                        report[fields[key]] = int(value.split()[0]) / 1024  # kB → MB
+        except OSError:
+            continue
+    return report
+
+
+register_gauges("worker.memory", lambda: {k: v for k, v in worker_memory_report().items() if k != "pid"})
+
+
+def _is_keyword_query(query: str) -> bool:
+    """Short, non-question queries whose terms all exist in the lexical index."""
+    words = query.lower().split()
+    if not words or "?" in query or words[0] in _QUESTION_WORDS:
+        return False
+    tokens = set(tokenize(query))
+    if not tokens or len(words) > LEXICAL_FAST_PATH_MAX_TERMS:
+        return False
+    return all(t in _bm25["vocab"] for t in tokens)
+
+
+def _embed_query(query: str) -> np.ndarray:
+    """Embed a query as a (1, dim) float32 matrix, via the cache when possible."""
+    with span("embedding", model=EMBEDDING_MODEL) as attrs:
+        cached = _embedding_cache.get(query, EMBEDDING_MODEL)
+        attrs["cache_hit"] = cached is not None
+        if cached is not None:
+            return cached[None, :]
+
+        text = normalize_query(query)
+        resp = coalesce(
+            request_key("embed", EMBEDDING_MODEL, text),
+            lambda: get_openai_client().embeddings.create(model=EMBEDDING_MODEL, input=[text]),
+        )
+        attrs["input_tokens"] = resp.usage.total_tokens if resp.usage else None
+        embedding = np.array(resp.data[0].embedding, dtype=np.float32)
+        _embedding_cache.put(query, EMBEDDING_MODEL, embedding)
+        return embedding[None, :]
+
+
+def embedding_cache_stats() -> dict:
+    """Hit-rate metrics for the query-embedding cache."""
+    return _embedding_cache.stats() if _embedding_cache is not None else {}
+
+
+register_gauges("cache.embedding", embedding_cache_stats)
+
+
+def query_embedding(query: str) -> np.ndarray | None:
+    """Embedding that retrieve() would search with, or None on the lexical fast path."""
+    _load_resources()
+    if _bm25 is not None and _is_keyword_query(query):
+        return None
+    return _embed_query(query)
+
+
+def embed_query(query: str) -> np.ndarray:
+    """Public (1, dim) query embedding, through the cache."""
+    _load_resources()
+    return _embed_query(query)
+
+
+def _vector_search(query: str, top_k: int, embedding: np.ndarray | None = None) -> list[tuple[int, float]]:
+    if embedding is None:
+        embedding = _embed_query(query)
+    with span("faiss.search", k=top_k):
+        scores, indices = _index.search(np.asarray(embedding, dtype=np.float32).reshape(1, -1), top_k)
+    return [(int(idx), float(score)) for score, idx in zip(scores[0], indices[0]) if idx >= 0]
+
 
-    scores, indices = _index.search(query_embedding, FAISS_TOP_K)
+def _reciprocal_rank_fusion(*rankings: list[tuple[int, float]]) -> list[tuple[int, float]]:
+    """Fuse ranked (doc_index, score) lists by summed 1 / (RRF_K + rank)."""
+    fused: dict[int, float] = {}
+    for ranking in rankings:
+        for rank, (idx, _) in enumerate(ranking, 1):
+            fused[idx] = fused.get(idx, 0.0) + 1.0 / (RRF_K + rank)
+    return sorted(fused.items(), key=lambda x: -x[1])
 
-    retrieved = []
-    for score, idx in zip(scores[0], indices[0]):
+
+def _entries(ranked) -> list[dict]:
+    """Metadata copies for (doc_index, score) pairs, skipping out-of-range rows."""
+    entries = []
+    for idx, score in ranked:
         if idx < 0 or idx >= len(_metadata):
             continue
         entry = _metadata[idx].copy()
+        entry["doc_index"] = int(idx)
         entry["relevance_score"] = float(score)
-        retrieved.append(entry)
+        entries.append(entry)
+    return entries
+
+
+def posts_by_index(doc_indices: list[int]) -> list[dict]:
+    """Metadata entries for stored rows, in the given order — no search involved."""
+    _load_resources()
+    return _entries((idx, 0.0) for idx in doc_indices)
+
+
+def retrieve(state: dict) -> dict:
+    """Retrieve candidate posts for the user query (hybrid BM25 + vector).
+
+    Returns up to ``state["top_k"]`` (default CONTEXT_CANDIDATES) posts;
+    agents.context narrows them to the prompt's FAISS_TOP_K.
+    """
+    _load_resources()
+    top_k = state.get("top_k") or CONTEXT_CANDIDATES
 
-    logger.info("Retrieved %d posts for query: %s", len(retrieved), query[:80])
+    query = state["query"]
+    search_text = state.get("retrieval_query") or query  # follow-ups may blend in history
+    embedding = state.get("query_embedding")
+
+    lexical = []
+    if _bm25 is not None:
+        with span("bm25.search") as attrs:
+            lexical = bm25_search(_bm25, search_text, top_k * 2)
+            attrs["hits"] = len(lexical)
+    if lexical and embedding is None and _is_keyword_query(search_text):
+        # Exact-term lookup: skip the remote embedding round-trip entirely
+        ranked, mode = lexical, "lexical"
+    else:
+        vector = _vector_search(search_text, top_k * 2, embedding)
+        if lexical:
+            ranked, mode = _reciprocal_rank_fusion(vector, lexical), "hybrid"
+        else:
+            ranked, mode = vector, "vector"
+
+    retrieved = _entries(ranked[:top_k])
+
+    incr(f"retrieval.mode.{mode}")
+    logger.info("Retrieved %d posts (%s) for query: %s", len(retrieved), mode, query[:80])
     return {**state, "retrieved_posts": retrieved}
+
+
+def story_embeddings(doc_indices: list[int]) -> np.ndarray | None:
+    """Stored (n, dim) float32 embeddings for the given rows, or None if unavailable."""
+    _load_resources()
+    if _embeddings is None or not doc_indices:
+        return None
+    return np.asarray(_embeddings[np.asarray(doc_indices)], dtype=np.float32)
+
+
+def related_posts(post: dict | int, k: int = 5) -> list[dict]:
+    """Expand a retrieved story into its nearest neighbours — no embedding call.
+
+    ``post`` is either a retrieved entry (carrying ``doc_index``) or a row index
+    into ``summaries.json``. Returns an empty list if the pipeline has not yet
+    produced the neighbour graph.
+    """
+    _load_resources()
+    if _neighbor_ids is None:
+        return []
+
+    doc_index = post if isinstance(post, int) else post.get("doc_index", -1)
+    if doc_index < 0 or doc_index >= len(_neighbor_ids):
+        return []
+
+    return _entries(zip(_neighbor_ids[doc_index, :k].tolist(), _neighbor_scores[doc_index, :k].tolist()))
@@ -0,0 +1,143 @@
+"""Intent router node — answer aggregate questions straight from the insight artifacts."""
+
+import logging
+
+from agents.artifacts import load_artifact
+from agents.metrics import incr
+from config.settings import CHARTS_DATA_PATH, DAILY_DIGEST_PATH
+from pipeline.bm25 import tokenize
+
+logger = logging.getLogger(__name__)
+
+OPEN_INTENT = "open"
+
+# Intent → words that signal it. A query routes to a fast path only when every
+# remaining token belongs to some intent or to _FILLER; any other word (a topic,
+# a company, a language) means the question is open-ended and needs retrieval.
+INTENT_KEYWORDS: dict[str, frozenset[str]] = {
+    "trending": frozenset("trending trend trends topics topic themes".split()),
+    "breakthroughs": frozenset("breakthroughs breakthrough breaking major".split()),
+    "hot_discussions": frozenset("discussions discussion discussed debated controversial comments argue".split()),
+    "domains": frozenset("domains domain sites site websites links sources publishers".split()),
+    "story_types": frozenset("types type ask launch kinds".split()),
+    "top_stories": frozenset("top stories story best upvoted headlines biggest highest".split()),
+}
+_FILLER = frozenset(
+    "s hn hacker hot popular most right now currently day list give please "
+    "are there happening going on up being".split()
+)
+
+
+def classify_intent(query: str) -> str:
+    """Cheap keyword classifier; returns an INTENT_KEYWORDS key or OPEN_INTENT."""
+    tokens = [t for t in tokenize(query) if t not in _FILLER]
+    if not tokens or len(tokens) > 4:
+        return OPEN_INTENT
+
+    hits = dict.fromkeys(INTENT_KEYWORDS, 0)
+    for token in tokens:
+        matched = [intent for intent, words in INTENT_KEYWORDS.items() if token in words]
+        if not matched:
+            return OPEN_INTENT
+        for intent in matched:
+            hits[intent] += 1
+    return max(hits, key=hits.get)  # ties resolve in INTENT_KEYWORDS order
+
+
+def _story_line(s: dict, with_summary: bool = False) -> str:
+    line = (
+        f"**[{s['title']}]({s.get('hn_url', '')})** — "
+        f"{s.get('score', 0)} pts, {s.get('num_comments', 0)} comments"
+    )
+    summary = s.get("summary", "") if with_summary else ""
+    return f"{line}\n   {summary}" if summary else line
+
+
+def _answer_trending(charts: dict, digest: dict) -> str | None:
+    topics = charts.get("trending_topics") or digest.get("trending_topics")
+    if not topics:
+        return None
+    lines = [
+        f"{i}. **{topic}** — {info['count']} stories (avg {info['avg_score']} pts)"
+        for i, (topic, info) in enumerate(list(topics.items())[:8], 1)
+    ]
+    return "### What's trending today\n\n" + "\n".join(lines) + "\n\nAsk about any of these topics for the details."
+
+
+def _answer_top_stories(charts: dict, digest: dict) -> str | None:
+    stories = digest.get("top_posts") or charts.get("top_stories")
+    if not stories:
+        return None
+    lines = [f"{i}. {_story_line(s, with_summary=True)}" for i, s in enumerate(stories[:5], 1)]
+    return "### Today's top stories\n\n" + "\n".join(lines)
+
+
+def _answer_breakthroughs(charts: dict, digest: dict) -> str | None:
+    breakthroughs = digest.get("breakthroughs")
+    if breakthroughs is None:
+        return None
+    if not breakthroughs:
+        return "No stories crossed the breakthrough threshold today."
+    lines = [f"{i}. {_story_line(s, with_summary=True)}" for i, s in enumerate(breakthroughs[:5], 1)]
+    return "### Breaking through today\n\n" + "\n".join(lines)
+
+
+def _answer_hot_discussions(charts: dict, digest: dict) -> str | None:
+    discussions = charts.get("hot_discussions")
+    if not discussions:
+        return None
+    lines = [
+        f"{i}. {_story_line(d)} ({d.get('ratio', 0)}x comments per point)"
+        for i, d in enumerate(discussions[:5], 1)
+    ]
+    return "### Most debated today\n\nHighest comment-to-score ratio:\n\n" + "\n".join(lines)
+
+
+def _answer_domains(charts: dict, digest: dict) -> str | None:
+    domains = charts.get("domain_leaderboard")
+    if not domains:
+        return None
+    lines = [f"{i}. **{d['domain']}** — {d['count']} links" for i, d in enumerate(domains[:10], 1)]
+    return "### Where today's links point\n\n" + "\n".join(lines)
+
+
+def _answer_story_types(charts: dict, digest: dict) -> str | None:
+    types = charts.get("story_type_breakdown")
+    if not types:
+        return None
+    total = sum(types.values())
+    lines = [
+        f"- **{label}**: {count} ({round(100 * count / total) if total else 0}%)"
+        for label, count in types.items()
+    ]
+    return "### Today's story mix\n\n" + "\n".join(lines)
+
+
+_ANSWERS = {
+    "trending": _answer_trending,
+    "top_stories": _answer_top_stories,
+    "breakthroughs": _answer_breakthroughs,
+    "hot_discussions": _answer_hot_discussions,
+    "domains": _answer_domains,
+    "story_types": _answer_story_types,
+}
+
+
+def route(state: dict) -> dict:
+    """Classify the query; answer aggregate intents from charts/digest without any API call."""
+    if state.get("chat_history"):
+        return {**state, "intent": OPEN_INTENT}  # follow-ups lean on conversation context
+
+    intent = classify_intent(state["query"])
+    if intent == OPEN_INTENT:
+        return {**state, "intent": intent}
+
+    charts = load_artifact(CHARTS_DATA_PATH) or {}
+    digest = load_artifact(DAILY_DIGEST_PATH) or {}
+    response = _ANSWERS[intent](charts, digest)
+    if response is None:
+        return {**state, "intent": OPEN_INTENT}  # artifacts missing — let retrieval try
+
+    incr(f"router.fast_path.{intent}")
+    logger.info("Answered '%s' intent from insight artifacts: %s", intent, state["query"][:80])
+    return {**state, "intent": intent, "response": response}
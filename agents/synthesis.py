@@ -1,14 +1,113 @@
-"""Synthesis + response node — single LLM call to produce the final answer."""
+"""Synthesis + response node — single LLM call to produce the final answer.
+
+Prompts are laid out most-stable-first so the provider's automatic prefix cache
+can reuse them across users: system prompt → the day's shared briefing (top
+stories with summaries, filled to a fixed token budget so the shared prefix
+clears the provider's 1024-token cache minimum) → retrieved stories, in the
+order and numbering pack_context chose → conversation → the question.
+"""
 
 import logging
 
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
 
-from config.settings import OPENAI_API_KEY, OPENAI_MODEL
+from agents.artifacts import derived_artifact
+from agents.clients import coalesce, get_chat_model, request_key
+from agents.context import format_story
+from agents.history import SUMMARY_ROLE, trim_history
+from agents.metrics import span
+from agents.tokens import count_tokens, truncate_to_tokens
+from config.settings import (
+    BRIEFING_TOKEN_BUDGET,
+    CONTEXT_MIN_SUMMARY_TOKENS,
+    DAILY_DIGEST_PATH,
+    OPENAI_MODEL,
+    PROMPT_CACHE_MIN_TOKENS,
+)
 
 logger = logging.getLogger(__name__)
 
+SYSTEM_PROMPT = (
+    "You are 'The Daily', a friendly and knowledgeable tech news assistant. "
+    "Given Hacker News stories and their summaries, provide a clear, conversational answer "
+    "to the user's question. Highlight key trends and insights. Use markdown formatting. "
+    "End with a brief 'Sources' section listing the relevant HN stories. "
+    "Use the conversation history to understand follow-up questions.\n\n"
+    "How to use the material below:\n"
+    "- 'Today's briefing' is the same for every reader today: the trending topics and the day's top "
+    "stories with their summaries. Use it for overview questions and to put a story in context.\n"
+    "- 'Relevant stories from today' were retrieved for this question and are numbered [1], [2], … in "
+    "order of relevance. Prefer them for specifics and cite them by those numbers.\n"
+    "- Only state facts that appear in the briefing or the stories. If they do not answer the question, "
+    "say so plainly and suggest a related question they can answer instead of guessing.\n"
+    "- Scores are Hacker News points and comment counts are discussion size; treat them as signals of "
+    "interest, not of correctness.\n\n"
+    "Style:\n"
+    "- Lead with a one or two sentence answer, then supporting detail as short bullet points.\n"
+    "- Keep answers under about 250 words unless the user asks for more depth.\n"
+    "- Group related stories into themes rather than listing them one by one when there are several.\n"
+    "- Keep titles as they appear; do not invent links. The Sources section uses the markdown links "
+    "given under '--- Sources ---'.\n"
+    "- For follow-ups, answer the new question directly without repeating the previous answer."
+)
+
+
+def _briefing_entry(post: dict) -> str:
+    topics = ", ".join(post.get("topics") or [])
+    meta = f"{post.get('score', 0)} pts, {post.get('num_comments', 0)} comments" + (f"; {topics}" if topics else "")
+    summary = post.get("summary", "")
+    return f"- {post['title']} ({meta})" + (f": {summary}" if summary and summary != post["title"] else "")
+
+
+def _render_briefing(digest: dict) -> str:
+    """The day's digest as one block of at most BRIEFING_TOKEN_BUDGET tokens (with the system prompt).
+
+    Entries are the top posts then any further breakthroughs, in digest order,
+    each with its summary; the last one that does not fit is truncated. The
+    result depends only on the digest, so it is byte-identical for every
+    request of a generation and can be served from the provider's prefix cache.
+    """
+    if not digest:
+        return ""
+    trending = ", ".join(
+        f"{topic} ({info['count']})" for topic, info in digest.get("trending_topics", {}).items()
+    )
+    lines = [
+        f"--- Today's briefing ({digest.get('date', '')}, {digest.get('total_posts', 0)} stories) ---",
+        f"Trending topics: {trending}",
+        "",
+        "Top stories:",
+    ]
+    budget = BRIEFING_TOKEN_BUDGET - count_tokens(SYSTEM_PROMPT) - count_tokens("\n".join(lines))
+    seen = set()
+    for post in [*digest.get("top_posts", []), *digest.get("breakthroughs", [])]:
+        if post.get("hn_url") in seen:
+            continue
+        seen.add(post.get("hn_url"))
+        entry = _briefing_entry(post)
+        cost = count_tokens(entry) + 1  # + the joining newline
+        if cost > budget:
+            if budget > CONTEXT_MIN_SUMMARY_TOKENS:
+                lines.append(truncate_to_tokens(entry, budget - 1))
+            break
+        lines.append(entry)
+        budget -= cost
+    briefing = "\n".join(lines)
+    prefix_tokens = count_tokens(SYSTEM_PROMPT) + count_tokens(briefing)
+    if prefix_tokens < PROMPT_CACHE_MIN_TOKENS:
+        logger.info("Stable prompt prefix is %d tokens, below the %d-token cache minimum",
+                    prefix_tokens, PROMPT_CACHE_MIN_TOKENS)
+    return briefing
+
+
+def stable_prefix() -> list[SystemMessage]:
+    """The messages every synthesis prompt starts with: system prompt, then today's briefing."""
+    messages = [SystemMessage(content=SYSTEM_PROMPT)]
+    briefing = derived_artifact(DAILY_DIGEST_PATH, "briefing", _render_briefing)
+    if briefing:
+        messages.append(SystemMessage(content=briefing))
+    return messages
+
 
 def synthesize_and_respond(state: dict) -> dict:
     """Synthesize retrieved posts and produce the final response in one LLM call."""
@@ -23,13 +122,8 @@ def synthesize_and_respond(state: dict) -> dict:
     context_parts = []
     source_links = []
     for i, post in enumerate(retrieved, 1):
-        topics_str = ", ".join(post.get("topics", []))
         comments = post.get("num_comments", 0)
-        context_parts.append(
-            f"[{i}] (score: {post['score']}, comments: {comments}, topics: {topics_str})\n"
-            f"Title: {post['title']}\n"
-            f"Summary: {post['summary']}"
-        )
+        context_parts.append(format_story(i, post))  # same numbering pack_context budgeted
         if i <= 5:
             title_short = post["title"][:60]
             hn_url = post.get("hn_url", "")
@@ -38,31 +132,43 @@ def synthesize_and_respond(state: dict) -> dict:
     context = "\n\n".join(context_parts)
     sources_text = "\n".join(source_links)
 
-    llm = ChatOpenAI(model=OPENAI_MODEL, api_key=OPENAI_API_KEY, temperature=0.5)
+    temperature = 0.5
+    llm = get_chat_model(temperature)
 
-    messages = [
-        SystemMessage(content=(
-            "You are 'The Daily', a friendly and knowledgeable tech news assistant. "
-            "Given Hacker News stories and their summaries, provide a clear, conversational answer "
-            "to the user's question. Highlight key trends and insights. Use markdown formatting. "
-            "End with a brief 'Sources' section listing the relevant HN stories. "
-            "Use the conversation history to understand follow-up questions."
-        )),
-    ]
+    messages = stable_prefix()
+    messages.append(SystemMessage(content=(
+        f"--- Relevant stories from today ---\n{context}\n\n"
+        f"--- Sources ---\n{sources_text}"
+    )))
 
-    # Inject conversation history
-    for msg in chat_history:
-        if msg["role"] == "user":
+    # Inject conversation history (bounded: summary of older turns + recent turns)
+    for msg in trim_history(chat_history):
+        if msg["role"] == SUMMARY_ROLE:
+            messages.append(SystemMessage(content=f"Summary of the earlier conversation:\n{msg['content']}"))
+        elif msg["role"] == "user":
             messages.append(HumanMessage(content=msg["content"]))
         elif msg["role"] == "assistant":
             messages.append(AIMessage(content=msg["content"]))
 
-    messages.append(HumanMessage(content=(
-        f"{query}\n\n"
-        f"--- Relevant stories from today ---\n{context}\n\n"
-        f"--- Sources ---\n{sources_text}"
-    )))
+    messages.append(HumanMessage(content=query))
+
+    # Stream tokens so graph.stream(stream_mode="messages") can relay them as they arrive.
+    # Identical concurrent prompts share one upstream call; followers get the full text.
+    def generate() -> str:
+        parts = []
+        with span("llm.synthesis", model=OPENAI_MODEL) as attrs:
+            for chunk in llm.stream(messages):
+                parts.append(chunk.content)
+                if chunk.usage_metadata:
+                    usage = chunk.usage_metadata
+                    cached = (usage.get("input_token_details") or {}).get("cache_read") or 0
+                    attrs["input_tokens"] = usage.get("input_tokens")
+                    attrs["cached_input_tokens"] = cached
+                    attrs["uncached_input_tokens"] = (usage.get("input_tokens") or 0) - cached
+                    attrs["output_tokens"] = usage.get("output_tokens")
+        return "".join(parts)
 
-    response = llm.invoke(messages)
-    logger.info("Generated response (%d chars)", len(response.content))
-    return {**state, "response": response.content}
+    key = request_key("chat", OPENAI_MODEL, temperature, [(m.type, m.content) for m in messages])
+    response = coalesce(key, generate)
+    logger.info("Generated response (%d chars)", len(response))
+    return {**state, "response": response}
@@ -0,0 +1,46 @@
+"""Token counting — tiktoken for the chat model, with a character heuristic fallback."""
+
+import logging
+from functools import lru_cache
+
+from config.settings import OPENAI_MODEL
+
+logger = logging.getLogger(__name__)
+
+_CHARS_PER_TOKEN = 4  # rough English average when no tokenizer is available
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+
+        try:
+            return tiktoken.encoding_for_model(OPENAI_MODEL)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        # Missing package or BPE files that cannot be downloaded
+        logger.warning("tiktoken unavailable — estimating tokens from character counts", exc_info=True)
+        return None
+
+
+def count_tokens(text: str) -> int:
+    enc = _encoding()
+    if enc is None:
+        return -(-len(text) // _CHARS_PER_TOKEN)
+    return len(enc.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, suffix: str = "…") -> str:
+    """Cut text to at most max_tokens tokens, marking the cut with suffix."""
+    if max_tokens <= 0:
+        return ""
+    enc = _encoding()
+    if enc is None:
+        limit = max_tokens * _CHARS_PER_TOKEN
+        return text if len(text) <= limit else text[:limit].rstrip() + suffix
+    tokens = enc.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return enc.decode(tokens[:max_tokens]).rstrip() + suffix
@@ -0,0 +1,78 @@
+"""Background warm-up — load the agent's shared resources before the first query arrives."""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def _compile_graph():
+    from agents.graph import get_agent
+
+    get_agent()
+
+
+def _load_index():
+    from agents.retrieval import preload
+
+    preload()
+
+
+def _build_clients():
+    from agents.clients import get_chat_model, get_openai_client
+
+    get_openai_client()
+    get_chat_model(0.5)
+
+
+def _load_tokenizer():
+    from agents.tokens import count_tokens
+
+    count_tokens("warm-up")
+
+
+# (label, step) in the order a first query would need them
+WARMUP_STEPS = [
+    ("agent graph", _compile_graph),
+    ("search index", _load_index),
+    ("API clients", _build_clients),
+    ("tokenizer", _load_tokenizer),
+]
+
+_lock = threading.Lock()
+_thread: threading.Thread | None = None
+_status = {"state": "idle", "done": 0, "total": len(WARMUP_STEPS), "step": "", "failed": [], "seconds": 0.0}
+
+
+def _run():
+    start = time.perf_counter()
+    for label, step in WARMUP_STEPS:
+        _status["step"] = label
+        try:
+            step()
+        except Exception:
+            # Missing artifacts or keys: the first query reports it properly
+            logger.warning("Warm-up step '%s' failed", label, exc_info=True)
+            _status["failed"].append(label)
+        _status["done"] += 1
+    _status["seconds"] = round(time.perf_counter() - start, 2)
+    _status["state"] = "ready"
+    _status["step"] = ""
+    logger.info("Warm-up finished in %.2fs (failed: %s)", _status["seconds"], _status["failed"] or "none")
+
+
+def start_warmup() -> None:
+    """Start warming shared resources in a daemon thread; idempotent per process."""
+    global _thread
+    with _lock:
+        if _thread is not None:
+            return
+        _status["state"] = "running"
+        _thread = threading.Thread(target=_run, name="thedaily-warmup", daemon=True)
+        _thread.start()
+
+
+def warmup_status() -> dict:
+    """Snapshot of warm-up progress: state (idle/running/ready), done/total, current step."""
+    return {**_status, "failed": list(_status["failed"])}
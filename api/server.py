@@ -0,0 +1,298 @@
+"""Headless HTTP API — /search, /answer (streamed), /digest over the shared read-only artifacts.
+
+Pre-forks API_WORKERS processes that accept on one listening socket, so query
+throughput scales with cores. FAISS, embeddings and the neighbour graph are
+mmapped, which means every worker shares the same page-cache copy.
+
+    python -m api.server [--host 127.0.0.1] [--port 8600] [--workers N]
+"""
+
+import argparse
+import json
+import logging
+import os
+import signal
+import socket
+import sys
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from config.settings import (
+    API_HOST,
+    API_MAX_BODY_BYTES,
+    API_PORT,
+    API_SEARCH_MAX_K,
+    API_WORKERS,
+    DAILY_DIGEST_PATH,
+    FAISS_TOP_K,
+    ensure_dirs,
+    load_env,
+)
+
+logger = logging.getLogger("api")
+
+_HISTORY_ROLES = ("user", "assistant")
+_RESULT_FIELDS = ("doc_index", "title", "url", "hn_url", "score", "num_comments", "summary", "relevance_score")
+
+
+def search(query: str, k: int) -> dict:
+    """Hybrid BM25 + vector search, without the LLM."""
+    from agents.metrics import span, trace
+    from agents.retrieval import retrieve
+
+    with trace(), span("api.search", k=k):
+        posts = retrieve({"query": query, "top_k": k})["retrieved_posts"]
+    return {"query": query, "results": [{f: p.get(f) for f in _RESULT_FIELDS} for p in posts]}
+
+
+def answer_stream(query: str, chat_history: list[dict]):
+    """Agent answer as text chunks; histories are budgeted like the UI's."""
+    from agents.graph import query_agent_stream
+    from agents.history import prepare_history
+
+    if chat_history:
+        chat_history, _ = prepare_history(chat_history)
+    yield from query_agent_stream(query, chat_history=chat_history)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive + chunked streaming behind nginx
+    server_version = "thedaily-api"
+
+    def log_message(self, fmt, *args):
+        logger.debug("%s - %s", self.address_string(), fmt % args)
+
+    # ── Responses ──
+    def _send_json(self, status: int, body: dict) -> None:
+        payload = json.dumps(body, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_error(self, status: HTTPStatus, message: str) -> None:
+        self._send_json(status, {"error": message})
+
+    def _send_stream(self, chunks) -> None:
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.send_header("X-Accel-Buffering", "no")  # nginx: relay tokens as they arrive
+        self.end_headers()
+        try:
+            for chunk in chunks:
+                data = chunk.encode()
+                if data:
+                    self.wfile.write(b"%X\r\n%s\r\n" % (len(data), data))
+                    self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            logger.info("Client went away mid-answer")
+            self.close_connection = True
+        except Exception:
+            # Headers are already sent: end the body with a marker rather than a bare reset
+            logger.exception("Answer stream failed")
+            data = "\n\n[answer unavailable — internal error]".encode()
+            self.wfile.write(b"%X\r\n%s\r\n0\r\n\r\n" % (len(data), data))
+            self.close_connection = True
+        finally:
+            chunks.close()  # ends the agent span as cancelled if we stopped early
+
+    def _require_index(self) -> bool:
+        """Load the search artifacts, or answer 503 before any body is sent."""
+        from agents.retrieval import index_ready, preload
+
+        if not index_ready():
+            self._send_error(HTTPStatus.SERVICE_UNAVAILABLE, "index not built yet — run the pipeline")
+            return False
+        try:
+            preload()
+        except Exception:
+            logger.exception("Loading search artifacts failed")
+            self._send_error(HTTPStatus.SERVICE_UNAVAILABLE, "index unavailable")
+            return False
+        return True
+
+    def _read_json(self) -> dict | None:
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._send_error(HTTPStatus.BAD_REQUEST, "invalid Content-Length")
+            return None
+        if length > API_MAX_BODY_BYTES:
+            self._send_error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "request body too large")
+            return None
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:  # JSONDecodeError, and UnicodeDecodeError for bytes that aren't UTF-8/16/32
+            self._send_error(HTTPStatus.BAD_REQUEST, "body must be JSON")
+            return None
+        if not isinstance(body, dict):
+            self._send_error(HTTPStatus.BAD_REQUEST, "body must be a JSON object")
+            return None
+        return body
+
+    # ── Routes ──
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        try:
+            if url.path == "/search":
+                query = params.get("q", [""])[0].strip()
+                if not query:
+                    return self._send_error(HTTPStatus.BAD_REQUEST, "missing q")
+                try:
+                    k = int(params.get("k", [FAISS_TOP_K])[0])
+                except ValueError:
+                    return self._send_error(HTTPStatus.BAD_REQUEST, "k must be an integer")
+                if not self._require_index():
+                    return
+                return self._send_json(HTTPStatus.OK, search(query, max(1, min(k, API_SEARCH_MAX_K))))
+            if url.path == "/digest":
+                from agents.artifacts import load_artifact
+
+                digest = load_artifact(DAILY_DIGEST_PATH)
+                if digest is None:
+                    return self._send_error(HTTPStatus.NOT_FOUND, "no digest published yet")
+                return self._send_json(HTTPStatus.OK, digest)
+            if url.path == "/healthz":
+                from agents.artifacts import current_generation
+                from agents.retrieval import worker_memory_report
+                from agents.warmup import warmup_status
+
+                return self._send_json(HTTPStatus.OK, {
+                    "pid": os.getpid(), "generation": current_generation(), "warmup": warmup_status(),
+                    "memory": worker_memory_report(),
+                })
+            if url.path == "/metrics":
+                from agents.metrics import render_prometheus
+
+                payload = render_prometheus().encode()
+                self.send_response(HTTPStatus.OK)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                return
+            self._send_error(HTTPStatus.NOT_FOUND, "not found")
+        except FileNotFoundError:
+            self._send_error(HTTPStatus.SERVICE_UNAVAILABLE, "index not built yet — run the pipeline")
+        except Exception:
+            logger.exception("GET %s failed", url.path)
+            self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, "internal error")
+
+    def do_POST(self):
+        if urlparse(self.path).path != "/answer":
+            return self._send_error(HTTPStatus.NOT_FOUND, "not found")
+        body = self._read_json()
+        if body is None:
+            return
+        query = str(body.get("query", "")).strip()
+        history = body.get("chat_history") or []
+        if not query:
+            return self._send_error(HTTPStatus.BAD_REQUEST, "missing query")
+        if not isinstance(history, list) or not all(
+            isinstance(m, dict) and m.get("role") in _HISTORY_ROLES and isinstance(m.get("content"), str)
+            for m in history
+        ):
+            return self._send_error(
+                HTTPStatus.BAD_REQUEST, "chat_history must be a list of {role: user|assistant, content: str}",
+            )
+        if not self._require_index():
+            return  # fail before the 200 and the stream start, not mid-answer
+
+        chunks = answer_stream(query, history)
+        if body.get("stream", True):
+            return self._send_stream(chunks)
+        try:
+            text = "".join(chunks)
+        except Exception:
+            logger.exception("Answer failed for query: %s", query[:80])
+            return self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, "internal error")
+        self._send_json(HTTPStatus.OK, {"query": query, "answer": text})
+
+
+def _serve(sock: socket.socket) -> None:
+    """Worker loop: accept on the inherited socket until SIGTERM."""
+    from agents.warmup import start_warmup
+
+    start_warmup()  # per worker, after fork: clients and threads must not cross fork()
+    server = ThreadingHTTPServer(sock.getsockname()[:2], Handler, bind_and_activate=False)
+    server.socket.close()
+    server.socket = sock
+    server.daemon_threads = True
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    logger.info("API worker %d serving", os.getpid())
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+def _spawn(sock: socket.socket) -> int:
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            _serve(sock)
+        except SystemExit as e:
+            code = e.code or 0
+        except BaseException:
+            logger.exception("API worker crashed")
+            code = 1
+        os._exit(code)
+    return pid
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="The Daily headless HTTP API")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    parser.add_argument("--workers", type=int, default=API_WORKERS, help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    ensure_dirs()
+    load_env()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+
+    sock = socket.create_server((args.host, args.port), backlog=1024)
+    sock.set_inheritable(True)
+    logger.info("API listening on %s:%d with %d worker(s)", args.host, args.port, args.workers)
+    if args.workers <= 1:
+        _serve(sock)
+        return
+
+    workers = {_spawn(sock) for _ in range(args.workers)}
+    stopping = False
+
+    def _stop(*_):
+        nonlocal stopping
+        stopping = True
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+    while workers:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        workers.discard(pid)
+        if not stopping:
+            # Keep the pool at full strength if a worker dies
+            logger.warning("API worker %d exited (status %d) — restarting", pid, status)
+            workers.add(_spawn(sock))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,5 @@
 """Streamlit entry point — The Daily: Tech Radar."""
 
-import json
 from datetime import datetime, timezone
 
 import streamlit as st
@@ -163,17 +162,22 @@ header[data-testid="stHeader"] {
 </style>
 """, unsafe_allow_html=True)
 
+# ── Background warm-up (once per process, shared by all sessions) ─────
+from agents.warmup import start_warmup, warmup_status
+
+start_warmup()
+
 # ── Load story count for masthead ─────────────────────────────────────
+from agents.artifacts import load_artifact
 from config.settings import DAILY_DIGEST_PATH
 
-stories_analyzed = ""
-if DAILY_DIGEST_PATH.exists():
-    try:
-        with open(DAILY_DIGEST_PATH) as f:
-            digest = json.load(f)
-        stories_analyzed = f"{digest.get('total_posts', 0)} stories analyzed"
-    except (json.JSONDecodeError, OSError):
-        pass
+digest = load_artifact(DAILY_DIGEST_PATH)  # process-wide, re-read only when the pipeline republishes
+stories_analyzed = f"{digest.get('total_posts', 0)} stories analyzed" if digest else ""
+
+warmup = warmup_status()
+if warmup["state"] != "ready":
+    progress = f"Warming up&ensp;{warmup['done']}/{warmup['total']}"
+    stories_analyzed = f"{stories_analyzed}&ensp;&middot;&ensp;{progress}" if stories_analyzed else progress
 
 # ── Masthead ──────────────────────────────────────────────────────────
 today = datetime.now(timezone.utc).strftime("%A, %B %d, %Y")
@@ -1,19 +1,21 @@
 import os
 from pathlib import Path
 
-from dotenv import load_dotenv
-
-load_dotenv()
-
 # ── Paths ──────────────────────────────────────────────────────────────
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 DATA_DIR = PROJECT_ROOT / "data"
 RAW_DIR = DATA_DIR / "raw"
 PROCESSED_DIR = DATA_DIR / "processed"
 LOG_DIR = PROJECT_ROOT / "logs"
+CACHE_DIR = DATA_DIR / "cache"
+CHECKPOINT_DIR = DATA_DIR / "checkpoints"  # one <stage>.pkl per pipeline stage, overwritten each run
+
+
+def ensure_dirs() -> None:
+    """Create the data/log directories; writers call this, importing never does."""
+    for d in (RAW_DIR, PROCESSED_DIR, LOG_DIR, CACHE_DIR, HISTORY_DIR, CHECKPOINT_DIR):
+        d.mkdir(parents=True, exist_ok=True)
 
-for d in (RAW_DIR, PROCESSED_DIR, LOG_DIR):
-    d.mkdir(parents=True, exist_ok=True)
 
 # ── Hacker News (Algolia API) ─────────────────────────────────────────
 HN_ALGOLIA_BASE = "https://hn.algolia.com/api/v1"
@@ -33,8 +35,12 @@ HN_TOPIC_QUERIES = [
 ]
 
 # ── OpenAI ─────────────────────────────────────────────────────────────
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
+# OPENAI_API_KEY is resolved lazily via __getattr__ below, so importing settings
+# never reads .env on the UI's first-paint path
 OPENAI_MODEL = "gpt-4o-mini"
+OPENAI_MAX_CONNECTIONS = 20   # keep-alive pool shared by every client in the process
+OPENAI_MAX_CONCURRENCY = 8    # process-wide cap on in-flight upstream requests
+OPENAI_TIMEOUT_S = 60
 
 # ── Embeddings (OpenAI) ────────────────────────────────────────────────
 EMBEDDING_MODEL = "text-embedding-3-small"
@@ -42,13 +48,75 @@ EMBEDDING_DIM = 1536
 
 # ── FAISS ──────────────────────────────────────────────────────────────
 FAISS_INDEX_PATH = PROCESSED_DIR / "faiss.index"
-FAISS_TOP_K = 8
+FAISS_TOP_K = 8  # stories packed into the prompt
+FAISS_USE_MMAP = True  # share index + embedding pages across serving processes
+
+# ── Context packing (MMR rerank + token budget) ───────────────────────
+CONTEXT_CANDIDATES = 16          # retrieved candidates handed to the packer
+CONTEXT_TOKEN_BUDGET = 1800      # tokens of story context per prompt
+CONTEXT_MIN_SUMMARY_TOKENS = 30  # below this a story is dropped rather than truncated
+MMR_LAMBDA = 0.7                 # relevance vs. diversity trade-off
+
+# Stable prompt prefix (system prompt + day's briefing), shared by every request
+PROMPT_CACHE_MIN_TOKENS = 1024   # OpenAI only caches prompt prefixes at least this long
+BRIEFING_TOKEN_BUDGET = 1400     # fixed cap on the stable prefix, outside CONTEXT_TOKEN_BUDGET
+
+# Related-stories kNN graph (precomputed at pipeline time)
+NEIGHBORS_K = 10
+NEIGHBOR_IDS_PATH = PROCESSED_DIR / "neighbors_ids.npy"        # int32 [n, k]
+NEIGHBOR_SCORES_PATH = PROCESSED_DIR / "neighbors_scores.npy"  # float16 [n, k]
+
+# ── Lexical (BM25) retrieval ──────────────────────────────────────────
+BM25_INDEX_PATH = PROCESSED_DIR / "bm25.npz"
+BM25_K1 = 1.2
+BM25_B = 0.75
+RRF_K = 60                       # reciprocal rank fusion damping constant
+LEXICAL_FAST_PATH_MAX_TERMS = 3  # keyword-like queries up to this length skip embedding
+
+# ── Follow-up retrieval reuse ─────────────────────────────────────────
+FOLLOWUP_REUSE_COVERAGE = 0.6  # share of follow-up terms found in the previous stories to reuse them
+FOLLOWUP_QUERY_WEIGHT = 0.7    # follow-up vs. previous query weight in the blended embedding
+
+# ── Query-embedding cache ─────────────────────────────────────────────
+QUERY_EMBEDDING_CACHE_PATH = CACHE_DIR / "query_embeddings.sqlite"
+QUERY_EMBEDDING_CACHE_SIZE = 2048          # in-process LRU entries
+QUERY_EMBEDDING_CACHE_TTL_S = 7 * 86400    # embeddings are model-stable; a week is plenty
+
+# ── Semantic response cache (first-turn answers, per index generation) ─
+RESPONSE_CACHE_SIZE = 512
+RESPONSE_CACHE_SIMILARITY = 0.95  # cosine threshold for reusing a cached answer
+
+# ── Chat history budget ───────────────────────────────────────────────
+HISTORY_RECENT_TURNS = 3           # user/assistant pairs kept verbatim
+HISTORY_TOKEN_BUDGET = 1500        # cap on verbatim history tokens per prompt
+HISTORY_SUMMARY_MAX_TOKENS = 250   # running summary of older turns
+
+# ── Chat jobs (background execution) ──────────────────────────────────
+CHAT_JOB_WORKERS = 8           # agent runs executing at once, shared by every session
+CHAT_JOB_MAX_PENDING = 32      # running + queued jobs before new questions are turned away
+CHAT_JOB_TTL_S = 600           # finished jobs are forgotten after this many seconds
+CHAT_POLL_INTERVAL_S = 0.5     # UI refresh interval while an answer is in flight
+
+# ── HTTP API (headless search / answer / digest) ──────────────────────
+API_HOST = "127.0.0.1"         # nginx proxies /api/ here
+API_PORT = 8600
+API_WORKERS = os.cpu_count() or 1  # pre-forked processes sharing the listening socket
+API_MAX_BODY_BYTES = 64 * 1024
+API_SEARCH_MAX_K = 50  # /search?k= cap; retrieval fetches exactly k candidates
+
+# ── Tracing / metrics ─────────────────────────────────────────────────
+METRICS_PATH = LOG_DIR / "agent_metrics.{pid}.json"  # one file per serving process
+METRICS_DUMP_INTERVAL_S = 30   # min seconds between metrics file dumps
+METRICS_MAX_SAMPLES = 2048     # latency samples kept per histogram for percentiles
 
 # ── Pipeline outputs ──────────────────────────────────────────────────
 SUMMARIES_PATH = PROCESSED_DIR / "summaries.json"
 CHARTS_DATA_PATH = PROCESSED_DIR / "charts_data.json"
 DAILY_DIGEST_PATH = PROCESSED_DIR / "daily_digest.json"
 EMBEDDINGS_PATH = PROCESSED_DIR / "embeddings.npy"
+GENERATION_PATH = PROCESSED_DIR / "generation.json"  # written last; marks a published index
+SUGGESTED_ANSWERS_PATH = PROCESSED_DIR / "suggested_answers.json"
+PIPELINE_MAX_PARALLEL_STAGES = 3  # independent stages (e.g. charts and digest) run side by side
 
 # ── Topic classification keywords ─────────────────────────────────────
 TOPIC_KEYWORDS = {
@@ -63,4 +131,56 @@ TOPIC_KEYWORDS = {
     "Startups": ["startup", "funding", "yc", "seed", "series a", "acquisition", "ipo", "valuation"],
 }
 
-BREAKTHROUGH_SCORE_THRESHOLD = 300  # HN stories above this score flagged as breakthroughs
+BREAKTHROUGH_SCORE_THRESHOLD = 300  # cold start: fixed score bar until enough history exists
+
+# ── Daily history (trend baselines) ───────────────────────────────────
+HISTORY_DIR = DATA_DIR / "history"
+DAILY_HISTORY_FILE = "daily_{day}.npz"    # one per run day in HISTORY_DIR, append-only
+THEMES_HISTORY_FILE = "themes_{day}.npz"  # the day's theme centroids, for tomorrow's comparison
+HISTORY_WINDOW_DAYS = 28       # rolling baseline length
+HISTORY_MIN_DAYS = 3           # baseline days needed before z-scores replace fixed thresholds
+TRENDING_MIN_STD = 1.0         # floor on a topic's baseline std so rare topics don't explode
+BREAKTHROUGH_VELOCITY_Z = 2.5  # story log-velocity z-score that counts as a breakthrough
+VELOCITY_MIN_HOURS = 1.0       # age floor for points-per-hour so brand-new posts aren't infinite
+
+# ── Theme discovery (embedding clusters) ──────────────────────────────
+CLUSTER_MAX_K = 12                # k = min(this, sqrt(n / 2))
+CLUSTER_MIN_SIZE = 3              # smaller clusters are treated as noise
+CLUSTER_ITERATIONS = 25           # Lloyd iterations cap (stops early on convergence)
+CLUSTER_MERGE_SIMILARITY = 0.9    # same-day centroids this close are one theme
+CLUSTER_MATCH_SIMILARITY = 0.8    # centroid cosine for "same theme as last run"
+CLUSTER_GROWTH_RATIO = 1.5        # share increase that marks a matched theme as growing
+CLUSTER_LOOKBACK_DAYS = 7         # how far back to look for the previous run's themes
+
+# ── Static edition (served by nginx, no Streamlit session) ────────────
+EDITION_DIR = PROJECT_ROOT / "docs" / "edition"  # index.html + one archived page per day
+EDITION_CHAT_URL = "/chat/"                       # Streamlit, reserved for chat
+
+# Canonical questions answered offline after the digest and offered as one-click suggestions
+SUGGESTED_QUESTIONS = [
+    "What are the biggest AI developments today?",
+    "What's new in programming languages and developer tools?",
+    "Any notable security news today?",
+    "What are people saying about startups and funding?",
+]
+
+
+# ── Environment (.env) ────────────────────────────────────────────────
+_env_loaded = False
+
+
+def load_env() -> None:
+    """Load .env into os.environ once (existing variables win)."""
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        _env_loaded = True
+
+
+def __getattr__(name: str):
+    if name == "OPENAI_API_KEY":
+        load_env()
+        return os.getenv("OPENAI_API_KEY", "")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -33,6 +33,7 @@ python3.11 -m venv "$APP_DIR/.venv"
 sudo install -m 0640 -o root -g root "$APP_DIR/deploy/ec2/thedaily.env.example" "$ENV_FILE"
 
 sudo install -m 0644 "$APP_DIR/deploy/ec2/thedaily-streamlit.service" /etc/systemd/system/thedaily-streamlit.service
+sudo install -m 0644 "$APP_DIR/deploy/ec2/thedaily-api.service" /etc/systemd/system/thedaily-api.service
 sudo install -m 0644 "$APP_DIR/deploy/ec2/thedaily-pipeline.service" /etc/systemd/system/thedaily-pipeline.service
 sudo install -m 0644 "$APP_DIR/deploy/ec2/thedaily-pipeline.timer" /etc/systemd/system/thedaily-pipeline.timer
 sudo install -m 0644 "$APP_DIR/deploy/ec2/nginx-thedaily.conf" /etc/nginx/sites-available/thedaily
@@ -42,6 +43,7 @@ sudo rm -f /etc/nginx/sites-enabled/default
 
 sudo systemctl daemon-reload
 sudo systemctl enable --now thedaily-streamlit.service
+sudo systemctl enable --now thedaily-api.service
 sudo systemctl enable --now thedaily-pipeline.timer
 sudo systemctl restart nginx
 
@@ -49,6 +51,6 @@ cat <<MSG
 Bootstrap complete.
 Next steps:
 1. Edit $ENV_FILE with your API keys.
-2. Run: sudo systemctl restart thedaily-streamlit.service
+2. Run: sudo systemctl restart thedaily-streamlit.service thedaily-api.service
 3. Run once now: sudo systemctl start thedaily-pipeline.service
 MSG
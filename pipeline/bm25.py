@@ -0,0 +1,103 @@
+"""BM25 inverted index — compact CSR postings for lexical retrieval."""
+
+import re
+from collections import Counter
+
+import numpy as np
+
+from config.settings import BM25_B, BM25_K1
+
+# Keeps version numbers, CVE ids and names like "c++" / "c#" / "node.js" intact
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[._+#-][a-z0-9]+)*[+#]*")
+_SPLIT_RE = re.compile(r"[._+#-]+")
+
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have how i in is it its of on or "
+    "that the this to was were what when where which who why will with you your "
+    "about any anything me new news show tell today today's".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens minus stopwords; compound tokens also emit their parts."""
+    tokens = []
+    for tok in _TOKEN_RE.findall(text.lower()):
+        if tok in STOPWORDS:
+            continue
+        tokens.append(tok)
+        parts = [p for p in _SPLIT_RE.split(tok) if p]
+        if len(parts) > 1:
+            tokens.extend(p for p in parts if p not in STOPWORDS)
+    return tokens
+
+
+def build_bm25_index(documents: list[str]) -> dict[str, np.ndarray]:
+    """Build precomputed BM25 postings for np.savez.
+
+    Postings are sorted by term; ``indptr[t]:indptr[t + 1]`` slices ``doc_ids`` and
+    ``weights`` for term ``t`` (the row of ``terms``). Weights are the full BM25
+    term contribution, so query scoring is a pure gather-and-add.
+    """
+    vocab: dict[str, int] = {}
+    term_ids: list[int] = []
+    doc_ids: list[int] = []
+    tfs: list[int] = []
+    doc_len = np.zeros(len(documents), dtype=np.float32)
+
+    for d, text in enumerate(documents):
+        counts = Counter(tokenize(text))
+        doc_len[d] = sum(counts.values())
+        for term, tf in counts.items():
+            term_ids.append(vocab.setdefault(term, len(vocab)))
+            doc_ids.append(d)
+            tfs.append(tf)
+
+    t = np.asarray(term_ids, dtype=np.int64)
+    d = np.asarray(doc_ids, dtype=np.int64)
+    tf = np.asarray(tfs, dtype=np.float32)
+
+    n = len(documents)
+    avgdl = float(doc_len.mean()) if n and doc_len.mean() > 0 else 1.0
+    df = np.bincount(t, minlength=len(vocab))
+    idf = np.log1p((n - df + 0.5) / (df + 0.5)).astype(np.float32)
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_len[d] / avgdl)
+    weights = idf[t] * tf * (BM25_K1 + 1) / (tf + norm)
+
+    order = np.lexsort((d, t))
+    indptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum(df)
+
+    return {
+        "terms": np.array(list(vocab), dtype=str),
+        "indptr": indptr,
+        "doc_ids": d[order].astype(np.int32),
+        "weights": weights[order].astype(np.float32),
+        "num_docs": np.array(n, dtype=np.int64),
+    }
+
+
+def load_bm25_index(path) -> dict:
+    """Load postings written by build_bm25_index and rebuild the term lookup."""
+    with np.load(str(path)) as data:
+        index = {key: data[key] for key in data.files}
+    index["vocab"] = {term: row for row, term in enumerate(index.pop("terms").tolist())}
+    index["num_docs"] = int(index["num_docs"])
+    return index
+
+
+def bm25_search(index: dict, query: str, top_k: int) -> list[tuple[int, float]]:
+    """Return up to top_k (doc_index, bm25_score) pairs, best first."""
+    scores = np.zeros(index["num_docs"], dtype=np.float32)
+    indptr, doc_ids, weights = index["indptr"], index["doc_ids"], index["weights"]
+    for term in set(tokenize(query)):
+        row = index["vocab"].get(term)
+        if row is None:
+            continue
+        lo, hi = indptr[row], indptr[row + 1]
+        scores[doc_ids[lo:hi]] += weights[lo:hi]  # doc ids are unique within a posting list
+
+    hits = np.flatnonzero(scores)
+    if not hits.size:
+        return []
+    top = hits[np.argsort(-scores[hits], kind="stable")[:top_k]]
+    return [(int(i), float(scores[i])) for i in top]
@@ -0,0 +1,205 @@
+"""Theme discovery — spherical k-means over the day's embeddings, matched against yesterday's themes."""
+
+import logging
+import os
+from collections import Counter
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+
+from config.settings import (
+    CLUSTER_GROWTH_RATIO,
+    CLUSTER_ITERATIONS,
+    CLUSTER_LOOKBACK_DAYS,
+    CLUSTER_MATCH_SIMILARITY,
+    CLUSTER_MAX_K,
+    CLUSTER_MERGE_SIMILARITY,
+    CLUSTER_MIN_SIZE,
+    HISTORY_DIR,
+    THEMES_HISTORY_FILE,
+)
+from pipeline.bm25 import tokenize
+
+logger = logging.getLogger(__name__)
+
+_LABEL_STOPWORDS = frozenset("hn ask launch via using use just now like one get".split())
+
+
+def _unit_rows(x: np.ndarray) -> np.ndarray:
+    return x / np.maximum(np.linalg.norm(x, axis=1, keepdims=True), 1e-12)
+
+
+def _one_hot(assign: np.ndarray, k: int) -> np.ndarray:
+    m = np.zeros((len(assign), k), dtype=np.float32)
+    m[np.arange(len(assign)), assign] = 1.0
+    return m
+
+
+def kmeans(
+    x: np.ndarray, k: int, iterations: int = CLUSTER_ITERATIONS, seed: int = 0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Spherical k-means on unit rows: k-means++ seeding, then Lloyd steps on cosine similarity.
+
+    Returns (assignments (n,), unit centroids (k, d)). Every step is one
+    (n × k) matrix product, so thousands of 1536-d stories take milliseconds.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(x)
+    centroids = np.empty((k, x.shape[1]), dtype=x.dtype)
+    centroids[0] = x[rng.integers(n)]
+    dist = 1.0 - x @ centroids[0]
+    for j in range(1, k):
+        # k-means++: sample proportionally to squared distance from the nearest seed
+        weights = np.maximum(dist, 0) ** 2
+        pick = rng.choice(n, p=weights / weights.sum()) if weights.sum() > 0 else rng.integers(n)
+        centroids[j] = x[pick]
+        dist = np.minimum(dist, 1.0 - x @ centroids[j])
+
+    assign = np.full(n, -1)
+    for _ in range(iterations):
+        new_assign = np.argmax(x @ centroids.T, axis=1)
+        if np.array_equal(new_assign, assign):
+            break
+        assign = new_assign
+        sums = _one_hot(assign, k).T @ x  # (k × n) @ (n × d): per-cluster sums in one BLAS call
+        empty = ~sums.any(axis=1)
+        if empty.any():
+            # Re-seed empty clusters with the stories worst served by their centroid
+            worst = np.argsort((x * centroids[assign]).sum(axis=1))[: int(empty.sum())]
+            sums[empty] = x[worst]
+        centroids = _unit_rows(sums)
+    return assign, centroids
+
+
+def merge_close(
+    x: np.ndarray, assign: np.ndarray, centroids: np.ndarray, threshold: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Merge clusters whose centroids are within ``threshold`` cosine (k-means over-splits dense themes)."""
+    k = len(centroids)
+    parent = np.arange(k)
+
+    def root(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    close = np.triu(centroids @ centroids.T >= threshold, 1)
+    for i, j in zip(*np.nonzero(close)):
+        parent[root(j)] = root(i)
+    roots = np.array([root(i) for i in range(k)])
+    _, relabel = np.unique(roots, return_inverse=True)
+    if relabel.max() + 1 == k:
+        return assign, centroids
+    assign = relabel[assign]
+    return assign, _unit_rows(_one_hot(assign, int(relabel.max()) + 1).T @ x)
+
+
+def _label(titles: list[str], background: Counter, total_docs: int, n_terms: int = 3) -> str:
+    """Top distinctive title terms: in-cluster document frequency weighted by rarity overall."""
+    df = Counter(
+        t for title in titles for t in set(tokenize(title)) if t not in _LABEL_STOPWORDS and not t.isdigit()
+    )
+    scored = sorted(
+        df.items(), key=lambda kv: (-kv[1] * np.log(1 + total_docs / background[kv[0]]), kv[0]),
+    )
+    return " / ".join(term for term, _ in scored[:n_terms]) or "misc"
+
+
+def _previous_themes(day: str, history_dir: Path) -> tuple[str, dict] | None:
+    end = date.fromisoformat(day)
+    for offset in range(1, CLUSTER_LOOKBACK_DAYS + 1):
+        prev_day = (end - timedelta(days=offset)).isoformat()
+        path = history_dir / THEMES_HISTORY_FILE.format(day=prev_day)
+        if path.exists():
+            with np.load(path) as f:
+                return prev_day, {name: f[name] for name in f.files}
+    return None
+
+
+def _save_themes(day: str, centroids: np.ndarray, labels: list[str], sizes: np.ndarray, history_dir: Path) -> None:
+    history_dir.mkdir(parents=True, exist_ok=True)
+    path = history_dir / THEMES_HISTORY_FILE.format(day=day)
+    tmp = path.with_name(f".{path.stem}.tmp.npz")
+    np.savez(tmp, centroids=centroids.astype(np.float32), labels=np.array(labels, dtype=str), sizes=sizes)
+    os.replace(tmp, path)
+
+
+def discover_themes(posts: list[dict], embeddings: np.ndarray, day: str, history_dir: Path = HISTORY_DIR) -> dict:
+    """Cluster today's stories, label each cluster, and flag emerging/fading themes vs. the previous run.
+
+    A theme is *emerging* when no previous centroid is within
+    CLUSTER_MATCH_SIMILARITY, *growing* when its share of stories rose by
+    CLUSTER_GROWTH_RATIO, otherwise *steady*; previous themes that no longer
+    match anything are *fading*. On the first run every theme is *steady*.
+    Today's centroids are saved for tomorrow.
+    """
+    n = len(posts)
+    if n < 2 * CLUSTER_MIN_SIZE:
+        return {"clusters": [], "fading": []}
+
+    x = _unit_rows(np.asarray(embeddings, dtype=np.float32))
+    k = int(min(CLUSTER_MAX_K, max(2, round(np.sqrt(n / 2)))))
+    assign, centroids = merge_close(x, *kmeans(x, k), CLUSTER_MERGE_SIMILARITY)
+    k = len(centroids)
+    sizes = np.bincount(assign, minlength=k)
+
+    titles = [p.get("title", "") for p in posts]
+    background = Counter(t for title in titles for t in set(tokenize(title)))
+    sims = x @ centroids.T
+
+    clusters = []
+    for c in np.argsort(-sizes, kind="stable"):
+        members = np.flatnonzero(assign == c)
+        if len(members) < CLUSTER_MIN_SIZE:
+            continue
+        representative = members[np.argsort(-sims[members, c])[:3]]
+        clusters.append({
+            "id": int(c),
+            "label": _label([titles[i] for i in members], background, n),
+            "size": int(len(members)),
+            "share": round(len(members) / n, 3),
+            "examples": [{"title": titles[i], "hn_url": posts[i].get("hn_url", "")} for i in representative],
+        })
+
+    fading = []
+    previous = _previous_themes(day, history_dir)
+    if previous is not None and previous[1]["centroids"].shape[1] == centroids.shape[1]:
+        prev_day, prev = previous
+        # Noise centroids were saved unlabeled: never a match, never fading
+        labeled = prev["labels"] != ""
+        match = np.where(labeled, centroids @ prev["centroids"].T, -1.0)  # (today k × previous k) cosine
+        prev_share = prev["sizes"] / max(int(prev["sizes"].sum()), 1)
+        for cluster in clusters:
+            j = int(np.argmax(match[cluster["id"]]))
+            similarity = float(match[cluster["id"], j])
+            if similarity < CLUSTER_MATCH_SIMILARITY:
+                cluster["status"] = "emerging"
+            else:
+                cluster["previous_label"] = str(prev["labels"][j])
+                grew = cluster["share"] >= CLUSTER_GROWTH_RATIO * prev_share[j]
+                cluster["status"] = "growing" if grew else "steady"
+            cluster["similarity"] = round(similarity, 3)
+        # Only reported themes keep a previous one alive; today's noise centroids don't
+        reported = [cluster["id"] for cluster in clusters]
+        matched = (match[reported] >= CLUSTER_MATCH_SIMILARITY).any(axis=0)
+        fading = [
+            {"label": str(prev["labels"][j]), "size": int(prev["sizes"][j]), "since": prev_day}
+            for j in np.flatnonzero(labeled & ~matched)
+            if prev["sizes"][j] >= CLUSTER_MIN_SIZE
+        ]
+    else:
+        for cluster in clusters:
+            cluster["status"] = "steady"  # first run: no change to report yet
+
+    labels = [""] * k
+    for cluster in clusters:
+        labels[cluster["id"]] = cluster["label"]
+    _save_themes(day, centroids, labels, sizes, history_dir)
+
+    logger.info(
+        "Discovered %d themes (%d emerging, %d fading) from %d stories",
+        len(clusters), sum(c["status"] == "emerging" for c in clusters), len(fading), n,
+    )
+    return {"clusters": clusters, "fading": fading}
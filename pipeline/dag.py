@@ -0,0 +1,204 @@
+"""Stage DAG — run pipeline stages in dependency order, side by side where independent, with checkpoints.
+
+Every finished stage pickles its output to ``CHECKPOINT_DIR/<stage>.pkl``
+behind a small header holding two hashes: the *key* (stage name plus the
+content hashes of its inputs) and the *digest* (hash of the output itself).
+On ``resume``, a stage whose stored key matches its current inputs, and
+whose declared files are still on disk, is skipped without even loading its
+value; downstream keys chain off digests, so an unchanged rerun of an early
+stage does not invalidate anything after it.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from config.settings import CHECKPOINT_DIR, PIPELINE_MAX_PARALLEL_STAGES
+
+logger = logging.getLogger(__name__)
+
+
+class Stage(NamedTuple):
+    name: str
+    run: Callable[..., Any]       # called with the values of ``inputs``, in order
+    inputs: tuple[str, ...] = ()  # upstream stage names or run parameters
+    files: tuple[Path, ...] = ()  # on-disk products; a checkpoint is stale if any is missing
+    after: tuple[str, ...] = ()   # like inputs (ordering and key) but not passed to ``run``
+
+    @property
+    def depends_on(self) -> tuple[str, ...]:
+        return self.inputs + self.after
+
+
+class PipelineAborted(Exception):
+    """Raised by a stage when there is nothing for the rest of the pipeline to do."""
+
+
+def _hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _stage_key(stage: Stage, digests: dict[str, str]) -> str:
+    return _hash("\0".join([stage.name, *(f"{name}={digests[name]}" for name in stage.depends_on)]).encode())
+
+
+def _checkpoint_path(name: str, checkpoint_dir: Path) -> Path:
+    return checkpoint_dir / f"{name}.pkl"
+
+
+def read_checkpoint_header(name: str, checkpoint_dir: Path = CHECKPOINT_DIR) -> dict | None:
+    """{"key", "digest", "saved_at"} for a stage's checkpoint, or None; the value itself is not read."""
+    path = _checkpoint_path(name, checkpoint_dir)
+    if not path.exists():
+        return None
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def load_checkpoint(name: str, checkpoint_dir: Path = CHECKPOINT_DIR) -> Any:
+    """The stored output of a stage (header skipped)."""
+    with open(_checkpoint_path(name, checkpoint_dir), "rb") as f:
+        pickle.load(f)
+        return pickle.load(f)
+
+
+def _save_checkpoint(name: str, key: str, value: Any, checkpoint_dir: Path) -> str:
+    data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    digest = _hash(data)
+    checkpoint_dir.mkdir(parents=True, exist_ok=True)
+    path = _checkpoint_path(name, checkpoint_dir)
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, "wb") as f:
+        pickle.dump({"key": key, "digest": digest, "saved_at": time.time()}, f)
+        f.write(data)
+    os.replace(tmp, path)  # a crash mid-write leaves the previous checkpoint intact
+    return digest
+
+
+def descendants(stages: list[Stage], roots: Iterable[str]) -> set[str]:
+    """``roots`` plus every stage that depends on them, directly or transitively."""
+    selected = set(roots)
+    for stage in stages:  # stages are listed in dependency order
+        if selected.intersection(stage.depends_on):
+            selected.add(stage.name)
+    return selected
+
+
+def run_stages(
+    stages: list[Stage],
+    params: dict[str, Any],
+    *,
+    resume: bool = False,
+    from_stage: str | None = None,
+    only: Iterable[str] | None = None,
+    checkpoint_dir: Path = CHECKPOINT_DIR,
+    max_parallel: int = PIPELINE_MAX_PARALLEL_STAGES,
+) -> bool:
+    """Run the DAG; returns False if a stage aborted it.
+
+    ``from_stage`` runs that stage and everything downstream, ``only`` runs
+    just the named stages; in both cases the remaining inputs come from
+    existing checkpoints. With ``resume``, selected stages whose inputs are
+    unchanged are skipped (stages named by ``from_stage``/``only`` always run).
+    """
+    names = [s.name for s in stages]
+    by_name = {s.name: s for s in stages}
+    for i, stage in enumerate(stages):
+        unknown = [d for d in stage.depends_on if d not in params and d not in names[:i]]
+        if unknown:
+            raise ValueError(f"Stage {stage.name!r} depends on unknown or later stage(s) {unknown}")
+    forced = set(only or ()) | ({from_stage} if from_stage else set())
+    missing = forced - set(names)
+    if missing:
+        raise ValueError(f"Unknown stage(s) {sorted(missing)}; stages are {names}")
+
+    if only:
+        selected = set(only)
+    elif from_stage:
+        selected = descendants(stages, [from_stage])
+    else:
+        selected = set(names)
+
+    digests = {name: _hash(repr(value).encode()) for name, value in params.items()}
+    values: dict[str, Any] = dict(params)
+    load_lock = threading.Lock()
+
+    def value_of(name: str) -> Any:
+        with load_lock:  # concurrent stages may share an input; load it once
+            if name not in values:
+                values[name] = load_checkpoint(name, checkpoint_dir)
+            return values[name]
+
+    # Stages outside the selection contribute their last checkpoint
+    for name in names:
+        if name not in selected:
+            header = read_checkpoint_header(name, checkpoint_dir)
+            if header is None and any(name in by_name[s].depends_on for s in selected):
+                raise RuntimeError(f"No checkpoint for stage {name!r}; run it before selecting {sorted(selected)}")
+            if header is not None:
+                digests[name] = header["digest"]
+
+    def execute(stage: Stage, key: str) -> str:
+        start = time.perf_counter()
+        value = stage.run(*(value_of(d) for d in stage.inputs))
+        with load_lock:
+            values[stage.name] = value
+        digest = _save_checkpoint(stage.name, key, value, checkpoint_dir)
+        logger.info("Stage %s finished in %.1fs", stage.name, time.perf_counter() - start)
+        return digest
+
+    pending = [s for s in stages if s.name in selected]
+    running: dict[Future, Stage] = {}
+
+    def schedule() -> None:
+        """Skip or submit every pending stage whose inputs are resolved (skips can unblock more)."""
+        progressed = True
+        while progressed:
+            progressed = False
+            for stage in [s for s in pending if all(d in digests for d in s.depends_on)]:
+                pending.remove(stage)
+                progressed = True
+                key = _stage_key(stage, digests)
+                header = read_checkpoint_header(stage.name, checkpoint_dir) if resume else None
+                if (
+                    header is not None
+                    and stage.name not in forced
+                    and header["key"] == key
+                    and all(path.exists() for path in stage.files)
+                ):
+                    digests[stage.name] = header["digest"]
+                    logger.info("Stage %s unchanged — reusing checkpoint", stage.name)
+                    continue
+                logger.info("Stage %s starting", stage.name)
+                running[pool.submit(execute, stage, key)] = stage
+
+    with ThreadPoolExecutor(max_workers=max(1, max_parallel), thread_name_prefix="stage") as pool:
+        schedule()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                try:
+                    digests[stage.name] = future.result()
+                except PipelineAborted as exc:
+                    logger.warning("Stage %s aborted the pipeline: %s", stage.name, exc)
+                    pending.clear()
+                    wait(running)  # stages already started still finish and checkpoint
+                    return False
+                except Exception:
+                    # Let stages already running finish (and checkpoint) so a retry resumes past them
+                    pending.clear()
+                    wait(running)
+                    raise
+            schedule()
+
+    if pending:  # only reachable when an input was neither selected nor checkpointed
+        raise RuntimeError(f"Stages {[s.name for s in pending]} have unresolved inputs")
+    return True
@@ -0,0 +1,171 @@
+"""Static edition — render the day's digest and charts to plain HTML that nginx serves directly."""
+
+import logging
+import os
+from datetime import datetime, timezone
+from html import escape
+from pathlib import Path
+
+from config.settings import EDITION_CHAT_URL, EDITION_DIR
+
+logger = logging.getLogger(__name__)
+
+NYT_ACCENT = "#326891"
+NYT_GRAY = "#666666"
+NYT_BLACK = "#121212"
+
+_CSS = """
+body { margin: 0; background: #FAFAF8; color: #121212; }
+main { max-width: 1100px; margin: 0 auto; padding: 0 1.25rem 3rem; }
+a { color: #121212; text-decoration: none; }
+a:hover { text-decoration: underline; }
+.masthead { text-align: center; padding: 1.5rem 0 0.8rem; border-bottom: 2px solid #000; }
+.masthead-date, .masthead-subtitle, .masthead-stats, .meta-text, .section-label, .cta {
+    font-family: 'Libre Franklin', Helvetica, Arial, sans-serif; text-transform: uppercase; }
+.masthead-date { font-size: 0.72rem; color: #666; letter-spacing: 1.5px; }
+.masthead-title { font-family: 'Playfair Display', Georgia, serif; font-size: 3.2rem; font-weight: 900;
+    letter-spacing: -0.5px; line-height: 1; margin: 0.25rem 0 0; }
+.masthead-subtitle { font-size: 0.68rem; font-weight: 300; color: #888; letter-spacing: 2.5px; margin-top: 0.35rem; }
+.masthead-stats { font-size: 0.62rem; color: #AAA; letter-spacing: 1px; margin-top: 0.5rem; }
+.columns { display: grid; grid-template-columns: 3fr 2fr; gap: 2.5rem; margin-top: 1rem; }
+@media (max-width: 800px) { .columns { grid-template-columns: 1fr; } }
+.section-label { font-size: 0.65rem; font-weight: 600; letter-spacing: 2px; margin: 1.2rem 0 0.3rem;
+    border-bottom: 1px solid #000; padding-bottom: 0.15rem; }
+.headline-sm { font-family: 'Playfair Display', Georgia, serif; font-size: 0.95rem; font-weight: 700;
+    line-height: 1.3; margin: 0.15rem 0; }
+.summary-text { font-family: Lora, Georgia, serif; font-size: 0.88rem; color: #333; line-height: 1.55; margin: 0.15rem 0 0.3rem; }
+.meta-text { font-size: 0.68rem; color: #999; letter-spacing: 0.5px; }
+.item { padding: 0.4rem 0; border-bottom: 1px solid #F0F0F0; }
+.ranked { display: flex; gap: 0.6rem; }
+.rank { font-family: 'Playfair Display', Georgia, serif; font-size: 1.5rem; font-weight: 300; color: #DDD;
+    line-height: 1; min-width: 1.2rem; }
+.types { display: flex; gap: 1rem; text-align: center; }
+.types div { flex: 1; }
+.types .count { font-family: 'Playfair Display', Georgia, serif; font-size: 1.5rem; font-weight: 700; }
+.cta { display: inline-block; margin-top: 1.2rem; font-size: 0.7rem; letter-spacing: 1.5px; font-weight: 600;
+    border: 1px solid #121212; padding: 0.5rem 0.9rem; }
+"""
+
+
+def _bar_chart_svg(rows: list[tuple[str, int]], color: str, row_height: int = 26) -> str:
+    """Horizontal bar chart as inline SVG, largest first — no JavaScript needed."""
+    if not rows:
+        return ""
+    label_w, bar_w, value_w = 150, 260, 40
+    top = max(count for _, count in rows) or 1
+    height = row_height * len(rows)
+    bars = []
+    for i, (label, count) in enumerate(rows):
+        y = i * row_height
+        w = max(1, round(bar_w * count / top))
+        bars.append(
+            f'<text x="{label_w - 8}" y="{y + row_height * 0.65:.1f}" text-anchor="end" '
+            f'font-size="11" fill="{NYT_GRAY}">{escape(label[:24])}</text>'
+            f'<rect x="{label_w}" y="{y + 4}" width="{w}" height="{row_height - 8}" fill="{color}"/>'
+            f'<text x="{label_w + w + 4}" y="{y + row_height * 0.65:.1f}" font-size="10" fill="{NYT_GRAY}">{count}</text>'
+        )
+    return (
+        f'<svg viewBox="0 0 {label_w + bar_w + value_w} {height}" width="100%" role="img" '
+        f'style="font-family: \'Libre Franklin\', Helvetica, Arial, sans-serif;">{"".join(bars)}</svg>'
+    )
+
+
+def _story(post: dict, rank: int | None = None, summary: bool = False) -> str:
+    title = escape(post.get("title", ""))
+    href = escape(post.get("hn_url", ""), quote=True)
+    meta = f'{post.get("score", 0)} pts&ensp;&middot;&ensp;{post.get("num_comments", 0)} comments'
+    if "ratio" in post:
+        meta += f'&ensp;&middot;&ensp;{post["ratio"]}x ratio'
+    body = (
+        f'<div class="headline-sm"><a href="{href}">{title}</a></div>'
+        + (f'<p class="summary-text">{escape(post.get("summary", "")[:220])}</p>' if summary and post.get("summary") else "")
+        + f'<div class="meta-text">{meta}</div>'
+    )
+    if rank is None:
+        return f'<div class="item">{body}</div>'
+    return f'<div class="item ranked"><span class="rank">{rank}</span><div>{body}</div></div>'
+
+
+def _section(label: str, content: str) -> str:
+    return f'<div class="section-label">{escape(label)}</div>{content}' if content else ""
+
+
+def render_edition_html(charts: dict, digest: dict) -> str:
+    """The full static edition page for one day's charts and digest."""
+    date = digest.get("date") or datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    try:
+        dateline = datetime.strptime(date, "%Y-%m-%d").strftime("%A, %B %d, %Y")
+    except ValueError:
+        dateline = date
+
+    trending = charts.get("trending_topics", {})
+    domains = charts.get("domain_leaderboard", [])
+    types = charts.get("story_type_breakdown", {})
+    total_types = sum(types.values()) or 1
+
+    main_col = "".join([
+        _section("Breaking Through", "".join(_story(p, summary=True) for p in digest.get("breakthroughs", [])[:5])),
+        _section("Most Upvoted", "".join(
+            _story(p, rank=i, summary=True) for i, p in enumerate(digest.get("top_posts", [])[:10], 1)
+        )),
+        f'<a class="cta" href="{escape(EDITION_CHAT_URL, quote=True)}">Ask about today\'s stories &rarr;</a>',
+    ])
+    aside = "".join([
+        _section("Top Stories", "".join(_story(p, rank=i) for i, p in enumerate(charts.get("top_stories", [])[:5], 1))),
+        _section("What's Trending", _bar_chart_svg(
+            [(topic, info["count"]) for topic, info in list(trending.items())[:10]], NYT_ACCENT,
+        )),
+        _section("Themes", "".join(
+            f'<div class="item"><div class="headline-sm">{escape(c["label"])}</div>'
+            f'<div class="meta-text">{escape(c.get("status", ""))}&ensp;&middot;&ensp;{c["size"]} stories</div></div>'
+            for c in charts.get("themes", {}).get("clusters", [])[:6]
+        )),
+        _section("Hot Discussions", "".join(_story(p) for p in charts.get("hot_discussions", [])[:5])),
+        _section("Where Links Point", _bar_chart_svg([(d["domain"], d["count"]) for d in domains[:10]], NYT_BLACK)),
+        _section("Story Types", '<div class="types">' + "".join(
+            f'<div><div class="count">{count}</div><div class="meta-text">{escape(label)}</div>'
+            f'<div class="meta-text">{round(100 * count / total_types)}%</div></div>'
+            for label, count in types.items()
+        ) + "</div>" if types else ""),
+    ])
+
+    return f"""<!doctype html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>The Daily — {escape(dateline)}</title>
+<style>{_CSS}</style>
+</head>
+<body>
+<main>
+<header class="masthead">
+  <div class="masthead-date">{escape(dateline)}</div>
+  <div class="masthead-title">The Daily</div>
+  <div class="masthead-subtitle">Tech Radar</div>
+  <div class="masthead-stats">{digest.get("total_posts", 0)} stories analyzed</div>
+</header>
+<div class="columns">
+  <section>{main_col}</section>
+  <aside>{aside}</aside>
+</div>
+</main>
+</body>
+</html>
+"""
+
+
+def render_edition(charts: dict, digest: dict, out_dir: Path = EDITION_DIR) -> Path:
+    """Write index.html plus a dated archive copy, each published atomically."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    page = render_edition_html(charts, digest)
+    date = digest.get("date") or datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    for name in (f"{date}.html", "index.html"):
+        path = out_dir / name
+        tmp = path.with_name(f".{path.name}.tmp")
+        tmp.write_text(page, encoding="utf-8")
+        os.replace(tmp, path)  # nginx never serves a half-written page
+
+    logger.info("Static edition written to %s (%d KB)", out_dir / "index.html", len(page) // 1024)
+    return out_dir / "index.html"
@@ -2,32 +2,97 @@
 
 import json
 import logging
+import os
+from datetime import datetime, timezone
+from pathlib import Path
 
 import faiss
 import numpy as np
 
-from config.settings import EMBEDDING_DIM, FAISS_INDEX_PATH, EMBEDDINGS_PATH, SUMMARIES_PATH
+from config.settings import (
+    BM25_INDEX_PATH,
+    EMBEDDING_DIM,
+    EMBEDDINGS_PATH,
+    FAISS_INDEX_PATH,
+    GENERATION_PATH,
+    NEIGHBOR_IDS_PATH,
+    NEIGHBOR_SCORES_PATH,
+    NEIGHBORS_K,
+    SUMMARIES_PATH,
+)
+from pipeline.bm25 import build_bm25_index
 
 logger = logging.getLogger(__name__)
 
 
+def _tmp_path(path: Path) -> Path:
+    """Sibling temp path keeping the suffix (np.save would otherwise append .npy)."""
+    return path.with_name(f".{path.stem}.tmp{path.suffix}")
+
+
+def _publish(tmp: Path, path: Path) -> None:
+    """Atomically swap a freshly written artifact into place.
+
+    Serving processes memory-map the index and embeddings; rewriting those files
+    in place would corrupt their live mappings, whereas a rename leaves old
+    mappings pointing at the previous inode until they reload.
+    """
+    os.replace(tmp, path)
+
+
+def build_neighbor_graph(index: faiss.Index, embeddings: np.ndarray, k: int = NEIGHBORS_K) -> tuple[np.ndarray, np.ndarray]:
+    """k-nearest-neighbour graph over every story via one batched self-search.
+
+    Returns (ids int32 [n, k], scores float16 [n, k]); each row excludes the story
+    itself and is padded with -1 / 0 when fewer than k other stories exist.
+    """
+    n = embeddings.shape[0]
+    sims, ids = index.search(embeddings, min(k + 1, n))
+
+    # Drop the self-match wherever it landed (exact duplicates may outrank it)
+    not_self = ids != np.arange(n)[:, None]
+    order = np.argsort(~not_self, axis=1, kind="stable")
+    ids = np.take_along_axis(ids, order, axis=1)[:, :k]
+    sims = np.take_along_axis(sims, order, axis=1)[:, :k]
+    valid = np.take_along_axis(not_self, order, axis=1)[:, :k] & (ids >= 0)
+
+    out_ids = np.full((n, k), -1, dtype=np.int32)
+    out_scores = np.zeros((n, k), dtype=np.float16)
+    width = ids.shape[1]
+    out_ids[:, :width] = np.where(valid, ids, -1)
+    out_scores[:, :width] = np.where(valid, sims, 0)
+    return out_ids, out_scores
+
+
 def build_faiss_index(
     posts: list[dict],
     summaries: list[str],
     embeddings: np.ndarray,
     topics: list[list[str]],
-) -> None:
-    """Build FAISS index and save embeddings + metadata to disk."""
+) -> str:
+    """Build FAISS index and save embeddings + metadata to disk; returns the published generation."""
     assert embeddings.shape[0] == len(posts), "Embedding count must match post count"
     assert embeddings.shape[1] == EMBEDDING_DIM, f"Expected dim {EMBEDDING_DIM}, got {embeddings.shape[1]}"
 
     # Build index (Inner Product for cosine similarity on normalized vectors)
     index = faiss.IndexFlatIP(EMBEDDING_DIM)
     index.add(embeddings)
-    faiss.write_index(index, str(FAISS_INDEX_PATH))
+    tmp = _tmp_path(FAISS_INDEX_PATH)
+    faiss.write_index(index, str(tmp))
+    _publish(tmp, FAISS_INDEX_PATH)
 
     # Save embeddings
-    np.save(str(EMBEDDINGS_PATH), embeddings)
+    tmp = _tmp_path(EMBEDDINGS_PATH)
+    np.save(str(tmp), np.ascontiguousarray(embeddings, dtype=np.float32))
+    _publish(tmp, EMBEDDINGS_PATH)
+
+    # Related-stories graph
+    neighbor_ids, neighbor_scores = build_neighbor_graph(index, embeddings)
+    for path, array in ((NEIGHBOR_IDS_PATH, neighbor_ids), (NEIGHBOR_SCORES_PATH, neighbor_scores)):
+        tmp = _tmp_path(path)
+        np.save(str(tmp), array)
+        _publish(tmp, path)
+    logger.info("Neighbour graph (%d × %d) saved to %s", *neighbor_ids.shape, NEIGHBOR_IDS_PATH)
 
     # Save metadata alongside summaries
     metadata = []
@@ -44,7 +109,35 @@ def build_faiss_index(
             "story_text": post.get("story_text", "")[:300],
         })
 
-    with open(SUMMARIES_PATH, "w") as f:
+    tmp = _tmp_path(SUMMARIES_PATH)
+    with open(tmp, "w") as f:
         json.dump(metadata, f, indent=2)
+    _publish(tmp, SUMMARIES_PATH)
+
+    # Lexical index over title + summary + full story text
+    bm25 = build_bm25_index([
+        f"{post['title']}\n{summaries[i] if i < len(summaries) else ''}\n{post.get('story_text', '')}"
+        for i, post in enumerate(posts)
+    ])
+    tmp = _tmp_path(BM25_INDEX_PATH)
+    np.savez(str(tmp), **bm25)
+    _publish(tmp, BM25_INDEX_PATH)
+    logger.info("BM25 index (%d terms, %d postings) saved to %s",
+                len(bm25["terms"]), len(bm25["doc_ids"]), BM25_INDEX_PATH)
 
     logger.info("FAISS index (%d vectors) saved to %s", index.ntotal, FAISS_INDEX_PATH)
+
+    generation = publish_generation(index.ntotal)
+    logger.info("Published index generation %s", generation)
+    return generation
+
+
+def publish_generation(num_vectors: int) -> str:
+    """Stamp a new artifact generation; serving caches invalidate when it changes."""
+    now = datetime.now(timezone.utc)
+    generation = now.strftime("%Y%m%dT%H%M%S.%fZ")
+    tmp = _tmp_path(GENERATION_PATH)
+    with open(tmp, "w") as f:
+        json.dump({"generation": generation, "published_at": now.isoformat(), "num_vectors": num_vectors}, f)
+    _publish(tmp, GENERATION_PATH)
+    return generation
@@ -1,170 +1,312 @@
-"""Insight extraction — daily summaries, trending topics, breakthrough detection."""
+"""Insight extraction — daily summaries, trending topics, breakthrough detection.
+
+The post list is converted once into columns (NumPy arrays plus a sparse
+post×topic matrix and an interned host column); every chart and digest
+aggregate is then a vectorized reduction over those shared columns, scored
+against the rolling daily history kept by pipeline.timeseries.
+"""
 
 import json
 import logging
-from collections import Counter, defaultdict
+import os
+import time
 from datetime import datetime, timezone
-from urllib.parse import urlparse
+from urllib.parse import urlsplit
+
+import numpy as np
 
 from config.settings import (
     BREAKTHROUGH_SCORE_THRESHOLD,
+    BREAKTHROUGH_VELOCITY_Z,
     CHARTS_DATA_PATH,
     DAILY_DIGEST_PATH,
+    HISTORY_MIN_DAYS,
+    TRENDING_MIN_STD,
 )
+from pipeline.timeseries import count_zscores, daily_aggregates, load_history, story_velocity, velocity_zscores
 
 logger = logging.getLogger(__name__)
 
+STORY_TYPES = ("Show HN", "Ask HN", "Launch HN", "Stories")  # codes 0-3 in build_columns
+HOT_DISCUSSION_MIN_COMMENTS = 20
+
+
+def _host(url: str) -> str:
+    try:
+        host = urlsplit(url).netloc
+    except ValueError:
+        return ""
+    return host[4:] if host.startswith("www.") else host
+
 
-def extract_trending_topics(posts: list[dict], topics: list[list[str]]) -> dict:
-    """Compute topic → {count, avg_score}."""
-    topic_scores: dict[str, list[int]] = defaultdict(list)
+def build_columns(posts: list[dict], topics: list[list[str]]) -> dict:
+    """One pass over the posts into columnar arrays.
 
-    for post, post_topics in zip(posts, topics):
-        for t in post_topics:
-            topic_scores[t].append(post["score"])
+    Topics and hosts are interned in first-seen order, so ties in every ranking
+    below resolve exactly as a stable sort over the original list would.
+    Topics form a sparse post×topic matrix in COO form (``topic_posts``,
+    ``topic_ids``).
+    """
+    score: list[int] = []
+    comments: list[int] = []
+    created: list[int] = []
+    story_type: list[int] = []
+    host_id: list[int] = []
+    hosts: dict[str, int] = {}
+    url_hosts: dict[str, str] = {}  # each distinct URL is parsed once
+    topic_vocab: dict[str, int] = {}
+    topic_posts: list[int] = []
+    topic_ids: list[int] = []
+
+    for i, post in enumerate(posts):
+        score.append(post.get("score", 0))
+        comments.append(post.get("num_comments", 0))
+        created.append(post.get("created_utc") or 0)
+
+        title = post.get("title", "")
+        if title.startswith("Show HN"):
+            story_type.append(0)
+        elif title.startswith("Ask HN"):
+            story_type.append(1)
+        elif title.startswith("Launch HN"):
+            story_type.append(2)
+        else:
+            story_type.append(3)
+
+        url = post.get("url")
+        host = ""
+        if url:
+            host = url_hosts.get(url)
+            if host is None:
+                host = url_hosts[url] = _host(url)
+        host_id.append(hosts.setdefault(host, len(hosts)) if host else -1)
+
+        for t in topics[i] if i < len(topics) else ():
+            topic_posts.append(i)
+            topic_ids.append(topic_vocab.setdefault(t, len(topic_vocab)))
 
     return {
-        topic: {"count": len(scores), "avg_score": round(sum(scores) / len(scores), 1)}
-        for topic, scores in sorted(topic_scores.items(), key=lambda x: -len(x[1]))
+        "n": len(posts),
+        "score": np.asarray(score, dtype=np.int64),
+        "comments": np.asarray(comments, dtype=np.int64),
+        "created_utc": np.asarray(created, dtype=np.float64),
+        "story_type": np.asarray(story_type, dtype=np.int8),
+        "host_id": np.asarray(host_id, dtype=np.int32),
+        "hosts": list(hosts),
+        "topics": list(topic_vocab),
+        "topic_posts": np.asarray(topic_posts, dtype=np.int64),
+        "topic_ids": np.asarray(topic_ids, dtype=np.int32),
     }
 
 
-def detect_breakthroughs(posts: list[dict], summaries: list[str], topics: list[list[str]]) -> list[dict]:
-    """Flag high-score stories as potential breakthroughs."""
-    breakthroughs = []
-    for post, summary, post_topics in zip(posts, summaries, topics):
-        if post["score"] >= BREAKTHROUGH_SCORE_THRESHOLD:
-            breakthroughs.append({
-                "title": post["title"],
-                "summary": summary,
-                "score": post["score"],
-                "num_comments": post.get("num_comments", 0),
-                "hn_url": post["hn_url"],
-                "topics": post_topics,
-            })
-
-    breakthroughs.sort(key=lambda x: -x["score"])
-    logger.info("Detected %d breakthroughs", len(breakthroughs))
-    return breakthroughs
-
-
-def build_top_stories(posts: list[dict], summaries: list[str]) -> list[dict]:
-    """Top 5 stories by score."""
-    indexed = sorted(enumerate(posts), key=lambda x: -x[1]["score"])[:5]
-    return [
+def _top_k(values: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest values, descending; ties keep input order like a stable sort.
+
+    ``argpartition`` narrows the candidates in O(n); only those at or above the
+    k-th value are sorted.
+    """
+    n = len(values)
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k < n:
+        kth = values[np.argpartition(values, n - k)[n - k]]
+        candidates = np.flatnonzero(values >= kth)
+    else:
+        candidates = np.arange(n)
+    order = np.lexsort((candidates, -values[candidates]))
+    return candidates[order[:k]]
+
+
+def trending_topics(cols: dict, velocity: np.ndarray, baseline: dict | None = None) -> dict:
+    """Compute topic → {count, avg_score, velocity, z_score}.
+
+    With a baseline, topics are ordered by how far today's count sits above
+    their rolling daily mean (z-score); otherwise by today's count.
+    """
+    num_topics = len(cols["topics"])
+    ids, posts = cols["topic_ids"], cols["topic_posts"]
+    counts = np.bincount(ids, minlength=num_topics)
+    totals = np.bincount(ids, weights=cols["score"][posts], minlength=num_topics)
+    speeds = np.bincount(ids, weights=velocity[posts], minlength=num_topics)
+    z = count_zscores(cols["topics"], counts, baseline["topic"], TRENDING_MIN_STD) if baseline else None
+    order = np.lexsort((np.arange(num_topics), -z)) if z is not None else np.argsort(-counts, kind="stable")
+    return {
+        cols["topics"][t]: {
+            "count": int(counts[t]),
+            "avg_score": round(float(totals[t] / counts[t]), 1),
+            "velocity": round(float(speeds[t] / counts[t]), 1),
+            "z_score": round(float(z[t]), 2) if z is not None else None,
+        }
+        for t in order
+        if counts[t]
+    }
+
+
+def breakthroughs(
+    cols: dict,
+    velocity: np.ndarray,
+    posts: list[dict],
+    summaries: list[str],
+    topics: list[list[str]],
+    baseline: dict | None = None,
+    k: int = 5,
+) -> tuple[int, list[dict]]:
+    """(number of breakthrough stories, the top ``k`` of them).
+
+    With a baseline, a breakthrough is a story whose score velocity (points per
+    hour) is BREAKTHROUGH_VELOCITY_Z standard deviations above the rolling
+    norm; before enough history exists, the fixed score threshold applies.
+    """
+    if baseline is not None:
+        z = velocity_zscores(velocity, baseline["stories"])
+        flagged, rank_by = z >= BREAKTHROUGH_VELOCITY_Z, z
+    else:
+        z = None
+        flagged, rank_by = cols["score"] >= BREAKTHROUGH_SCORE_THRESHOLD, cols["score"].astype(np.float64)
+    total = int(flagged.sum())
+    ranked = _top_k(np.where(flagged, rank_by, -np.inf), min(k, total))
+    return total, [
         {
             "title": posts[i]["title"],
-            "score": posts[i]["score"],
-            "num_comments": posts[i].get("num_comments", 0),
+            "summary": summaries[i] if i < len(summaries) else "",
+            "score": int(cols["score"][i]),
+            "num_comments": int(cols["comments"][i]),
             "hn_url": posts[i]["hn_url"],
+            "topics": topics[i] if i < len(topics) else [],
+            "velocity": round(float(velocity[i]), 1),
+            "z_score": round(float(z[i]), 2) if z is not None else None,
+        }
+        for i in ranked
+    ]
+
+
+def top_stories(
+    cols: dict, posts: list[dict], summaries: list[str], topics: list[list[str]], k: int = 10,
+) -> list[dict]:
+    """Top ``k`` stories by score."""
+    return [
+        {
+            "title": posts[i]["title"],
             "summary": summaries[i] if i < len(summaries) else "",
+            "score": int(cols["score"][i]),
+            "num_comments": int(cols["comments"][i]),
+            "hn_url": posts[i]["hn_url"],
+            "url": posts[i].get("url", ""),
+            "topics": topics[i] if i < len(topics) else [],
         }
-        for i, _ in indexed
+        for i in _top_k(cols["score"], k)
     ]
 
 
-def build_hot_discussions(posts: list[dict]) -> list[dict]:
+def hot_discussions(cols: dict, posts: list[dict], k: int = 5) -> list[dict]:
     """Stories with highest comment-to-score ratio (min 20 comments to filter noise)."""
-    candidates = [p for p in posts if p.get("num_comments", 0) >= 20 and p.get("score", 0) > 0]
-    candidates.sort(key=lambda p: p["num_comments"] / max(p["score"], 1), reverse=True)
+    score, comments = cols["score"], cols["comments"]
+    eligible = (comments >= HOT_DISCUSSION_MIN_COMMENTS) & (score > 0)
+    ratio = comments / np.maximum(score, 1)
+    ranked = _top_k(np.where(eligible, ratio, -1.0), min(k, int(eligible.sum())))
     return [
         {
-            "title": p["title"],
-            "score": p["score"],
-            "num_comments": p["num_comments"],
-            "ratio": round(p["num_comments"] / max(p["score"], 1), 1),
-            "hn_url": p["hn_url"],
+            "title": posts[i]["title"],
+            "score": int(score[i]),
+            "num_comments": int(comments[i]),
+            "ratio": round(float(ratio[i]), 1),
+            "hn_url": posts[i]["hn_url"],
         }
-        for p in candidates[:5]
+        for i in ranked
     ]
 
 
-def build_domain_leaderboard(posts: list[dict]) -> list[dict]:
+def domain_leaderboard(cols: dict, k: int = 10) -> list[dict]:
     """Top domains by link count."""
-    domains: Counter = Counter()
-    for p in posts:
-        url = p.get("url", "")
-        if url:
-            try:
-                host = urlparse(url).netloc
-                # Clean up www. prefix
-                if host.startswith("www."):
-                    host = host[4:]
-                if host:
-                    domains[host] += 1
-            except Exception:
-                pass
-
-    return [{"domain": domain, "count": count} for domain, count in domains.most_common(10)]
-
-
-def build_story_type_breakdown(posts: list[dict]) -> dict:
-    """Count of Show HN / Ask HN / regular stories."""
-    types: dict[str, int] = {"Show HN": 0, "Ask HN": 0, "Launch HN": 0, "Stories": 0}
-    for p in posts:
-        title = p.get("title", "")
-        if title.startswith("Show HN"):
-            types["Show HN"] += 1
-        elif title.startswith("Ask HN"):
-            types["Ask HN"] += 1
-        elif title.startswith("Launch HN"):
-            types["Launch HN"] += 1
-        else:
-            types["Stories"] += 1
+    host_id = cols["host_id"]
+    counts = np.bincount(host_id[host_id >= 0], minlength=len(cols["hosts"]))
+    return [{"domain": cols["hosts"][h], "count": int(counts[h])} for h in _top_k(counts, k)]
+
 
-    # Remove zero entries
-    return {k: v for k, v in types.items() if v > 0}
+def story_type_breakdown(cols: dict) -> dict:
+    """Count of Show HN / Ask HN / Launch HN / regular stories (zero entries dropped)."""
+    counts = np.bincount(cols["story_type"], minlength=len(STORY_TYPES))
+    return {label: int(count) for label, count in zip(STORY_TYPES, counts) if count}
 
 
-def generate_charts_data(posts: list[dict], topics: list[list[str]], summaries: list[str] | None = None) -> dict:
-    """Produce the charts_data.json content."""
+def compute_insights(
+    posts: list[dict],
+    summaries: list[str],
+    topics: list[list[str]],
+    day: str | None = None,
+    now: float | None = None,
+) -> dict:
+    """Every aggregate the charts and digest need, from a single columnar pass.
+
+    Trending and breakthroughs are scored against the rolling history in
+    pipeline.timeseries; ``aggregates`` is today's row block for record_day().
+    """
+    now = now if now is not None else time.time()
+    day = day or datetime.fromtimestamp(now, timezone.utc).strftime("%Y-%m-%d")
+    cols = build_columns(posts, topics)
+    velocity = story_velocity(cols["score"], cols["created_utc"], now)
+
+    history = load_history(before=day)
+    baseline = history if len(history["days"]) >= HISTORY_MIN_DAYS else None
+    if baseline is None:
+        logger.info("Only %d day(s) of history — using fixed thresholds", len(history["days"]))
+
+    num_breakthroughs, top_breakthroughs = breakthroughs(cols, velocity, posts, summaries, topics, baseline)
+    logger.info("Detected %d breakthroughs", num_breakthroughs)
+    return {
+        "date": day,
+        "total_posts": cols["n"],
+        "trending_topics": trending_topics(cols, velocity, baseline),
+        "top_posts": top_stories(cols, posts, summaries, topics, k=10),
+        "hot_discussions": hot_discussions(cols, posts),
+        "domain_leaderboard": domain_leaderboard(cols),
+        "story_type_breakdown": story_type_breakdown(cols),
+        "breakthroughs": top_breakthroughs,
+        "aggregates": daily_aggregates(cols, velocity),
+    }
+
+
+def _write_json(path, data: dict) -> None:
+    """Publish atomically: the UI and API re-read these files whenever their mtime changes."""
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+def generate_charts_data(insights: dict, themes: dict | None = None) -> dict:
+    """Produce the charts_data.json content (``themes`` from pipeline.clusters)."""
     charts = {
-        "trending_topics": extract_trending_topics(posts, topics),
-        "top_stories": build_top_stories(posts, summaries or []),
-        "hot_discussions": build_hot_discussions(posts),
-        "domain_leaderboard": build_domain_leaderboard(posts),
-        "story_type_breakdown": build_story_type_breakdown(posts),
+        "trending_topics": insights["trending_topics"],
+        "top_stories": [
+            {k: p[k] for k in ("title", "score", "num_comments", "hn_url", "summary")}
+            for p in insights["top_posts"][:5]
+        ],
+        "hot_discussions": insights["hot_discussions"],
+        "domain_leaderboard": insights["domain_leaderboard"],
+        "story_type_breakdown": insights["story_type_breakdown"],
+        "themes": themes or {"clusters": [], "fading": []},
         "generated_at": datetime.now(timezone.utc).isoformat(),
     }
 
-    with open(CHARTS_DATA_PATH, "w") as f:
-        json.dump(charts, f, indent=2)
+    _write_json(CHARTS_DATA_PATH, charts)
 
     logger.info("Charts data saved to %s", CHARTS_DATA_PATH)
     return charts
 
 
-def generate_daily_digest(
-    posts: list[dict],
-    summaries: list[str],
-    topics: list[list[str]],
-    breakthroughs: list[dict],
-    trending: dict,
-) -> dict:
+def generate_daily_digest(insights: dict) -> dict:
     """Produce the daily_digest.json content."""
-    indexed = sorted(enumerate(posts), key=lambda x: -x[1]["score"])[:10]
-    top_posts = []
-    for i, post in indexed:
-        top_posts.append({
-            "title": post["title"],
-            "summary": summaries[i] if i < len(summaries) else "",
-            "score": post["score"],
-            "num_comments": post.get("num_comments", 0),
-            "hn_url": post["hn_url"],
-            "url": post.get("url", ""),
-            "topics": topics[i] if i < len(topics) else [],
-        })
-
     digest = {
-        "date": datetime.now(timezone.utc).strftime("%Y-%m-%d"),
-        "total_posts": len(posts),
-        "breakthroughs": breakthroughs[:5],
-        "top_posts": top_posts,
-        "trending_topics": trending,
+        "date": insights["date"],
+        "total_posts": insights["total_posts"],
+        "breakthroughs": insights["breakthroughs"],
+        "top_posts": insights["top_posts"],
+        "trending_topics": insights["trending_topics"],
     }
 
-    with open(DAILY_DIGEST_PATH, "w") as f:
-        json.dump(digest, f, indent=2)
+    _write_json(DAILY_DIGEST_PATH, digest)
 
     logger.info("Daily digest saved to %s", DAILY_DIGEST_PATH)
     return digest
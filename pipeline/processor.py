@@ -5,9 +5,9 @@ import os
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import numpy as np
-from openai import OpenAI
 
-from config.settings import EMBEDDING_MODEL, OPENAI_API_KEY, OPENAI_MODEL, TOPIC_KEYWORDS
+from agents.clients import get_openai_client, upstream_slot
+from config.settings import EMBEDDING_MODEL, OPENAI_MODEL, TOPIC_KEYWORDS
 
 logger = logging.getLogger(__name__)
 
@@ -34,24 +34,25 @@ def classify_topic(text: str) -> list[str]:
 
 def _summarize_batch(posts: list[dict]) -> list[str]:
     """Summarize a batch of posts using OpenAI."""
-    client = OpenAI(api_key=OPENAI_API_KEY)
+    client = get_openai_client()
     summaries = []
 
     for post in posts:
         text = _post_text(post)
         try:
-            resp = client.chat.completions.create(
-                model=OPENAI_MODEL,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a concise tech news summarizer. Summarize the following Hacker News story in 2-3 sentences, focusing on the key technical insight or news.",
-                    },
-                    {"role": "user", "content": text[:2000]},
-                ],
-                max_tokens=150,
-                temperature=0.3,
-            )
+            with upstream_slot():
+                resp = client.chat.completions.create(
+                    model=OPENAI_MODEL,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": "You are a concise tech news summarizer. Summarize the following Hacker News story in 2-3 sentences, focusing on the key technical insight or news.",
+                        },
+                        {"role": "user", "content": text[:2000]},
+                    ],
+                    max_tokens=150,
+                    temperature=0.3,
+                )
             summaries.append(resp.choices[0].message.content.strip())
         except Exception as e:
             logger.error("Summarization failed for story %s: %s", post.get("id"), e)
@@ -62,7 +63,7 @@ def _summarize_batch(posts: list[dict]) -> list[str]:
 
 def _embed_all(posts: list[dict]) -> np.ndarray:
     """Generate embeddings for all posts using OpenAI embeddings API."""
-    client = OpenAI(api_key=OPENAI_API_KEY)
+    client = get_openai_client()
     texts = [_post_text(post)[:8000] for post in posts]
 
     # OpenAI supports batching up to 2048 inputs
@@ -70,7 +71,8 @@ def _embed_all(posts: list[dict]) -> np.ndarray:
     batch_size = 100
     for i in range(0, len(texts), batch_size):
         batch = texts[i : i + batch_size]
-        resp = client.embeddings.create(model=EMBEDDING_MODEL, input=batch)
+        with upstream_slot():
+            resp = client.embeddings.create(model=EMBEDDING_MODEL, input=batch)
         batch_embs = [item.embedding for item in resp.data]
         all_embeddings.extend(batch_embs)
         logger.info("Embedded %d/%d texts", min(i + batch_size, len(texts)), len(texts))
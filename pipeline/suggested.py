@@ -0,0 +1,43 @@
+"""Suggested questions — answer canonical questions offline and store them with the generation."""
+
+import json
+import logging
+import os
+from datetime import datetime, timezone
+
+from config.settings import SUGGESTED_ANSWERS_PATH, SUGGESTED_QUESTIONS
+
+logger = logging.getLogger(__name__)
+
+
+def precompute_suggested_answers(questions: list[str] = SUGGESTED_QUESTIONS, generation: str | None = None) -> dict:
+    """Run each question through the agent and save answers for ``generation`` (default: the current one).
+
+    The pipeline passes the generation its index stage published, so if another
+    run swaps the index meanwhile the answers are stamped stale and never served.
+    """
+    # Imported lazily: the agent stack is only needed for this final stage
+    from agents.artifacts import current_generation
+    from agents.graph import query_agent
+
+    answers = []
+    for question in questions:
+        try:
+            answers.append({"question": question, "answer": query_agent(question)})
+            logger.info("Precomputed answer for: %s", question)
+        except Exception:
+            logger.exception("Failed to precompute answer for: %s", question)
+
+    result = {
+        "generation": generation or current_generation(),
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "answers": answers,
+    }
+
+    tmp = SUGGESTED_ANSWERS_PATH.with_name(f".{SUGGESTED_ANSWERS_PATH.name}.tmp")
+    with open(tmp, "w") as f:
+        json.dump(result, f, indent=2)
+    os.replace(tmp, SUGGESTED_ANSWERS_PATH)
+
+    logger.info("Saved %d/%d suggested answers to %s", len(answers), len(questions), SUGGESTED_ANSWERS_PATH)
+    return result
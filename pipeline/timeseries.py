@@ -0,0 +1,130 @@
+"""Daily aggregate history — append-only per-day columnar files and rolling baselines.
+
+Each run writes one compact ``daily_<date>.npz`` with a row per topic and per
+domain (count, score sum, velocity sum) plus the day's story-velocity moments.
+Past days are never rewritten; baselines are built by stacking the last
+HISTORY_WINDOW_DAYS files into (days × keys) matrices, which takes
+milliseconds instead of re-reading raw snapshots.
+"""
+
+import logging
+import os
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+
+from config.settings import DAILY_HISTORY_FILE, HISTORY_DIR, HISTORY_WINDOW_DAYS, VELOCITY_MIN_HOURS
+
+logger = logging.getLogger(__name__)
+
+KINDS = ("topic", "domain")
+
+
+def _day_path(day: str, history_dir: Path = HISTORY_DIR) -> Path:
+    return history_dir / DAILY_HISTORY_FILE.format(day=day)
+
+
+def story_velocity(score: np.ndarray, created_utc: np.ndarray, now: float) -> np.ndarray:
+    """Points per hour since posting (age floored at VELOCITY_MIN_HOURS; unknown ages count as one day)."""
+    age_h = np.where(created_utc > 0, (now - created_utc) / 3600.0, 24.0)
+    return score / np.maximum(age_h, VELOCITY_MIN_HOURS)
+
+
+def daily_aggregates(cols: dict, velocity: np.ndarray) -> dict:
+    """Per-topic and per-domain rows for one day, from pipeline.insights columns."""
+    rows = {}
+    for kind, ids, posts, keys in (
+        ("topic", cols["topic_ids"], cols["topic_posts"], cols["topics"]),
+        ("domain", cols["host_id"][cols["host_id"] >= 0], np.flatnonzero(cols["host_id"] >= 0), cols["hosts"]),
+    ):
+        rows[kind] = {
+            "keys": list(keys),
+            "count": np.bincount(ids, minlength=len(keys)).astype(np.int32),
+            "score_sum": np.bincount(ids, weights=cols["score"][posts], minlength=len(keys)),
+            "velocity_sum": np.bincount(ids, weights=velocity[posts], minlength=len(keys)),
+        }
+    log_v = np.log1p(velocity)
+    rows["stories"] = {"count": len(velocity), "log_velocity_sum": float(log_v.sum()),
+                       "log_velocity_sumsq": float((log_v ** 2).sum())}
+    return rows
+
+
+def record_day(aggregates: dict, day: str, history_dir: Path = HISTORY_DIR) -> Path:
+    """Write (or, on a same-day rerun, replace) one day's row block atomically."""
+    history_dir.mkdir(parents=True, exist_ok=True)
+    kind = np.concatenate([np.full(len(aggregates[k]["keys"]), i, dtype=np.uint8) for i, k in enumerate(KINDS)])
+    stories = aggregates["stories"]
+    path = _day_path(day, history_dir)
+    tmp = path.with_name(f".{path.stem}.tmp.npz")
+    np.savez(
+        tmp,
+        kind=kind,
+        key=np.array([key for k in KINDS for key in aggregates[k]["keys"]], dtype=str),
+        count=np.concatenate([aggregates[k]["count"] for k in KINDS]),
+        score_sum=np.concatenate([aggregates[k]["score_sum"] for k in KINDS]),
+        velocity_sum=np.concatenate([aggregates[k]["velocity_sum"] for k in KINDS]),
+        stories=np.array([stories["count"], stories["log_velocity_sum"], stories["log_velocity_sumsq"]]),
+    )
+    os.replace(tmp, path)
+    logger.info("Recorded %d history rows for %s", len(kind), day)
+    return path
+
+
+def load_history(before: str, days: int = HISTORY_WINDOW_DAYS, history_dir: Path = HISTORY_DIR) -> dict:
+    """Stack the ``days`` days preceding ``before`` into per-kind (days × keys) count matrices.
+
+    Returns {"days": [...], "topic": {"keys", "count"}, "domain": {...},
+    "stories": (days × 3) [count, Σlog1p(v), Σlog1p(v)²]}. Days without a
+    file are skipped; keys absent on a day count as zero.
+    """
+    end = date.fromisoformat(before)
+    loaded = []
+    for offset in range(days, 0, -1):
+        day = (end - timedelta(days=offset)).isoformat()
+        path = _day_path(day, history_dir)
+        if path.exists():
+            with np.load(path) as f:
+                loaded.append((day, {name: f[name] for name in f.files}))
+
+    history = {"days": [day for day, _ in loaded], "stories": np.zeros((len(loaded), 3))}
+    for i, kind in enumerate(KINDS):
+        vocab: dict[str, int] = {}
+        per_day = []
+        for _, data in loaded:
+            mask = data["kind"] == i
+            per_day.append(([vocab.setdefault(k, len(vocab)) for k in data["key"][mask].tolist()], data["count"][mask]))
+        count = np.zeros((len(loaded), len(vocab)))
+        for d, (ids, counts) in enumerate(per_day):
+            count[d, ids] = counts
+        history[kind] = {"keys": list(vocab), "count": count}
+    for d, (_, data) in enumerate(loaded):
+        history["stories"][d] = data["stories"]
+    return history
+
+
+def count_zscores(keys: list[str], counts: np.ndarray, baseline: dict, min_std: float) -> np.ndarray:
+    """Today's count per key as a z-score against that key's daily counts in the baseline."""
+    column = {k: j for j, k in enumerate(baseline["keys"])}
+    hist = baseline["count"]
+    past = np.zeros((hist.shape[0], len(keys)))
+    known = [(i, column[k]) for i, k in enumerate(keys) if k in column]
+    if known:
+        mine, theirs = map(list, zip(*known))
+        past[:, mine] = hist[:, theirs]
+    mean = past.mean(axis=0)
+    std = np.maximum(past.std(axis=0), min_std)
+    return (counts - mean) / std
+
+
+def velocity_zscores(velocity: np.ndarray, stories: np.ndarray) -> np.ndarray:
+    """Each story's log1p(velocity) as a z-score against the pooled baseline of past days' stories.
+
+    All zeros when the baseline holds no stories (nothing to compare against).
+    """
+    n, total, total_sq = stories.sum(axis=0) if len(stories) else (0.0, 0.0, 0.0)
+    if n <= 0:
+        return np.zeros(len(velocity))
+    mean = total / n
+    std = np.sqrt(max(total_sq / n - mean ** 2, 1e-12))
+    return (np.log1p(velocity) - mean) / std
@@ -1,80 +1,183 @@
-"""Daily batch pipeline entry point — scrape HN, clean, process, index, digest."""
+"""Daily batch pipeline entry point — scrape HN, clean, process, index, digest, edition, suggestions.
 
+    python run_pipeline.py                     # full run
+    python run_pipeline.py --resume            # skip stages whose inputs are unchanged since their checkpoint
+    python run_pipeline.py --from-stage index  # rerun a stage and everything downstream of it
+    python run_pipeline.py --only charts,digest
+"""
+
+import argparse
 import logging
 import sys
 from datetime import datetime, timezone
 
-from config.settings import LOG_DIR
-
-# ── Logging setup ──────────────────────────────────────────────────────
-log_file = LOG_DIR / f"pipeline_{datetime.now(timezone.utc).strftime('%Y-%m-%d')}.log"
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-    handlers=[
-        logging.FileHandler(log_file),
-        logging.StreamHandler(sys.stdout),
-    ],
+from config.settings import (
+    CHARTS_DATA_PATH,
+    DAILY_DIGEST_PATH,
+    EDITION_DIR,
+    FAISS_INDEX_PATH,
+    DAILY_HISTORY_FILE,
+    GENERATION_PATH,
+    HISTORY_DIR,
+    LOG_DIR,
+    SUGGESTED_ANSWERS_PATH,
+    THEMES_HISTORY_FILE,
+    ensure_dirs,
+    load_env,
 )
+from pipeline.dag import PipelineAborted, Stage, run_stages
+
 logger = logging.getLogger("pipeline")
 
 
-def main() -> None:
-    logger.info("═══ Pipeline starting ═══")
+def _configure_logging() -> None:
+    """File + stdout logging; done in main() so importing this module has no side effects."""
+    log_file = LOG_DIR / f"pipeline_{datetime.now(timezone.utc).strftime('%Y-%m-%d')}.log"
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+        handlers=[
+            logging.FileHandler(log_file),
+            logging.StreamHandler(sys.stdout),
+        ],
+    )
 
-    try:
-        # 1. Scrape Hacker News
-        from scraper.hn_scraper import scrape_all
-
-        logger.info("Step 1/6: Scraping Hacker News...")
-        raw_posts = scrape_all()
-        if not raw_posts:
-            logger.warning("No stories scraped — aborting pipeline")
-            return
-
-        # 2. Clean raw data
-        from pipeline.cleaner import clean_posts
-
-        logger.info("Step 2/6: Cleaning data...")
-        posts = clean_posts(raw_posts)
-        if not posts:
-            logger.warning("No stories survived cleaning — aborting pipeline")
-            return
-
-        # 3. Parallel processing (threads for OpenAI, batch for embeddings)
-        from pipeline.processor import process_posts
-
-        logger.info("Step 3/6: Processing stories (%d stories)...", len(posts))
-        summaries, embeddings, topics = process_posts(posts)
-
-        # 4. Build FAISS index
-        from pipeline.index_builder import build_faiss_index
-
-        logger.info("Step 4/6: Building FAISS index...")
-        build_faiss_index(posts, summaries, embeddings, topics)
-
-        # 5. Generate insights & charts
-        from pipeline.insights import (
-            detect_breakthroughs,
-            extract_trending_topics,
-            generate_charts_data,
-            generate_daily_digest,
-        )
 
-        logger.info("Step 5/6: Generating charts data...")
-        generate_charts_data(posts, topics, summaries)
+# Each stage imports its module lazily, so `--only edition` never loads FAISS or OpenAI.
 
-        logger.info("Step 6/6: Generating daily digest...")
-        trending = extract_trending_topics(posts, topics)
-        breakthroughs = detect_breakthroughs(posts, summaries, topics)
-        generate_daily_digest(posts, summaries, topics, breakthroughs, trending)
 
-        logger.info("═══ Pipeline completed successfully ═══")
+def _scrape() -> list[dict]:
+    # Keyed on the run day (see build_stages), but the front page is always the live one
+    from scraper.hn_scraper import scrape_all
+
+    raw_posts = scrape_all()
+    if not raw_posts:
+        raise PipelineAborted("no stories scraped")
+    return raw_posts
+
+
+def _clean(raw_posts: list[dict]) -> list[dict]:
+    from pipeline.cleaner import clean_posts
+
+    posts = clean_posts(raw_posts)
+    if not posts:
+        raise PipelineAborted("no stories survived cleaning")
+    return posts
+
+
+def _process(posts: list[dict]) -> tuple:
+    # Threads for OpenAI summaries/topics, batches for embeddings
+    from pipeline.processor import process_posts
+
+    logger.info("Processing %d stories...", len(posts))
+    return process_posts(posts)
+
+
+def _index(posts: list[dict], processed: tuple) -> str:
+    from pipeline.index_builder import build_faiss_index
+
+    summaries, embeddings, topics = processed
+    return build_faiss_index(posts, summaries, embeddings, topics)
+
+
+def _insights(posts: list[dict], processed: tuple, day: str) -> dict:
+    # One columnar pass shared by charts and digest
+    from pipeline.insights import compute_insights
+    from pipeline.timeseries import record_day
+
+    summaries, _, topics = processed
+    insights = compute_insights(posts, summaries, topics, day=day)
+    record_day(insights["aggregates"], insights["date"])  # today's row block for future baselines
+    return insights
+
+
+def _themes(posts: list[dict], processed: tuple, day: str) -> dict:
+    from pipeline.clusters import discover_themes
+
+    return discover_themes(posts, processed[1], day)
+
 
+def _charts(insights: dict, themes: dict) -> dict:
+    from pipeline.insights import generate_charts_data
+
+    return generate_charts_data(insights, themes)
+
+
+def _digest(insights: dict) -> dict:
+    from pipeline.insights import generate_daily_digest
+
+    return generate_daily_digest(insights)
+
+
+def _edition(charts: dict, digest: dict) -> str:
+    # Static page for read-only visitors (served by nginx, no Streamlit session)
+    from pipeline.edition import render_edition
+
+    return str(render_edition(charts, digest))
+
+
+def _suggested(generation: str) -> dict:
+    # Precompute answers for the suggested questions (off the request path)
+    from pipeline.suggested import precompute_suggested_answers
+
+    return precompute_suggested_answers(generation=generation)
+
+
+def build_stages(day: str) -> list[Stage]:
+    """The pipeline DAG for one run day (the history files it declares are day-stamped).
+
+    Listed in dependency order; stages whose inputs are ready run side by side
+    (index/insights/themes, then charts/digest, then edition/suggested).
+    ``after`` dependencies order and key a stage without being passed to it:
+    scrape reruns on a new day, and the suggested answers are computed once
+    charts and digest are published, since the agent reads them from disk.
+    """
+    return [
+        Stage("scrape", _scrape, after=("day",)),
+        Stage("clean", _clean, ("scrape",)),
+        Stage("process", _process, ("clean",)),
+        Stage("index", _index, ("clean", "process"), (FAISS_INDEX_PATH, GENERATION_PATH)),
+        Stage("insights", _insights, ("clean", "process", "day"), (HISTORY_DIR / DAILY_HISTORY_FILE.format(day=day),)),
+        Stage("themes", _themes, ("clean", "process", "day"), (HISTORY_DIR / THEMES_HISTORY_FILE.format(day=day),)),
+        Stage("charts", _charts, ("insights", "themes"), (CHARTS_DATA_PATH,)),
+        Stage("digest", _digest, ("insights",), (DAILY_DIGEST_PATH,)),
+        Stage("edition", _edition, ("charts", "digest"), (EDITION_DIR / "index.html",)),
+        Stage("suggested", _suggested, ("index",), (SUGGESTED_ANSWERS_PATH,), after=("charts", "digest")),
+    ]
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    names = [s.name for s in build_stages(today)]  # the names don't depend on the day
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resume", action="store_true", help="skip stages whose checkpointed inputs are unchanged")
+    parser.add_argument("--from-stage", choices=names, help="rerun this stage and everything downstream")
+    parser.add_argument("--only", type=lambda v: v.split(","), help=f"comma-separated stages to run ({', '.join(names)})")
+    parser.add_argument("--day", default=today, help="run date (UTC)")
+    args = parser.parse_args(argv)
+    if args.from_stage and args.only:
+        parser.error("--from-stage and --only are mutually exclusive")
+    return args
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(argv)
+    ensure_dirs()
+    load_env()
+    _configure_logging()
+    logger.info("═══ Pipeline starting ═══")
+
+    try:
+        completed = run_stages(
+            build_stages(args.day), {"day": args.day}, resume=args.resume, from_stage=args.from_stage, only=args.only,
+        )
     except Exception:
         logger.exception("Pipeline failed")
         sys.exit(1)
 
+    if completed:
+        logger.info("═══ Pipeline completed successfully ═══")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,90 @@
+"""Cold-start guard — fail if the first-paint import path pulls in heavy modules or blows its budget.
+
+Imports the modules app.py and run_pipeline.py load before any work starts, in
+a fresh ``python -X importtime`` interpreter, and checks that none of the heavy
+dependencies (LangGraph, LangChain, OpenAI, FAISS, numpy, pandas, plotly) were
+imported eagerly and that their summed cumulative import time stays within the
+budget. Modules already imported by Streamlit itself are excluded, so only this
+project's imports are judged.
+
+    python scripts/check_import_time.py [--budget-ms 300] [--verbose]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+TARGETS = ["config.settings", "agents.artifacts", "agents.warmup", "ui.chat", "ui.charts", "ui.sidebar", "run_pipeline"]
+HEAVY = ["langgraph", "langchain_core", "langchain_openai", "openai", "faiss", "numpy", "pandas", "plotly", "tiktoken"]
+
+_MARKER = "-- targets --"
+
+_PROBE = """
+import importlib, json, sys
+try:
+    import streamlit  # baseline: whatever Streamlit loads is not ours to judge
+except ImportError:
+    pass
+before = set(sys.modules)
+print({marker!r}, file=sys.stderr, flush=True)
+for name in {targets!r}:
+    importlib.import_module(name)
+print(json.dumps(sorted(set(sys.modules) - before)))
+"""
+
+
+def _parse_importtime(stderr: str) -> list[tuple[int, int, str]]:
+    """(depth, cumulative µs, module) for every ``-X importtime`` line after the baseline marker."""
+    rows = []
+    lines = stderr.splitlines()
+    for line in lines[lines.index(_MARKER) + 1:]:
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((depth, int(cumulative), name.strip()))
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=300.0,
+                        help="max cumulative import time of the targets, as measured by -X importtime")
+    parser.add_argument("--verbose", action="store_true", help="print the slowest imports")
+    args = parser.parse_args()
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(marker=_MARKER, targets=TARGETS)],
+        cwd=PROJECT_ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        print(proc.stderr, file=sys.stderr)
+        return proc.returncode
+    loaded = json.loads(proc.stdout.strip().splitlines()[-1])
+    rows = _parse_importtime(proc.stderr)
+
+    # Top-level entries are the target packages/modules themselves; each one's
+    # cumulative time already includes everything it imported first.
+    total_ms = sum(cumulative for depth, cumulative, _ in rows if depth == 0) / 1000
+    heavy = sorted({m.split(".")[0] for m in loaded} & set(HEAVY))
+    print(f"first-paint imports: {total_ms:.0f} ms cumulative (budget {args.budget_ms:.0f} ms)")
+    if args.verbose:
+        for _, cumulative_us, name in sorted(rows, key=lambda r: -r[1])[:15]:
+            print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+    failed = False
+    if heavy:
+        print(f"FAIL: heavy modules imported eagerly: {', '.join(heavy)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print("FAIL: import budget exceeded")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""API load test — requests/s for /search as worker processes scale from 1 to the core count.
+
+For each worker count, starts ``python -m api.server`` on a scratch port, waits
+for /healthz, then hammers /search from a thread pool for a fixed duration.
+Keyword queries take the BM25 fast path and cached queries skip the embedding
+call, so the numbers reflect serving CPU rather than upstream latency.
+
+    python scripts/load_test_api.py [--workers 1,2,4] [--concurrency 32] [--duration 10]
+    python scripts/load_test_api.py --url http://127.0.0.1:8600   # an already running server
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import quote
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_QUERIES = ["rust", "llm", "postgres", "linux kernel", "startup", "open source", "gpu", "security"]
+
+
+def _wait_ready(url: str, timeout_s: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"{url}/healthz", timeout=2):
+                return
+        except OSError:  # refused, reset or timed out while the workers warm up
+            time.sleep(0.2)
+    raise RuntimeError(f"server at {url} did not become ready")
+
+
+def run_load(url: str, queries: list[str], concurrency: int, duration_s: float) -> dict:
+    """Closed-loop load: each thread issues requests back to back until the deadline."""
+    latencies: list[float] = []
+    errors = 0
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration_s
+
+    def worker(i: int) -> None:
+        nonlocal errors
+        n = i
+        while time.monotonic() < deadline:
+            q = queries[n % len(queries)]
+            n += 1
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(f"{url}/search?q={quote(q)}", timeout=30) as resp:
+                    resp.read()
+                ok = True
+            except OSError:  # URLError, resets and timeouts all count as errors
+                ok = False
+            with lock:
+                if ok:
+                    latencies.append((time.perf_counter() - start) * 1000)
+                else:
+                    errors += 1
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, range(concurrency)))
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / duration_s,
+        "p50_ms": statistics.median(latencies) if latencies else 0.0,
+        "p95_ms": latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="test an already running server instead of spawning one")
+    parser.add_argument("--workers", default=None, help="comma-separated worker counts (default: 1,2,4..cores)")
+    parser.add_argument("--concurrency", type=int, default=32, help="client threads")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per measurement")
+    parser.add_argument("--port", type=int, default=8690)
+    parser.add_argument("--queries", nargs="*", default=DEFAULT_QUERIES)
+    args = parser.parse_args()
+
+    if args.url:
+        _wait_ready(args.url)
+        r = run_load(args.url, args.queries, args.concurrency, args.duration)
+        print(f"{r['rps']:8.1f} req/s  p50={r['p50_ms']:.1f} ms  p95={r['p95_ms']:.1f} ms  errors={r['errors']}")
+        return 0
+
+    cores = os.cpu_count() or 1
+    if args.workers:
+        counts = [int(w) for w in args.workers.split(",")]
+    else:
+        counts = sorted({1, cores} | {2 ** i for i in range(1, cores.bit_length()) if 2 ** i <= cores})
+
+    url = f"http://127.0.0.1:{args.port}"
+    baseline = None
+    print(f"{'workers':>7}  {'req/s':>8}  {'speedup':>7}  {'p50 ms':>7}  {'p95 ms':>7}  errors")
+    for count in counts:
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "api.server", "--port", str(args.port), "--workers", str(count)],
+            cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            _wait_ready(url)
+            run_load(url, args.queries, args.concurrency, min(2.0, args.duration))  # warm caches/mmaps
+            r = run_load(url, args.queries, args.concurrency, args.duration)
+        finally:
+            proc.terminate()
+            proc.wait(timeout=30)
+        baseline = baseline or r["rps"] or 1.0
+        print(
+            f"{count:>7}  {r['rps']:>8.1f}  {r['rps'] / baseline:>6.2f}x  "
+            f"{r['p50_ms']:>7.1f}  {r['p95_ms']:>7.1f}  {r['errors']}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
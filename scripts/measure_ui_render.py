@@ -0,0 +1,62 @@
+"""UI render benchmark — websocket deltas and wall time per rerun of the aside column and sidebar.
+
+Runs ui.charts.render_charts() and ui.sidebar.render_sidebar() headlessly via
+Streamlit's AppTest against the current pipeline artifacts and reports the
+number of elements (one delta each) and the render time per rerun.
+
+    python scripts/measure_ui_render.py [--runs 20]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def _script():
+    from ui.charts import render_charts
+    from ui.sidebar import render_sidebar
+
+    render_charts()
+    render_sidebar()
+
+
+def _count_elements(node) -> int:
+    children = getattr(node, "children", None)
+    if not children:
+        return 1
+    # A block container is itself one delta, plus everything inside it
+    return 1 + sum(_count_elements(child) for child in children.values())
+
+
+def main() -> int:
+    from streamlit.testing.v1 import AppTest
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    app = AppTest.from_function(_script, default_timeout=30)
+    app.run()  # first run pays for imports and artifact parsing
+    if app.exception:
+        print(app.exception[0].message, file=sys.stderr)
+        return 1
+
+    timings = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        app.run()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    main_deltas = _count_elements(app.main) - 1
+    sidebar_deltas = _count_elements(app.sidebar) - 1
+    print(f"deltas per rerun: main={main_deltas} sidebar={sidebar_deltas}")
+    print(f"rerun time: median={statistics.median(timings):.1f} ms  max={max(timings):.1f} ms  (n={args.runs})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+import http.client
+import json
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from api.server import Handler
+
+
+@pytest.fixture(scope="module")
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd.server_address
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def post(server, body: bytes, headers: dict | None = None) -> tuple[int, dict]:
+    conn = http.client.HTTPConnection(*server, timeout=5)
+    try:
+        conn.request("POST", "/answer", body=body, headers=headers or {"Content-Type": "application/json"})
+        resp = conn.getresponse()
+        return resp.status, json.loads(resp.read())
+    finally:
+        conn.close()
+
+
+@pytest.mark.parametrize("body, error", [
+    (b"\xff\xfe\xfa", "body must be JSON"),            # not valid UTF-8 → UnicodeDecodeError
+    (b"{query: 1", "body must be JSON"),
+    (b'["a list"]', "body must be a JSON object"),
+    (b"{}", "missing query"),
+    (json.dumps({"query": "q", "chat_history": [{"role": "system", "content": "x"}]}).encode(),
+     "chat_history must be a list of {role: user|assistant, content: str}"),
+    (json.dumps({"query": "q", "chat_history": "not a list"}).encode(),
+     "chat_history must be a list of {role: user|assistant, content: str}"),
+])
+def test_answer_rejects_invalid_bodies(server, body, error):
+    assert post(server, body) == (400, {"error": error})
+
+
+def test_answer_rejects_bad_content_length(server):
+    conn = http.client.HTTPConnection(*server, timeout=5)
+    try:
+        conn.putrequest("POST", "/answer")
+        conn.putheader("Content-Length", "-5")
+        conn.endheaders()
+        resp = conn.getresponse()
+        assert (resp.status, json.loads(resp.read())) == (400, {"error": "invalid Content-Length"})
+    finally:
+        conn.close()
+
+
+def test_answer_rejects_oversized_body(server, monkeypatch):
+    monkeypatch.setattr("api.server.API_MAX_BODY_BYTES", 8)
+    assert post(server, json.dumps({"query": "a longer question"}).encode()) == (413, {"error": "request body too large"})
+
+
+def test_answer_without_index_is_503(server, monkeypatch):
+    monkeypatch.setattr("agents.retrieval.index_ready", lambda: False)
+    status, body = post(server, json.dumps({"query": "what's new in rust?"}).encode())
+    assert status == 503 and "index not built" in body["error"]
@@ -0,0 +1,72 @@
+import numpy as np
+
+from pipeline.clusters import _save_themes, discover_themes, kmeans, merge_close
+
+DIM = 32
+
+
+def _blob(rng, center: int, n: int) -> np.ndarray:
+    base = np.zeros(DIM, dtype=np.float32)
+    base[center] = 1.0
+    return base + 0.02 * rng.standard_normal((n, DIM)).astype(np.float32)
+
+
+def _day(rng, themes: dict[int, tuple[str, int]]):
+    posts, rows = [], []
+    for center, (word, n) in themes.items():
+        rows.append(_blob(rng, center, n))
+        posts += [{"title": f"{word} story {i}", "hn_url": f"{word}/{i}"} for i in range(n)]
+    return posts, np.vstack(rows)
+
+
+def test_kmeans_recovers_separated_blobs():
+    rng = np.random.default_rng(0)
+    x = np.vstack([_blob(rng, c, 20) for c in (0, 1, 2)])
+    x /= np.linalg.norm(x, axis=1, keepdims=True)
+    assign, centroids = merge_close(x, *kmeans(x, 6), threshold=0.9)
+    assert len(centroids) == 3
+    for start in (0, 20, 40):
+        assert len(set(assign[start:start + 20].tolist())) == 1
+    assert np.allclose(np.linalg.norm(centroids, axis=1), 1.0)
+
+
+def test_themes_flag_emerging_and_fading(tmp_path):
+    rng = np.random.default_rng(1)
+    posts, emb = _day(rng, {0: ("rust", 20), 1: ("postgres", 20)})
+    first = discover_themes(posts, emb, "2026-10-01", tmp_path)
+    assert {c["status"] for c in first["clusters"]} == {"steady"}  # first run: nothing to compare
+    assert first["fading"] == []
+
+    posts, emb = _day(rng, {0: ("rust", 20), 2: ("gpu", 20)})
+    second = discover_themes(posts, emb, "2026-10-02", tmp_path)
+    status = {c["label"].split(" / ")[0]: c["status"] for c in second["clusters"]}
+    assert status == {"rust": "steady", "gpu": "emerging"}
+    assert [f["label"].split(" / ")[0] for f in second["fading"]] == ["postgres"]
+
+
+def test_themes_growing_share(tmp_path):
+    rng = np.random.default_rng(2)
+    discover_themes(*_day(rng, {0: ("rust", 6), 1: ("postgres", 30)}), "2026-10-01", tmp_path)
+    themes = discover_themes(*_day(rng, {0: ("rust", 30), 1: ("postgres", 10)}), "2026-10-02", tmp_path)
+    status = {c["label"].split(" / ")[0]: c["status"] for c in themes["clusters"]}
+    assert status == {"rust": "growing", "postgres": "steady"}
+
+
+def test_too_few_stories_yield_no_themes(tmp_path):
+    rng = np.random.default_rng(3)
+    assert discover_themes(*_day(rng, {0: ("rust", 3)}), "2026-10-01", tmp_path) == {"clusters": [], "fading": []}
+
+
+def test_noise_centroids_neither_match_nor_keep_themes_alive(tmp_path):
+    rng = np.random.default_rng(4)
+    # Yesterday: "postgres" was a theme; the centroid near axis 2 was unlabeled noise
+    prev = np.zeros((2, DIM), dtype=np.float32)
+    prev[0, 1] = prev[1, 2] = 1.0
+    _save_themes("2026-10-01", prev, ["postgres / sql", ""], np.array([20, 2]), tmp_path)
+
+    # Today: a real theme where yesterday's noise was, and only noise where postgres was
+    posts, emb = _day(rng, {2: ("gpu", 20), 1: ("postgres", 2)})
+    themes = discover_themes(posts, emb, "2026-10-02", tmp_path)
+    assert [(c["label"].split(" / ")[0], c["status"]) for c in themes["clusters"]] == [("gpu", "emerging")]
+    assert "previous_label" not in themes["clusters"][0]
+    assert [f["label"] for f in themes["fading"]] == ["postgres / sql"]
@@ -0,0 +1,34 @@
+import numpy as np
+
+from agents.context import format_story, mmr_order, pack_context
+
+
+def test_mmr_prefers_relevant_then_diverse():
+    embeddings = np.array([[1.0, 0.0], [0.99, 0.01], [0.0, 1.0]], dtype=np.float32)
+    relevance = np.array([1.0, 0.95, 0.6], dtype=np.float32)
+    assert mmr_order(embeddings, relevance, k=3, lam=0.5) == [0, 2, 1]
+    assert mmr_order(embeddings, relevance, k=3, lam=1.0) == [0, 1, 2]
+
+
+def test_mmr_k_larger_than_candidates():
+    embeddings = np.eye(2, dtype=np.float32)
+    assert sorted(mmr_order(embeddings, np.ones(2, dtype=np.float32), k=5)) == [0, 1]
+
+
+def _post(i: int, summary: str = "A short summary.") -> dict:
+    return {"doc_index": i, "title": f"Story {i}", "summary": summary, "score": 10, "num_comments": 1, "topics": []}
+
+
+def test_pack_context_keeps_order_and_budget(monkeypatch):
+    monkeypatch.setattr("agents.context.CONTEXT_TOKEN_BUDGET", 200)
+    posts = [_post(0), _post(1, "word " * 500), _post(2)]
+    packed = pack_context({"retrieved_posts": posts, "retrieval_plan": "reuse"})
+
+    assert [p["doc_index"] for p in packed["retrieved_posts"]] == [0, 1]
+    assert packed["context_tokens"] <= 200
+    assert len(packed["retrieved_posts"][1]["summary"]) < len(posts[1]["summary"])  # truncated to fit
+    assert posts[1]["summary"] == "word " * 500  # input left untouched
+
+
+def test_format_story_numbering():
+    assert format_story(3, _post(7)).startswith("[3] ")
@@ -0,0 +1,194 @@
+import threading
+import time
+
+import pytest
+
+from pipeline.dag import PipelineAborted, Stage, descendants, load_checkpoint, run_stages
+
+PARAMS = {"day": "2026-10-19"}
+
+
+class Recorder:
+    """Stage functions that log their calls and can be told to fail."""
+
+    def __init__(self):
+        self.calls: list[str] = []
+        self.fail: set[str] = set()
+        self.outputs: dict[str, object] = {}
+
+    def stage(self, name: str, fn, inputs=(), files=()):
+        def run(*args):
+            self.calls.append(name)
+            if name in self.fail:
+                raise RuntimeError(f"{name} failed")
+            return self.outputs.get(name, fn(*args))
+        return Stage(name, run, tuple(inputs), tuple(files))
+
+
+@pytest.fixture
+def rec():
+    return Recorder()
+
+
+def pipeline(rec, files=()):
+    return [
+        rec.stage("scrape", lambda day: [3, 1, 2], ["day"]),
+        rec.stage("clean", sorted, ["scrape"]),
+        rec.stage("insights", sum, ["clean"]),
+        rec.stage("charts", lambda total: {"total": total}, ["insights"], files),
+        rec.stage("digest", lambda total: f"{total} points", ["insights"]),
+        rec.stage("edition", lambda charts, digest: f"{charts['total']} / {digest}", ["charts", "digest"]),
+    ]
+
+
+def test_full_run_checkpoints_every_stage(rec, tmp_path):
+    assert run_stages(pipeline(rec), PARAMS, checkpoint_dir=tmp_path)
+    assert rec.calls[:3] == ["scrape", "clean", "insights"]
+    assert set(rec.calls[3:5]) == {"charts", "digest"} and rec.calls[5] == "edition"
+    assert load_checkpoint("edition", tmp_path) == "6 / 6 points"
+
+
+def test_resume_after_late_failure_reruns_only_the_rest(rec, tmp_path):
+    rec.fail = {"digest"}
+    with pytest.raises(RuntimeError, match="digest failed"):
+        run_stages(pipeline(rec), PARAMS, checkpoint_dir=tmp_path)
+
+    rec.calls.clear()
+    rec.fail = set()
+    assert run_stages(pipeline(rec), PARAMS, resume=True, checkpoint_dir=tmp_path)
+    assert rec.calls == ["digest", "edition"]
+
+
+def test_resume_with_nothing_changed_runs_nothing(rec, tmp_path):
+    run_stages(pipeline(rec), PARAMS, checkpoint_dir=tmp_path)
+    rec.calls.clear()
+    assert run_stages(pipeline(rec), PARAMS, resume=True, checkpoint_dir=tmp_path)
+    assert rec.calls == []
+
+
+def test_new_day_rescrapes_and_reruns_on_new_data(rec, tmp_path):
+    run_stages(pipeline(rec), PARAMS, checkpoint_dir=tmp_path)
+    rec.calls.clear()
+    rec.outputs["scrape"] = [5, 4]
+    run_stages(pipeline(rec), {"day": "2026-10-20"}, resume=True, checkpoint_dir=tmp_path)
+    assert sorted(rec.calls) == sorted(["scrape", "clean", "insights", "charts", "digest", "edition"])
+
+
+def test_unchanged_output_does_not_invalidate_downstream(rec, tmp_path):
+    run_stages(pipeline(rec), PARAMS, checkpoint_dir=tmp_path)
+    rec.calls.clear()
+    run_stages(pipeline(rec), PARAMS, resume=True, from_stage="clean", checkpoint_dir=tmp_path)
+    assert rec.calls == ["clean"]  # same sorted list → same digest → insights onward reused
+
+
+def test_changed_output_reruns_downstream(rec, tmp_path):
+    run_stages(pipeline(rec), PARAMS, checkpoint_dir=tmp_path)
+    rec.calls.clear()
+    rec.outputs["insights"] = 100
+    run_stages(pipeline(rec), PARAMS, resume=True, from_stage="insights", checkpoint_dir=tmp_path)
+    assert sorted(rec.calls) == ["charts", "digest", "edition", "insights"]
+    assert load_checkpoint("edition", tmp_path) == "100 / 100 points"
+
+
+def test_from_stage_without_resume_reruns_all_descendants(rec, tmp_path):
+    run_stages(pipeline(rec), PARAMS, checkpoint_dir=tmp_path)
+    rec.calls.clear()
+    run_stages(pipeline(rec), PARAMS, from_stage="charts", checkpoint_dir=tmp_path)
+    assert rec.calls == ["charts", "edition"]
+
+
+def test_only_runs_named_stages_from_checkpoints(rec, tmp_path):
+    run_stages(pipeline(rec), PARAMS, checkpoint_dir=tmp_path)
+    rec.calls.clear()
+    run_stages(pipeline(rec), PARAMS, only=["digest"], resume=True, checkpoint_dir=tmp_path)
+    assert rec.calls == ["digest"]  # named stages always run, even with --resume
+
+
+def test_only_without_upstream_checkpoint_fails(rec, tmp_path):
+    with pytest.raises(RuntimeError, match="No checkpoint for stage 'charts'"):
+        run_stages(pipeline(rec), PARAMS, only=["edition"], checkpoint_dir=tmp_path)
+    assert rec.calls == []
+
+
+def test_missing_output_file_forces_rerun(rec, tmp_path):
+    output = tmp_path / "charts.json"
+    output.write_text("{}")
+    run_stages(pipeline(rec, files=[output]), PARAMS, checkpoint_dir=tmp_path / "ckpt")
+    output.unlink()
+    rec.calls.clear()
+    run_stages(pipeline(rec, files=[output]), PARAMS, resume=True, checkpoint_dir=tmp_path / "ckpt")
+    assert rec.calls == ["charts"]
+
+
+def test_abort_stops_downstream(tmp_path):
+    def scrape(day):
+        raise PipelineAborted("no stories")
+
+    ran = []
+    stages = [Stage("scrape", scrape, ("day",)), Stage("clean", lambda raw: ran.append(raw), ("scrape",))]
+    assert run_stages(stages, PARAMS, checkpoint_dir=tmp_path) is False
+    assert ran == []
+
+
+def test_independent_stages_run_concurrently(tmp_path):
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def slow(_):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.1)
+        with lock:
+            running[0] -= 1
+
+    stages = [Stage("root", lambda day: day, ("day",))] + [Stage(f"leaf{i}", slow, ("root",)) for i in range(3)]
+    run_stages(stages, PARAMS, checkpoint_dir=tmp_path, max_parallel=3)
+    assert peak[0] == 3
+
+
+def test_invalid_graphs_are_rejected(tmp_path):
+    stages = [Stage("a", lambda b: b, ("b",)), Stage("b", lambda day: day, ("day",))]
+    with pytest.raises(ValueError, match="unknown or later"):
+        run_stages(stages, PARAMS, checkpoint_dir=tmp_path)
+    with pytest.raises(ValueError, match="Unknown stage"):
+        run_stages(stages[1:], PARAMS, only=["nope"], checkpoint_dir=tmp_path)
+
+
+def test_descendants():
+    stages = [Stage("a", None, ("day",)), Stage("b", None, ("a",)), Stage("c", None, ("day",)), Stage("d", None, ("b", "c"))]
+    assert descendants(stages, ["b"]) == {"b", "d"}
+
+
+def test_after_orders_and_keys_without_passing_values(tmp_path):
+    seen = []
+    stages = [
+        Stage("scrape", lambda: seen.append("scrape") or [1], after=("day",)),
+        Stage("charts", lambda raw: seen.append("charts") or sum(raw), ("scrape",)),
+        Stage("suggested", lambda: seen.append("suggested"), after=("charts",)),
+    ]
+    run_stages(stages, PARAMS, checkpoint_dir=tmp_path)
+    assert seen == ["scrape", "charts", "suggested"]
+    seen.clear()
+    run_stages(stages, PARAMS, resume=True, checkpoint_dir=tmp_path)
+    assert seen == []
+    run_stages(stages, {"day": "2026-10-20"}, resume=True, checkpoint_dir=tmp_path)
+    assert seen == ["scrape"]  # new day reruns scrape; same output keeps the rest
+    assert descendants(stages, ["charts"]) == {"charts", "suggested"}
+
+
+def test_run_pipeline_stages_form_a_valid_dag():
+    from config.settings import HISTORY_DIR
+    from run_pipeline import _parse_args, build_stages
+
+    stages = build_stages("2026-10-19")
+    seen = {"day"}
+    for stage in stages:
+        assert set(stage.depends_on) <= seen, stage.name
+        seen.add(stage.name)
+    assert descendants(stages, ["insights"]) == {"insights", "charts", "digest", "edition", "suggested"}
+    files = {stage.name: stage.files for stage in stages}
+    assert files["insights"] == (HISTORY_DIR / "daily_2026-10-19.npz",)
+    assert files["themes"] == (HISTORY_DIR / "themes_2026-10-19.npz",)
+
+    args = _parse_args(["--resume", "--only", "charts,digest"])
+    assert args.resume and args.only == ["charts", "digest"] and args.from_stage is None
@@ -0,0 +1,121 @@
+import random
+from collections import Counter, defaultdict
+from urllib.parse import urlparse
+
+import numpy as np
+import pytest
+
+from config.settings import BREAKTHROUGH_SCORE_THRESHOLD
+from pipeline.insights import (
+    _top_k,
+    breakthroughs,
+    build_columns,
+    domain_leaderboard,
+    hot_discussions,
+    story_type_breakdown,
+    top_stories,
+    trending_topics,
+)
+
+# ── Reference: the per-post list implementation the columnar pass replaced ──
+
+
+def ref_trending(posts, topics):
+    topic_scores = defaultdict(list)
+    for post, post_topics in zip(posts, topics):
+        for t in post_topics:
+            topic_scores[t].append(post["score"])
+    return {
+        topic: {"count": len(scores), "avg_score": round(sum(scores) / len(scores), 1)}
+        for topic, scores in sorted(topic_scores.items(), key=lambda x: -len(x[1]))
+    }
+
+
+def ref_breakthroughs(posts):
+    flagged = [p for p in posts if p["score"] >= BREAKTHROUGH_SCORE_THRESHOLD]
+    return [p["hn_url"] for p in sorted(flagged, key=lambda p: -p["score"])]
+
+
+def ref_top(posts, k):
+    return [p["hn_url"] for p in sorted(posts, key=lambda p: -p["score"])[:k]]
+
+
+def ref_hot(posts):
+    candidates = [p for p in posts if p.get("num_comments", 0) >= 20 and p.get("score", 0) > 0]
+    candidates.sort(key=lambda p: p["num_comments"] / max(p["score"], 1), reverse=True)
+    return [p["hn_url"] for p in candidates[:5]]
+
+
+def ref_domains(posts):
+    domains = Counter()
+    for p in posts:
+        if p.get("url"):
+            host = urlparse(p["url"]).netloc
+            host = host[4:] if host.startswith("www.") else host
+            if host:
+                domains[host] += 1
+    return [{"domain": d, "count": c} for d, c in domains.most_common(10)]
+
+
+def ref_types(posts):
+    types = {"Show HN": 0, "Ask HN": 0, "Launch HN": 0, "Stories": 0}
+    for p in posts:
+        title = p["title"]
+        key = next((t for t in ("Show HN", "Ask HN", "Launch HN") if title.startswith(t)), "Stories")
+        types[key] += 1
+    return {k: v for k, v in types.items() if v}
+
+
+def make_day(n: int, seed: int):
+    """Small score/comment ranges so the rankings are full of ties."""
+    rng = random.Random(seed)
+    prefixes = ["", "", "", "Show HN: ", "Ask HN: ", "Launch HN: "]
+    hosts = ["github.com", "www.github.com", "nytimes.com", "arxiv.org", "blog.rust-lang.org"]
+    topic_pool = ["AI/ML", "Security", "Rust", "Databases", "Startups", "General"]
+    posts, topics = [], []
+    for i in range(n):
+        posts.append({
+            "title": f"{rng.choice(prefixes)}Story {i}",
+            "score": rng.choice([0, 5, 50, 120, BREAKTHROUGH_SCORE_THRESHOLD, 450, 450]),
+            "num_comments": rng.choice([0, 10, 20, 40, 100]),
+            "url": rng.choice(["", f"https://{rng.choice(hosts)}/p/{i}"]),
+            "hn_url": f"https://news.ycombinator.com/item?id={i}",
+        })
+        topics.append(rng.sample(topic_pool, rng.randint(0, 3)))
+    return posts, topics
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_columnar_insights_match_reference(seed):
+    posts, topics = make_day(400, seed)
+    summaries = [f"summary {i}" for i in range(len(posts))]
+    cols = build_columns(posts, topics)
+    velocity = np.zeros(len(posts))
+
+    trending = trending_topics(cols, velocity)
+    assert {t: {k: v[k] for k in ("count", "avg_score")} for t, v in trending.items()} == ref_trending(posts, topics)
+    assert list(trending) == list(ref_trending(posts, topics))
+
+    total, flagged = breakthroughs(cols, velocity, posts, summaries, topics, k=len(posts))
+    assert total == len(ref_breakthroughs(posts))
+    assert [b["hn_url"] for b in flagged] == ref_breakthroughs(posts)
+
+    assert [s["hn_url"] for s in top_stories(cols, posts, summaries, topics, k=10)] == ref_top(posts, 10)
+    assert [d["hn_url"] for d in hot_discussions(cols, posts)] == ref_hot(posts)
+    assert domain_leaderboard(cols) == ref_domains(posts)
+    assert story_type_breakdown(cols) == ref_types(posts)
+
+
+def test_top_k_breaks_ties_by_position():
+    values = np.array([3, 7, 7, 1, 7, 3])
+    assert _top_k(values, 3).tolist() == [1, 2, 4]
+    assert _top_k(values, 4).tolist() == [1, 2, 4, 0]
+    assert _top_k(values, 10).tolist() == [1, 2, 4, 0, 5, 3]
+    assert _top_k(values, 0).tolist() == []
+
+
+def test_build_columns_handles_missing_fields():
+    cols = build_columns([{"title": "x", "hn_url": "u"}], [])
+    assert cols["score"].tolist() == [0]
+    assert cols["host_id"].tolist() == [-1]
+    assert len(cols["topic_posts"]) == 0
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from agents import retrieval
+from pipeline.bm25 import bm25_search, build_bm25_index, load_bm25_index, tokenize
+
+DOCS = [
+    "Rust 1.80 released with new borrow checker",
+    "Postgres 17 performance improvements",
+    "Why we rewrote our Python service in Rust",
+    "Show HN: a tiny Postgres extension for vectors",
+    "Linux kernel drops support for old GPUs",
+]
+
+
+@pytest.fixture(scope="module")
+def bm25(tmp_path_factory):
+    path = tmp_path_factory.mktemp("bm25") / "bm25.npz"
+    np.savez(path, **build_bm25_index(DOCS))
+    return load_bm25_index(path)
+
+
+def test_tokenize_keeps_versions_and_symbols():
+    assert "1.80" in tokenize("Rust 1.80 released")
+    assert "c++" in tokenize("Modern C++ tips")
+
+
+def test_bm25_ranks_documents_containing_all_terms_first(bm25):
+    hits = bm25_search(bm25, "postgres vectors", top_k=5)
+    assert [doc for doc, _ in hits][:2] == [3, 1]
+    assert all(score > 0 for _, score in hits)
+
+
+def test_bm25_unknown_terms_return_nothing(bm25):
+    assert bm25_search(bm25, "zzz qqq", top_k=5) == []
+
+
+def test_bm25_respects_top_k(bm25):
+    assert len(bm25_search(bm25, "rust postgres", top_k=2)) == 2
+
+
+def test_rrf_rewards_agreement_between_rankings():
+    vector = [(1, 0.9), (2, 0.8), (3, 0.7)]
+    lexical = [(3, 12.0), (1, 9.0), (4, 2.0)]
+    fused = retrieval._reciprocal_rank_fusion(vector, lexical)
+    assert [doc for doc, _ in fused] == [1, 3, 2, 4]
+    scores = [score for _, score in fused]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_rrf_single_ranking_keeps_order():
+    ranking = [(7, 0.5), (2, 0.4), (9, 0.1)]
+    assert [doc for doc, _ in retrieval._reciprocal_rank_fusion(ranking)] == [7, 2, 9]
+
+
+def test_keyword_query_detection(bm25, monkeypatch):
+    monkeypatch.setattr(retrieval, "_bm25", bm25)
+    assert retrieval._is_keyword_query("postgres")
+    assert retrieval._is_keyword_query("rust kernel")
+    assert not retrieval._is_keyword_query("what is new in rust?")
+    assert not retrieval._is_keyword_query("postgres quantum")  # unknown term needs embeddings
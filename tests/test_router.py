@@ -0,0 +1,69 @@
+import pytest
+
+from agents import router
+from agents.router import OPEN_INTENT, classify_intent, route
+
+CHARTS = {
+    "trending_topics": {"AI/ML": {"count": 12, "avg_score": 210.5}, "Security": {"count": 4, "avg_score": 80.0}},
+    "hot_discussions": [{"title": "Tabs vs spaces", "hn_url": "u", "score": 30, "num_comments": 300, "ratio": 10.0}],
+    "domain_leaderboard": [{"domain": "github.com", "count": 9}],
+    "story_type_breakdown": {"Show HN": 3, "Stories": 9},
+}
+DIGEST = {
+    "top_posts": [{"title": "Big launch", "hn_url": "u", "score": 900, "num_comments": 120, "summary": "It launched."}],
+    "breakthroughs": [],
+}
+
+
+@pytest.mark.parametrize("query, intent", [
+    ("What's trending?", "trending"),
+    ("trending topics right now", "trending"),
+    ("top stories today", "top_stories"),
+    ("most upvoted headlines", "top_stories"),
+    ("any breakthroughs?", "breakthroughs"),
+    ("most debated discussions", "hot_discussions"),
+    ("which sites are popular", "domains"),
+    ("story types", "story_types"),
+])
+def test_aggregate_questions_route_to_fast_paths(query, intent):
+    assert classify_intent(query) == intent
+
+
+@pytest.mark.parametrize("query", [
+    "",
+    "What is new in Rust?",
+    "top rust stories",                      # a subject word needs retrieval
+    "trending topics in security and privacy this week",
+    "explain the postgres release",
+])
+def test_open_questions_need_retrieval(query):
+    assert classify_intent(query) == OPEN_INTENT
+
+
+@pytest.fixture
+def artifacts(monkeypatch):
+    files = {router.CHARTS_DATA_PATH: CHARTS, router.DAILY_DIGEST_PATH: DIGEST}
+    monkeypatch.setattr(router, "load_artifact", lambda path: files.get(path))
+    return files
+
+
+def test_route_answers_from_artifacts(artifacts):
+    state = route({"query": "what's trending"})
+    assert state["intent"] == "trending"
+    assert "**AI/ML** — 12 stories" in state["response"]
+
+
+def test_route_reports_empty_breakthroughs(artifacts):
+    assert "No stories crossed" in route({"query": "breakthroughs"})["response"]
+
+
+def test_route_falls_back_when_artifact_missing(artifacts):
+    artifacts[router.CHARTS_DATA_PATH] = None
+    state = route({"query": "which domains"})
+    assert state["intent"] == OPEN_INTENT
+    assert "response" not in state
+
+
+def test_follow_ups_are_never_fast_pathed(artifacts):
+    state = route({"query": "what's trending", "chat_history": [{"role": "user", "content": "hi"}]})
+    assert state["intent"] == OPEN_INTENT
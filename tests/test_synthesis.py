@@ -0,0 +1,68 @@
+import pytest
+
+from agents import synthesis
+from agents.synthesis import SYSTEM_PROMPT, stable_prefix, synthesize_and_respond
+from agents.tokens import count_tokens
+from config.settings import BRIEFING_TOKEN_BUDGET, PROMPT_CACHE_MIN_TOKENS
+
+SUMMARY = (
+    "The team behind the project published a detailed write-up of how they rebuilt the storage engine, "
+    "trading a B-tree for a log-structured design that cut write amplification by roughly a factor of four. "
+    "Commenters compared the approach with RocksDB and questioned how compaction behaves under sustained load."
+)
+
+
+def _digest(n_posts: int) -> dict:
+    posts = [
+        {"title": f"Story number {i} about databases", "summary": SUMMARY, "score": 900 - i,
+         "num_comments": 100 + i, "hn_url": f"https://news.ycombinator.com/item?id={i}", "topics": ["Databases"]}
+        for i in range(n_posts)
+    ]
+    return {
+        "date": "2026-10-19",
+        "total_posts": 480,
+        "trending_topics": {"AI/ML": {"count": 40}, "Databases": {"count": 12}, "Security": {"count": 9}},
+        "top_posts": posts[:10],
+        "breakthroughs": posts[:3] + posts[10:],
+    }
+
+
+@pytest.fixture
+def digest(monkeypatch):
+    current = {"digest": _digest(10)}
+    monkeypatch.setattr(synthesis, "derived_artifact", lambda path, name, build: build(current["digest"]))
+    return current
+
+
+def _prefix_tokens(messages) -> int:
+    return sum(count_tokens(m.content) for m in messages)
+
+
+def test_stable_prefix_clears_the_cache_minimum(digest):
+    prefix = stable_prefix()
+    assert prefix[0].content == SYSTEM_PROMPT
+    assert PROMPT_CACHE_MIN_TOKENS <= _prefix_tokens(prefix) <= BRIEFING_TOKEN_BUDGET
+    assert [m.content for m in stable_prefix()] == [m.content for m in prefix]
+
+
+def test_briefing_is_capped_and_keeps_digest_order(digest):
+    digest["digest"] = _digest(40)
+    briefing = stable_prefix()[1].content
+    assert _prefix_tokens(stable_prefix()) <= BRIEFING_TOKEN_BUDGET
+    titles = [line.split(" (")[0] for line in briefing.splitlines() if line.startswith("- ")]
+    assert titles == [f"- Story number {i} about databases" for i in range(len(titles))]
+    assert len(set(titles)) == len(titles)  # breakthroughs already among the top posts are not repeated
+
+
+def test_prompt_starts_with_the_stable_prefix(digest, monkeypatch):
+    sent = {}
+    monkeypatch.setattr(synthesis, "get_chat_model", lambda temperature: None)
+    monkeypatch.setattr(synthesis, "request_key", lambda *args: sent.setdefault("messages", args[-1]))
+    monkeypatch.setattr(synthesis, "coalesce", lambda key, generate: "answer")
+
+    post = {"title": "Query-specific story", "summary": "s", "score": 5, "num_comments": 0, "hn_url": "u"}
+    state = synthesize_and_respond({"query": "what about rust?", "retrieved_posts": [post]})
+    assert state["response"] == "answer"
+    prefix = [(m.type, m.content) for m in stable_prefix()]
+    assert sent["messages"][:len(prefix)] == prefix
+    assert sent["messages"][-1] == ("human", "what about rust?")
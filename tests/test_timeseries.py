@@ -0,0 +1,61 @@
+import numpy as np
+
+from pipeline.insights import build_columns
+from pipeline.timeseries import (
+    count_zscores,
+    daily_aggregates,
+    load_history,
+    record_day,
+    story_velocity,
+    velocity_zscores,
+)
+
+
+def _aggregates(topic_counts: dict[str, int]) -> dict:
+    posts, topics = [], []
+    for topic, count in topic_counts.items():
+        for _ in range(count):
+            posts.append({"title": "t", "hn_url": "u", "score": 10, "url": "https://example.com/a"})
+            topics.append([topic])
+    cols = build_columns(posts, topics)
+    return daily_aggregates(cols, np.ones(len(posts)))
+
+
+def test_story_velocity_floors_age_and_defaults_unknown():
+    now = 100 * 3600.0
+    v = story_velocity(np.array([100, 100, 48]), np.array([now - 600, now - 10 * 3600, 0]), now)
+    assert v.tolist() == [100.0, 10.0, 2.0]  # 10 min floored to 1 h; unknown age counts as 24 h
+
+
+def test_record_and_load_history_roundtrip(tmp_path):
+    record_day(_aggregates({"Rust": 2, "AI/ML": 5}), "2026-10-01", tmp_path)
+    record_day(_aggregates({"AI/ML": 3}), "2026-10-02", tmp_path)
+
+    history = load_history("2026-10-03", days=7, history_dir=tmp_path)
+    assert history["days"] == ["2026-10-01", "2026-10-02"]
+    counts = dict(zip(history["topic"]["keys"], history["topic"]["count"].T.tolist()))
+    assert counts == {"Rust": [2, 0], "AI/ML": [5, 3]}
+    assert history["stories"][:, 0].tolist() == [7, 3]
+
+
+def test_load_history_excludes_the_day_itself(tmp_path):
+    record_day(_aggregates({"Rust": 1}), "2026-10-03", tmp_path)
+    assert load_history("2026-10-03", history_dir=tmp_path)["days"] == []
+
+
+def test_count_zscores_against_baseline():
+    baseline = {"keys": ["Rust", "AI/ML"], "count": np.array([[2.0, 10.0], [4.0, 10.0]])}
+    z = count_zscores(["AI/ML", "Rust", "New"], np.array([10.0, 5.0, 3.0]), baseline, min_std=1.0)
+    assert z.tolist() == [0.0, 2.0, 3.0]  # flat AI/ML uses the std floor; unseen topics have mean 0
+
+
+def test_velocity_zscores_pooled_baseline():
+    log_v = np.log1p(np.array([1.0, 3.0]))
+    stories = np.array([[2, log_v.sum(), (log_v ** 2).sum()]])
+    z = velocity_zscores(np.array([1.0, 3.0]), stories)
+    assert np.allclose(z, [-1.0, 1.0])
+
+
+def test_velocity_zscores_empty_baseline_is_zero():
+    assert velocity_zscores(np.array([1.0, 50.0]), np.zeros((3, 3))).tolist() == [0.0, 0.0]
+    assert velocity_zscores(np.array([1.0]), np.zeros((0, 3))).tolist() == [0.0]
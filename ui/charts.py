@@ -1,12 +1,11 @@
 """Streamlit chart components — NYT-styled data visualizations."""
 
-import json
 import logging
+from html import escape
 
-import pandas as pd
-import plotly.graph_objects as go
 import streamlit as st
 
+from agents.artifacts import derived_artifact, load_artifact
 from config.settings import CHARTS_DATA_PATH
 
 logger = logging.getLogger(__name__)
@@ -35,19 +34,18 @@ def _nyt_bar(fig, height=280):
     return fig
 
 
-def _load_charts_data() -> dict | None:
-    if not CHARTS_DATA_PATH.exists():
-        return None
-    try:
-        with open(CHARTS_DATA_PATH) as f:
-            return json.load(f)
-    except (json.JSONDecodeError, OSError):
-        return None
+def _build_figures(data: dict) -> dict:
+    """Plotly figures for charts_data.json, built once per published file."""
+    return {
+        "trending_topics": _trending_topics_figure(data.get("trending_topics", {})),
+        "domain_leaderboard": _domain_leaderboard_figure(data.get("domain_leaderboard", [])),
+    }
 
 
 def render_charts():
     """Render all data sections."""
-    data = _load_charts_data()
+    # Parsed data and figures are shared by every session until the pipeline republishes
+    data = load_artifact(CHARTS_DATA_PATH)
     if data is None:
         st.markdown("""
         <p class="summary-text" style="color: #999; font-style: italic;">
@@ -56,31 +54,34 @@ def render_charts():
         """, unsafe_allow_html=True)
         return
 
+    figures = derived_artifact(CHARTS_DATA_PATH, "figures", _build_figures) or {}
+
     _render_top_stories(data.get("top_stories", []))
     st.markdown('<hr class="thin-rule">', unsafe_allow_html=True)
-    _render_trending_topics(data.get("trending_topics", {}))
+    _render_trending_topics(figures.get("trending_topics"))
+    st.markdown('<hr class="thin-rule">', unsafe_allow_html=True)
+    _render_themes(data.get("themes", {}))
     st.markdown('<hr class="thin-rule">', unsafe_allow_html=True)
     _render_hot_discussions(data.get("hot_discussions", []))
     st.markdown('<hr class="thin-rule">', unsafe_allow_html=True)
-    _render_domain_leaderboard(data.get("domain_leaderboard", []))
+    _render_domain_leaderboard(figures.get("domain_leaderboard"))
     st.markdown('<hr class="thin-rule">', unsafe_allow_html=True)
     _render_story_types(data.get("story_type_breakdown", {}))
 
 
 def _render_top_stories(stories: list[dict]):
-    """Ranked list of top 5 stories."""
+    """Ranked list of top 5 stories, as one HTML fragment."""
     if not stories:
         return
 
-    st.markdown('<div class="headline-sm">Top Stories</div>', unsafe_allow_html=True)
-
+    items = []
     for i, s in enumerate(stories[:5], 1):
-        title = s["title"][:80]
-        hn_url = s.get("hn_url", "")
+        title = escape(s["title"][:80])
+        hn_url = escape(s.get("hn_url", ""), quote=True)
         score = s.get("score", 0)
         comments = s.get("num_comments", 0)
 
-        st.markdown(f"""
+        items.append(f"""
         <div style="padding: 0.35rem 0; border-bottom: 1px solid #F0F0F0; display: flex; gap: 0.6rem;">
             <span style="font-family: 'Playfair Display', Georgia, serif; font-size: 1.5rem;
                          font-weight: 300; color: #DDD; line-height: 1; min-width: 1.2rem;">{i}</span>
@@ -91,54 +92,97 @@ def _render_top_stories(stories: list[dict]):
                           text-decoration: none !important;">{title}</a>
                 <div class="meta-text" style="margin-top: 2px;">{score} pts&ensp;&middot;&ensp;{comments} comments</div>
             </div>
-        </div>
-        """, unsafe_allow_html=True)
+        </div>""")
+
+    st.markdown('<div class="headline-sm">Top Stories</div>' + "".join(items), unsafe_allow_html=True)
 
 
-def _render_trending_topics(topics: dict):
-    """Horizontal bar chart of trending topics."""
+def _trending_topics_figure(topics: dict):
+    """Horizontal bar chart of trending topics (None when there are none)."""
     if not topics:
-        return
+        return None
 
-    st.markdown('<div class="headline-sm">What\'s Trending</div>', unsafe_allow_html=True)
+    import plotly.graph_objects as go  # deferred: plotly is slow to import
 
-    df = pd.DataFrame([
-        {"Topic": topic, "Stories": info["count"]}
-        for topic, info in topics.items()
-    ]).sort_values("Stories", ascending=True)
+    rows = sorted(((topic, info["count"]) for topic, info in topics.items()), key=lambda r: r[1])
+    labels = [topic for topic, _ in rows]
+    counts = [count for _, count in rows]
 
     fig = go.Figure()
     fig.add_trace(go.Bar(
-        y=df["Topic"],
-        x=df["Stories"],
+        y=labels,
+        x=counts,
         orientation="h",
         marker_color=NYT_ACCENT,
-        text=df["Stories"],
+        text=counts,
         textposition="outside",
         textfont=dict(family="Libre Franklin, sans-serif", size=10, color=NYT_GRAY),
     ))
-    _nyt_bar(fig, height=max(180, len(df) * 32))
+    return _nyt_bar(fig, height=max(180, len(rows) * 32))
+
+
+def _render_trending_topics(fig):
+    """Pre-built trending-topics chart."""
+    if fig is None:
+        return
+
+    st.markdown('<div class="headline-sm">What\'s Trending</div>', unsafe_allow_html=True)
     st.plotly_chart(fig, use_container_width=True)
 
 
+def _render_themes(themes: dict):
+    """Embedding-clustered themes with emerging/fading status, as one HTML fragment."""
+    clusters = themes.get("clusters", [])
+    if not clusters:
+        return
+
+    # Single-line fragments: a blank line inside st.markdown HTML ends the block
+    # and the rest would be rendered as Markdown
+    items = []
+    for c in clusters[:6]:
+        status = c.get("status", "")
+        meta = f"{c['size']} stories"
+        if status in ("emerging", "growing"):
+            meta = f'<span style="color: {NYT_ACCENT};">{escape(status)}</span>&ensp;&middot;&ensp;{meta}'
+        if c.get("previous_label") and c["previous_label"] != c["label"]:
+            meta += f"&ensp;&middot;&ensp;was: {escape(c['previous_label'])}"
+        example = c["examples"][0] if c.get("examples") else None
+        link = (
+            f'<a href="{escape(example["hn_url"], quote=True)}" target="_blank" class="meta-text" '
+            f'style="text-transform: none;">{escape(example["title"][:80])}</a>'
+        ) if example else ""
+        items.append(
+            '<div style="padding: 0.3rem 0; border-bottom: 1px solid #F0F0F0;">'
+            "<div style=\"font-family: 'Libre Franklin', sans-serif; font-size: 0.8rem; "
+            f'font-weight: 600; color: #121212;">{escape(c["label"])}</div>'
+            f'<div class="meta-text" style="margin-top: 2px;">{meta}</div>'
+            f"{link}</div>"
+        )
+
+    fading = themes.get("fading", [])
+    if fading:
+        items.append(
+            '<p class="meta-text" style="margin-top: 0.4rem;">Fading: '
+            + ", ".join(f"{escape(f['label'])} (last seen {escape(f['since'])})" for f in fading[:4]) + "</p>"
+        )
+
+    st.markdown('<div class="headline-sm">Themes</div>' + "".join(items), unsafe_allow_html=True)
+
+
 def _render_hot_discussions(discussions: list[dict]):
-    """List of most debated stories."""
+    """List of most debated stories, as one HTML fragment."""
     if not discussions:
         return
 
-    st.markdown('<div class="headline-sm">Hot Discussions</div>', unsafe_allow_html=True)
-    st.markdown("""
-    <p class="meta-text" style="margin-bottom: 0.3rem;">Highest comment-to-score ratio</p>
-    """, unsafe_allow_html=True)
-
+    items = []
     for d in discussions[:5]:
-        title = d["title"][:75]
-        hn_url = d.get("hn_url", "")
+        title = escape(d["title"][:75])
+        hn_url = escape(d.get("hn_url", ""), quote=True)
         score = d.get("score", 0)
         comments = d.get("num_comments", 0)
         ratio = d.get("ratio", 0)
 
-        st.markdown(f"""
+        items.append(f"""
         <div style="padding: 0.3rem 0; border-bottom: 1px solid #F0F0F0;">
             <a href="{hn_url}" target="_blank"
                style="font-family: 'Libre Franklin', sans-serif; font-size: 0.8rem;
@@ -147,51 +191,70 @@ def _render_hot_discussions(discussions: list[dict]):
             <div class="meta-text" style="margin-top: 2px;">
                 {comments} comments&ensp;&middot;&ensp;{score} pts&ensp;&middot;&ensp;{ratio}x ratio
             </div>
-        </div>
-        """, unsafe_allow_html=True)
+        </div>""")
+
+    st.markdown(
+        '<div class="headline-sm">Hot Discussions</div>'
+        '<p class="meta-text" style="margin-bottom: 0.3rem;">Highest comment-to-score ratio</p>'
+        + "".join(items),
+        unsafe_allow_html=True,
+    )
 
 
-def _render_domain_leaderboard(domains: list[dict]):
-    """Bar chart of top linked domains."""
+def _domain_leaderboard_figure(domains: list[dict]):
+    """Bar chart of top linked domains (None when there are none)."""
     if not domains:
-        return
+        return None
 
-    st.markdown('<div class="headline-sm">Where Links Point</div>', unsafe_allow_html=True)
+    import plotly.graph_objects as go  # deferred: plotly is slow to import
 
-    df = pd.DataFrame(domains).sort_values("count", ascending=True)
+    rows = sorted(domains, key=lambda d: d["count"])
+    counts = [d["count"] for d in rows]
 
     fig = go.Figure()
     fig.add_trace(go.Bar(
-        y=df["domain"],
-        x=df["count"],
+        y=[d["domain"] for d in rows],
+        x=counts,
         orientation="h",
         marker_color=NYT_BLACK,
-        text=df["count"],
+        text=counts,
         textposition="outside",
         textfont=dict(family="Libre Franklin, sans-serif", size=10, color=NYT_GRAY),
     ))
-    _nyt_bar(fig, height=max(160, len(df) * 28))
+    return _nyt_bar(fig, height=max(160, len(rows) * 28))
+
+
+def _render_domain_leaderboard(fig):
+    """Pre-built domain-leaderboard chart."""
+    if fig is None:
+        return
+
+    st.markdown('<div class="headline-sm">Where Links Point</div>', unsafe_allow_html=True)
     st.plotly_chart(fig, use_container_width=True)
 
 
 def _render_story_types(types: dict):
-    """Simple breakdown of Show HN / Ask HN / Stories."""
+    """Simple breakdown of Show HN / Ask HN / Stories, as one HTML fragment."""
     if not types:
         return
 
-    st.markdown('<div class="headline-sm">Story Types</div>', unsafe_allow_html=True)
-
     total = sum(types.values())
-    cols = st.columns(len(types))
-    for col, (label, count) in zip(cols, types.items()):
+    cells = []
+    for label, count in types.items():
         pct = round(100 * count / total) if total else 0
-        col.markdown(f"""
-        <div style="text-align: center; padding: 0.4rem 0;">
+        cells.append(f"""
+        <div style="flex: 1; text-align: center; padding: 0.4rem 0;">
             <div style="font-family: 'Playfair Display', Georgia, serif; font-size: 1.5rem;
                         font-weight: 700; color: #121212;">{count}</div>
             <div style="font-family: 'Libre Franklin', sans-serif; font-size: 0.6rem;
-                        text-transform: uppercase; letter-spacing: 1px; color: #999;">{label}</div>
+                        text-transform: uppercase; letter-spacing: 1px; color: #999;">{escape(label)}</div>
             <div style="font-family: 'Libre Franklin', sans-serif; font-size: 0.65rem;
                         color: #CCC;">{pct}%</div>
-        </div>
-        """, unsafe_allow_html=True)
+        </div>""")
+
+    # A flex row instead of st.columns: one delta rather than one per column
+    st.markdown(
+        '<div class="headline-sm">Story Types</div>'
+        f'<div style="display: flex; gap: 1rem;">{"".join(cells)}</div>',
+        unsafe_allow_html=True,
+    )
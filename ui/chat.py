@@ -1,26 +1,101 @@
-"""Streamlit chat component — dual input: new conversation + follow-up with memory."""
+"""Streamlit chat component — dual input: new conversation + follow-up with memory.
+
+Agent calls run as background jobs (agents.jobs); the page stays interactive
+while a polling fragment shows the answer as it is generated.
+"""
 
 import streamlit as st
 
-from agents.graph import query_agent
+from agents.artifacts import suggested_answers
+from agents.jobs import QueueFull, collect, poll, queue_depth, submit
+from config.settings import CHAT_POLL_INTERVAL_S
+
+
+def _error_message(error: str) -> str:
+    return (
+        f"**Unable to retrieve briefing.** {error}\n\n"
+        "Ensure the pipeline has run at least once and API keys are configured."
+    )
 
 
 def _handle_query(prompt: str, with_history: bool = False):
-    """Send a query to the agent and update session state."""
-    history = st.session_state.messages if with_history else []
+    """Record the user turn and hand the agent call to the shared background executor."""
+    history = list(st.session_state.messages) if with_history else []
+    if not with_history:
+        st.session_state.pop("history_summary", None)
+        st.session_state.conversation = {}
 
     st.session_state.messages.append({"role": "user", "content": prompt})
+    try:
+        st.session_state.chat_job = submit(
+            prompt,
+            history,
+            history_cache=st.session_state.get("history_summary"),
+            conversation=st.session_state.setdefault("conversation", {}),
+        )
+    except QueueFull:
+        st.session_state.messages.append({
+            "role": "assistant",
+            "content": "**The newsroom is busy.** Too many questions are in flight right now — please ask again in a moment.",
+        })
+
+
+@st.fragment(run_every=CHAT_POLL_INTERVAL_S)
+def _render_pending_response():
+    """Poll the in-flight job and show its answer as it grows; only this fragment reruns."""
+    job_id = st.session_state.get("chat_job")
+    job = poll(job_id) if job_id else None
+    if job is None:
+        # Expired or already collected; a full rerun drops the polling fragment
+        st.session_state.pop("chat_job", None)
+        st.rerun()
+        return
+
+    finished = job["status"] in ("done", "error")
+    with st.chat_message("assistant"):
+        if job["status"] == "queued":
+            st.caption(f"Queued — {job['ahead']} question(s) ahead of yours")
+        elif job["text"] and not finished:
+            st.markdown(job["text"] + " ▌")
+        elif not finished:
+            st.caption("Reading today's stories…")
+
+    if finished:
+        answer = job["text"] if job["status"] == "done" else _error_message(job["error"])
+        st.session_state.messages.append({"role": "assistant", "content": answer})
+        if job["history_cache"] is not None:
+            st.session_state.history_summary = job["history_cache"]
+        collect(job_id)
+        st.session_state.pop("chat_job", None)
+        st.rerun()  # full rerun: history, inputs re-enabled
 
-    with st.spinner("Consulting today's briefing..."):
-        try:
-            response = query_agent(prompt, chat_history=history)
-        except Exception as e:
-            response = (
-                f"**Unable to retrieve briefing.** {e}\n\n"
-                "Ensure the pipeline has run at least once and API keys are configured."
-            )
 
-    st.session_state.messages.append({"role": "assistant", "content": response})
+def _render_queue_depth():
+    """Saturation notice shown when every worker is busy and questions are queueing."""
+    depth = queue_depth()
+    if depth["saturated"] or depth["queued"]:
+        st.caption(
+            f"High demand — {depth['running']}/{depth['workers']} answers in progress, "
+            f"{depth['queued']} queued. Replies may take a little longer."
+        )
+
+
+def _render_suggestions(disabled: bool = False):
+    """One-click suggested questions with answers precomputed by the pipeline."""
+    suggestions = suggested_answers()
+    if not suggestions:
+        return
+
+    st.markdown('<div class="section-label">Suggested</div>', unsafe_allow_html=True)
+    for i, entry in enumerate(suggestions):
+        if st.button(entry["question"], key=f"suggested_{i}", use_container_width=True, disabled=disabled):
+            st.session_state.messages = [
+                {"role": "user", "content": entry["question"]},
+                {"role": "assistant", "content": entry["answer"]},
+            ]
+            st.session_state.pop("history_summary", None)
+            st.session_state.conversation = {}
+            st.rerun()
 
 
 def render_chat():
@@ -29,10 +104,13 @@ def render_chat():
         st.session_state.messages = []
 
     has_history = len(st.session_state.messages) > 0
+    busy = "chat_job" in st.session_state  # one question in flight per session
+
+    _render_queue_depth()
 
     # ── New conversation input (always visible at top) ──
     if has_history:
-        new_topic = st.chat_input("Start a new topic...", key="new_conversation")
+        new_topic = st.chat_input("Start a new topic...", key="new_conversation", disabled=busy)
         if new_topic:
             st.session_state.messages = []  # clear history
             _handle_query(new_topic, with_history=False)
@@ -46,19 +124,25 @@ def render_chat():
         </p>
         """, unsafe_allow_html=True)
 
-        first_query = st.chat_input("Ask about today's tech news...", key="first_message")
+        first_query = st.chat_input("Ask about today's tech news...", key="first_message", disabled=busy)
         if first_query:
             _handle_query(first_query, with_history=False)
             st.rerun()
 
+        _render_suggestions(disabled=busy)
+
     # ── Display message history ──
     for msg in st.session_state.messages:
         with st.chat_message(msg["role"]):
             st.markdown(msg["content"])
 
+    # ── Answer for the in-flight turn, polled below the history ──
+    if busy:
+        _render_pending_response()
+
     # ── Follow-up input (only when there's history) ──
     if has_history:
-        followup = st.chat_input("Follow up on this conversation...", key="followup")
+        followup = st.chat_input("Follow up on this conversation...", key="followup", disabled=busy)
         if followup:
             _handle_query(followup, with_history=True)
             st.rerun()